@@ -1,4 +1,5 @@
 from blogs.models import BlogPlatform, BlogPost, BlogSeries, BlogTag
+from web.utilities.tag_utils import add_tags, resolve_tags
 
 
 def create_blog_tags() -> None:
@@ -47,8 +48,7 @@ def create_blog_tags() -> None:
         {"value": "Web Development"},
     ]
 
-    for tag_data in tags_list:
-        BlogTag.objects.get_or_create(value=tag_data["value"], defaults=tag_data)
+    resolve_tags(BlogTag, [tag_data["value"] for tag_data in tags_list])
 
 
 def create_blog_platforms() -> None:
@@ -184,10 +184,7 @@ def create_blog_posts() -> None:
             defaults={**post_data, "platform": platform, "series": series},
         )
         if tags_names:
-            # post: BlogPost = BlogPost.objects.get(title=post_data["title"])
-            for tag_name in tags_names:
-                tag: BlogTag = BlogTag.objects.get(value=tag_name)
-                post.tags.add(tag)
+            add_tags(BlogPost.tags, {post.pk: tags_names})
 
 
 def run() -> None:
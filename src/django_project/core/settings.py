@@ -281,6 +281,61 @@ CELERY_BROKER_CONNECTION_RETRY_ON_STARTUP = env.bool(
 )  # Retry connection if Redis is down
 
 
+# scraper settings
+PLAYWRIGHT_POOL_MAX_PAGES: int = env.int("PLAYWRIGHT_POOL_MAX_PAGES", 50)  # recycle the pooled browser after N pages
+PLAYWRIGHT_POOL_MAX_RSS_MB: int = env.int("PLAYWRIGHT_POOL_MAX_RSS_MB", 1024)  # or when its memory grows past this
+PLAYWRIGHT_POOL_RSS_CHECK_PAGES: int = env.int("PLAYWRIGHT_POOL_RSS_CHECK_PAGES", 10)  # pages between memory checks
+MEETUP_STATIC_FETCH: bool = env.bool("MEETUP_STATIC_FETCH", True)  # try plain requests before loading pages in Chromium
+MEETUP_EVENT_FETCH_CONCURRENCY: int = env.int("MEETUP_EVENT_FETCH_CONCURRENCY", 4)  # event pages loaded in parallel
+# always refetch events starting within the window; refetch others the listing has no data for once this old
+MEETUP_EVENT_REFRESH_WINDOW_HOURS: int = env.int("MEETUP_EVENT_REFRESH_WINDOW_HOURS", 48)
+MEETUP_EVENT_MAX_AGE_HOURS: int = env.int("MEETUP_EVENT_MAX_AGE_HOURS", 24)
+MEETUP_GRAPHQL_GROUPS: list[str] = [  # urlnames of groups read with the Meetup GraphQL API instead of pages; * for all
+    urlname.strip() for urlname in env.str("MEETUP_GRAPHQL_GROUPS", "").split(",") if urlname.strip()
+]
+MEETUP_GRAPHQL_URL: str = env.str("MEETUP_GRAPHQL_URL", "https://api.meetup.com/gql-ext")  # or a local stand-in
+MEETUP_GRAPHQL_EVENTS: int = env.int("MEETUP_GRAPHQL_EVENTS", 50)  # upcoming events requested per group
+EVENTBRITE_LISTING_MAX_PAGES: int = env.int("EVENTBRITE_LISTING_MAX_PAGES", 10)  # pages of an organizer's events
+INGESTION_SWEEP_CONCURRENCY: dict[str, int] = {  # groups of a platform scraped at once by an ingestion batch
+    "meetup": env.int("MEETUP_SWEEP_CONCURRENCY", 4),
+    "eventbrite": env.int("EVENTBRITE_SWEEP_CONCURRENCY", 2),
+}
+EVENT_CANCELLATION_GRACE_HOURS: int = env.int("EVENT_CANCELLATION_GRACE_HOURS", 24)  # hours missing before cancelled
+INGESTION_BATCH_SIZE: int = env.int("INGESTION_BATCH_SIZE", 20)  # groups per worker task in a launcher's sweep
+INGESTION_QUEUE_SIZE: int = env.int("INGESTION_QUEUE_SIZE", 8)  # groups waiting to be written before scraping pauses
+SCRAPER_THREADS: int = env.int("SCRAPER_THREADS", 4)  # threads (and so pooled browsers) for blocking scraper calls
+SCRAPER_SHUTDOWN_TIMEOUT: int = env.int("SCRAPER_SHUTDOWN_TIMEOUT", 30)  # seconds busy scraper threads get on shutdown
+
+# outbound http settings (web.utilities.http_client)
+HTTP_TIMEOUT: float = env.float("HTTP_TIMEOUT", 15)  # seconds, when a caller does not pass its own timeout
+HTTP_MAX_RETRIES: int = env.int("HTTP_MAX_RETRIES", 3)  # connection errors and 5xx, idempotent methods only
+HTTP_BACKOFF_FACTOR: float = env.float("HTTP_BACKOFF_FACTOR", 0.5)
+HTTP_POOL_SIZES: dict[str, int] = {"www.eventbriteapi.com": 20, "www.meetup.com": 10}  # keep-alive connections per host
+
+# record/replay of scraper traffic (web.utilities.replay); "off", "record" or "replay"
+SCRAPER_REPLAY_MODE: str = env.str("SCRAPER_REPLAY_MODE", "off")
+SCRAPER_REPLAY_DIR: str = env.str("SCRAPER_REPLAY_DIR", "")
+
+# raw page snapshot store (web.utilities.snapshots); an empty directory disables snapshots
+SCRAPER_SNAPSHOT_DIR: str = env.str("SCRAPER_SNAPSHOT_DIR", os.path.join(BASE_DIR, "scraper_snapshots"))
+SCRAPER_SNAPSHOT_COMPRESSION: str = env.str("SCRAPER_SNAPSHOT_COMPRESSION", "zstd")  # or "gzip"; zstd needs zstandard
+SCRAPER_SNAPSHOT_RETENTION_DAYS: int = env.int("SCRAPER_SNAPSHOT_RETENTION_DAYS", 30)
+
+# rate limits shared by every worker through Redis (web.utilities.rate_limit); (requests per second, burst)
+RATE_LIMIT_REDIS_URL: str | None = env.str("RATE_LIMIT_REDIS_URL", None) or CELERY_BROKER_URL
+RATE_LIMIT_REDIS_TIMEOUT: float = env.float("RATE_LIMIT_REDIS_TIMEOUT", 1.5)  # seconds before using local limits
+RATE_LIMITS: dict[str, tuple[float, int]] = {
+    "eventbrite": (env.float("EVENTBRITE_RATE_LIMIT", 0.5), env.int("EVENTBRITE_RATE_LIMIT_BURST", 5)),
+    "meetup": (env.float("MEETUP_RATE_LIMIT", 1.0), env.int("MEETUP_RATE_LIMIT_BURST", 5)),
+}
+RATE_LIMIT_HOSTS: dict[str, str] = {
+    "www.eventbrite.com": "eventbrite",
+    "www.eventbriteapi.com": "eventbrite",
+    "www.meetup.com": "meetup",
+    "api.meetup.com": "meetup",
+}
+
+
 SALT_KEY: str = env.str("SALT_KEY", "this_should_be_changed")
 
 # third party integrations
@@ -293,5 +348,6 @@ LINKEDIN_CLIENT_ID: str | None = env.str("LINKEDIN_CLIENT_ID", None)
 LINKEDIN_CLIENT_SECRET: str | None = env.str("LINKEDIN_CLIENT_SECRET", None)
 LINKEDIN_ORGANIZATION_URN: str | None = env.str("LINKEDIN_ORGANIZATION_URN", None)
 LINKEDIN_REFRESH_TOKEN: str | None = env.str("LINKEDIN_REFRESH_TOKEN", None)
+MEETUP_GRAPHQL_TOKEN: str | None = env.str("MEETUP_GRAPHQL_TOKEN", None)
 SPUG_API_TOKEN: str | None = env.str("SPUG_API_TOKEN", None)
 SPUG_API_URL: str | None = env.str("SPUG_API_URL", None)
@@ -0,0 +1,59 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import django
+from django.test import TestCase
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+django.setup()
+from model_bakery import baker
+from web.models import TechGroup
+from web.utilities.benchmark import (
+    StageResult,
+    compare_results,
+    measure_stage,
+    write_results,
+)
+from web.utilities.replay import replay_session
+
+
+class MeasureStageTests(TestCase):
+    def test_queries_and_calls_are_recorded(self):
+        baker.make("web.TechGroup", _quantity=2)
+        results: list[StageResult] = []
+        with measure_stage("list groups", results) as stage:
+            for _ in range(3):
+                list(TechGroup.objects.all())
+                stage.calls += 1
+        self.assertEqual(len(results), 1)
+        self.assertEqual((results[0].name, results[0].calls, results[0].db_queries), ("list groups", 3, 3))
+        self.assertGreater(results[0].wall_time, 0)
+
+    def test_replayed_requests_are_counted(self):
+        results: list[StageResult] = []
+        with tempfile.TemporaryDirectory() as directory, replay_session(directory) as config:
+            with measure_stage("fetch", results):
+                config.should_throttle()
+                config.should_throttle()
+        self.assertEqual(results[0].requests, 2)
+
+
+class ResultsFileTests(TestCase):
+    def test_results_round_trip_and_compare(self):
+        results = [StageResult(name="parse", wall_time=2.0, calls=4, requests=10, db_queries=1)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "results.json"
+            write_results(path, results, corpus="corpus")
+            document = json.loads(path.read_text())
+        self.assertEqual(document["corpus"], "corpus")
+        self.assertEqual(document["stages"][0]["requests_per_second"], 5.0)
+
+        faster = [StageResult(name="parse", wall_time=1.0, db_queries=1), StageResult(name="write")]
+        lines = compare_results(document, faster)
+        self.assertIn("(-50%)", lines[0])
+        self.assertIn("new stage", lines[1])
@@ -0,0 +1,154 @@
+import os
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, patch
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+import django
+
+django.setup()
+
+from web.utilities.browser_pool import (
+    AsyncBrowserPool,
+    BaseBrowserPool,
+    BrowserPool,
+    close_browser_pools,
+    get_async_browser_pool,
+    get_browser_pool,
+)
+from web.utilities.scrapers.registry import get_scraper_executor, shutdown_scraper_executor
+
+
+class BrowserPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.playwright = MagicMock()
+        self.playwright.chromium.launch.side_effect = lambda **kwargs: MagicMock()
+        starter = patch("web.utilities.browser_pool.sync_playwright")
+        self.mock_sync_playwright = starter.start()
+        self.mock_sync_playwright.return_value.start.return_value = self.playwright
+        self.addCleanup(starter.stop)
+        rss = patch("web.utilities.browser_pool.get_process_tree_rss_mb", return_value=100.0)
+        self.mock_rss = rss.start()
+        self.addCleanup(rss.stop)
+
+    def test_browser_is_reused_across_pages(self):
+        pool = BrowserPool(max_pages=10, max_rss_mb=1024)
+        for _ in range(3):
+            with pool.page():
+                pass
+        self.assertEqual(pool.launch_count, 1)
+        self.assertEqual(pool.pages_served, 3)
+        self.assertEqual(pool.browser.new_context.call_count, 3)
+        self.assertEqual(pool.browser.new_context.return_value.close.call_count, 3)
+
+    def test_browser_is_recycled_after_max_pages(self):
+        pool = BrowserPool(max_pages=2, max_rss_mb=1024)
+        for _ in range(5):
+            with pool.page():
+                pass
+        self.assertEqual(pool.launch_count, 3)
+
+    def test_browser_is_recycled_past_rss_threshold(self):
+        pool = BrowserPool(max_pages=10, max_rss_mb=512, rss_check_pages=1)
+        with pool.page():
+            pass
+        self.mock_rss.return_value = 2048.0
+        with pool.page():
+            pass
+        self.assertEqual(pool.launch_count, 2)
+
+    def test_memory_is_sampled_every_rss_check_pages(self):
+        pool = BrowserPool(max_pages=100, max_rss_mb=1024, rss_check_pages=3)
+        for _ in range(7):
+            with pool.page():
+                pass
+        # checked before the 4th and 7th pages, once 3 and 6 pages had been served
+        self.assertEqual(self.mock_rss.call_count, 2)
+
+    def test_browser_is_recycled_when_a_fetch_fails(self):
+        pool = BrowserPool(max_pages=10, max_rss_mb=1024)
+        with self.assertRaises(RuntimeError):
+            with pool.page():
+                raise RuntimeError("navigation failed")
+        self.assertIsNone(pool.browser)
+
+    def test_close_stops_driver(self):
+        pool = BrowserPool(max_pages=10, max_rss_mb=1024)
+        with pool.page():
+            pass
+        pool.close()
+        self.playwright.stop.assert_called_once()
+        self.assertIsNone(pool.browser)
+
+    def test_get_browser_pool_returns_same_instance(self):
+        self.assertIs(get_browser_pool(), get_browser_pool())
+
+    def test_base_pool_is_abstract(self):
+        with self.assertRaises(TypeError):
+            BaseBrowserPool()  # type: ignore[abstract]
+
+    def test_pools_are_closed_on_their_own_threads(self):
+        closing_threads: list[int] = []
+
+        def open_pool() -> int:
+            pool = get_browser_pool()
+            pool.close = lambda: closing_threads.append(threading.get_ident())  # type: ignore[method-assign]
+            return pool.owner
+
+        with patch("web.utilities.scrapers.registry.os.getpid", return_value=-1):
+            owners = {get_scraper_executor().submit(open_pool).result() for _ in range(3)}
+            shutdown_scraper_executor()
+        self.assertEqual(sorted(closing_threads), sorted(owners))
+
+    def test_pools_of_other_threads_are_dropped_on_shutdown(self):
+        thread = threading.Thread(target=get_browser_pool)
+        thread.start()
+        thread.join()
+        with self.assertLogs("web.utilities.browser_pool", "WARNING"):
+            close_browser_pools()
+
+
+class AsyncBrowserPoolTests(unittest.TestCase):
+    def setUp(self):
+        self.playwright = MagicMock()
+        self.playwright.chromium.launch = AsyncMock(side_effect=lambda **kwargs: MagicMock(close=AsyncMock()))
+        self.playwright.stop = AsyncMock()
+        starter = patch("web.utilities.browser_pool.async_playwright")
+        starter.start().return_value.start = AsyncMock(return_value=self.playwright)
+        self.addCleanup(starter.stop)
+        rss = patch("web.utilities.browser_pool.get_process_tree_rss_mb", return_value=100.0)
+        rss.start()
+        self.addCleanup(rss.stop)
+
+    def serve_batch(self, pool: AsyncBrowserPool, pages: int) -> None:
+        async def batch() -> None:
+            await pool.start()
+            pool.pages_served += pages
+
+        pool.run(batch())
+
+    def test_browser_is_reused_across_batches(self):
+        pool = AsyncBrowserPool(max_pages=10, max_rss_mb=1024)
+        self.serve_batch(pool, 3)
+        self.serve_batch(pool, 3)
+        self.assertEqual(pool.launch_count, 1)
+        pool.close()
+        self.playwright.stop.assert_awaited_once()
+        self.assertTrue(pool.loop.is_closed())
+
+    def test_browser_is_recycled_after_max_pages(self):
+        pool = AsyncBrowserPool(max_pages=4, max_rss_mb=1024)
+        self.serve_batch(pool, 3)
+        browser = pool.browser
+        self.serve_batch(pool, 3)
+        self.serve_batch(pool, 1)
+        browser.close.assert_awaited_once()
+        self.assertEqual(pool.launch_count, 2)
+        pool.close()
+
+    def test_get_async_browser_pool_returns_same_instance(self):
+        self.assertIs(get_async_browser_pool(), get_async_browser_pool())
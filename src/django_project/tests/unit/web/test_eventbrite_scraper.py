@@ -0,0 +1,116 @@
+import asyncio
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+from django.test import SimpleTestCase, override_settings
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+import django
+
+django.setup()
+
+from web.utilities.scrapers.eventbrite import (
+    EventbriteScraper,
+    build_event_record,
+    get_event_details,
+    get_events_details,
+    get_events_for_organization,
+)
+from web.utilities.scrapers.registry import EventListing
+
+
+def build_response(events: list[dict], pagination: dict | None = None) -> Mock:
+    response = Mock(status_code=200)
+    response.json.return_value = {"events": events, **({"pagination": pagination} if pagination else {})}
+    return response
+
+
+def build_event(event_id: str, **expansions) -> dict:
+    return {
+        "id": event_id,
+        "name": {"text": f"Event {event_id}"},
+        "url": f"https://www.eventbrite.com/e/{event_id}",
+        "start": {"utc": "2030-01-01T18:00:00Z"},
+        **expansions,
+    }
+
+
+class GetEventsDetailsTests(unittest.TestCase):
+    def test_requests_ids_in_chunks(self):
+        event_ids = ["1", "2", "3", "2"]
+        responses = [build_response([{"id": "1"}, {"id": "2"}]), build_response([{"id": "3"}])]
+        with patch("web.utilities.scrapers.eventbrite.http_client.get", side_effect=responses) as mock_get:
+            details = get_events_details(event_ids, chunk_size=2)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertIn("event_ids=1,2&", mock_get.call_args_list[0].args[0])
+        self.assertIn("event_ids=3&", mock_get.call_args_list[1].args[0])
+        self.assertEqual(list(details), ["1", "2", "3"])
+
+    def test_missing_events_are_omitted(self):
+        with patch("web.utilities.scrapers.eventbrite.http_client.get", return_value=build_response([{"id": "1"}])):
+            details = get_events_details(["1", "2"])
+        self.assertEqual(details, {"1": {"id": "1"}})
+
+    def test_empty_id_list_makes_no_requests(self):
+        with patch("web.utilities.scrapers.eventbrite.http_client.get") as mock_get:
+            self.assertEqual(get_events_details([]), {})
+        mock_get.assert_not_called()
+
+    def test_single_event_details(self):
+        with patch("web.utilities.scrapers.eventbrite.http_client.get", return_value=build_response([{"id": "1"}])):
+            self.assertEqual(get_event_details("1"), {"id": "1"})
+
+    def test_unknown_event_has_no_details(self):
+        with patch("web.utilities.scrapers.eventbrite.http_client.get", return_value=build_response([])):
+            self.assertEqual(get_event_details("1"), {})
+
+
+@override_settings(EVENTBRITE_API_KEY="token", EVENTBRITE_LISTING_MAX_PAGES=3)
+class GetEventsForOrganizationTests(SimpleTestCase):
+    def test_follows_continuation_tokens(self):
+        responses = [
+            build_response([build_event("1")], {"has_more_items": True, "continuation": "abc"}),
+            build_response([build_event("2")], {"has_more_items": False}),
+        ]
+        with patch("web.utilities.scrapers.eventbrite.http_client.get", side_effect=responses) as mock_get:
+            events = get_events_for_organization("42")
+        self.assertEqual([event["id"] for event in events], ["1", "2"])
+        first_url, second_url = (call.args[0] for call in mock_get.call_args_list)
+        self.assertIn("&expand=venue,tags", first_url)
+        self.assertEqual(second_url, f"{first_url}&continuation=abc")
+
+    def test_stops_when_a_continuation_token_repeats(self):
+        pagination = {"has_more_items": True, "continuation": "same"}
+        with patch(
+            "web.utilities.scrapers.eventbrite.http_client.get", return_value=build_response([], pagination)
+        ) as mock_get:
+            get_events_for_organization("42")
+        self.assertEqual(mock_get.call_count, 2)
+
+
+class EventbriteScraperTests(unittest.TestCase):
+    def test_expanded_events_need_no_details(self):
+        venue = {"name": "Library", "address": {"localized_address_display": "1 Main St"}}
+        listing = EventListing(
+            records={
+                "1": build_event_record(build_event("1", venue=venue, tags=[{"display_name": "python"}])),
+                "2": build_event_record(build_event("2")),
+            }
+        )
+        details = {"2": {"id": "2", "primary_venue": None, "tags": []}}
+        with patch("web.utilities.scrapers.eventbrite.get_events_details", return_value=details) as mock_details:
+            events = asyncio.run(EventbriteScraper().fetch_events(listing, ["1", "2"]))
+        mock_details.assert_called_once_with(["2"])
+        self.assertEqual((events["1"].location_name, events["1"].tags), ("Library", ["python"]))
+        self.assertEqual(events["1"].map_link, "https://www.google.com/maps?q=1+Main+St")
+        self.assertEqual(events["2"].location_name, "")
+
+    def test_online_events_are_expanded_without_a_venue(self):
+        record = build_event_record(build_event("1", venue=None, tags=[]))
+        self.assertFalse(EventbriteScraper().needs_details(record))
+        self.assertEqual(record["location_address"], "")
@@ -0,0 +1,86 @@
+import os
+from pathlib import Path
+from unittest.mock import Mock, patch
+
+import django
+from django.test import TestCase
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+django.setup()
+from web.models import HttpCacheEntry
+from web.utilities.http_cache import (
+    FetchCacheStats,
+    fetch_content_if_changed,
+    forget_cached_response,
+    get_cache_entry,
+    save_cache_entry,
+)
+
+URL = "https://www.meetup.com/some-group/"
+
+
+def build_response(status_code: int = 200, content: bytes = b"", headers: dict | None = None) -> Mock:
+    return Mock(status_code=status_code, content=content, headers=headers or {})
+
+
+def fetch_and_save(url: str) -> bytes | None:
+    content, entry = fetch_content_if_changed(url, get_cache_entry(url))
+    if entry:
+        save_cache_entry(entry)
+    return content
+
+
+class FetchContentIfChangedTests(TestCase):
+    def test_validators_are_stored_once_saved(self):
+        stats = FetchCacheStats()
+        response = build_response(content=b"<html></html>", headers={"ETag": '"abc"', "Last-Modified": "yesterday"})
+        with patch("web.utilities.http_cache.http_client.get", return_value=response):
+            content, entry = fetch_content_if_changed(URL, None, stats=stats)
+        self.assertEqual(content, b"<html></html>")
+        self.assertFalse(HttpCacheEntry.objects.exists())
+        save_cache_entry(entry)
+        entry = HttpCacheEntry.objects.get(url=URL)
+        self.assertEqual((entry.etag, entry.last_modified, entry.content_length), ('"abc"', "yesterday", 13))
+        self.assertEqual((stats.requests, stats.hits, stats.bytes_downloaded), (1, 0, 13))
+
+    def test_unsaved_response_is_fetched_again(self):
+        with patch("web.utilities.http_cache.http_client.get", return_value=build_response(content=b"same")):
+            fetch_content_if_changed(URL, get_cache_entry(URL))
+            self.assertEqual(fetch_content_if_changed(URL, get_cache_entry(URL))[0], b"same")
+
+    def test_not_modified_response_is_a_hit(self):
+        HttpCacheEntry.objects.create(url=URL, etag='"abc"', last_modified="yesterday", content_length=13)
+        stats = FetchCacheStats()
+        with patch("web.utilities.http_cache.http_client.get", return_value=build_response(304)) as mock_get:
+            self.assertEqual(fetch_content_if_changed(URL, get_cache_entry(URL), stats=stats), (None, None))
+        headers = mock_get.call_args.kwargs["headers"]
+        self.assertEqual(headers["If-None-Match"], '"abc"')
+        self.assertEqual(headers["If-Modified-Since"], "yesterday")
+        self.assertEqual((stats.hits, stats.bytes_saved, stats.hit_rate), (1, 13, 1.0))
+
+    def test_identical_body_is_a_hit(self):
+        with patch("web.utilities.http_cache.http_client.get", return_value=build_response(content=b"same")):
+            fetch_and_save(URL)
+            stats = FetchCacheStats()
+            self.assertEqual(fetch_content_if_changed(URL, get_cache_entry(URL), stats=stats), (None, None))
+        self.assertEqual(stats.hits, 1)
+
+    def test_changed_body_is_returned(self):
+        with patch("web.utilities.http_cache.http_client.get", return_value=build_response(content=b"old")):
+            fetch_and_save(URL)
+        with patch("web.utilities.http_cache.http_client.get", return_value=build_response(content=b"new")):
+            self.assertEqual(fetch_and_save(URL), b"new")
+
+    def test_error_status_raises(self):
+        with patch("web.utilities.http_cache.http_client.get", return_value=build_response(500)):
+            with self.assertRaises(Exception):
+                fetch_content_if_changed(URL, None)
+
+    def test_forget_cached_response(self):
+        with patch("web.utilities.http_cache.http_client.get", return_value=build_response(content=b"same")):
+            fetch_and_save(URL)
+            forget_cached_response(URL)
+            self.assertEqual(fetch_and_save(URL), b"same")
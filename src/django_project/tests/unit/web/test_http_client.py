@@ -0,0 +1,96 @@
+import os
+import threading
+import unittest
+from datetime import timedelta
+from http.client import HTTPMessage
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+import django
+
+django.setup()
+
+import requests
+from django.test import override_settings
+from requests.cookies import MockRequest, MockResponse
+from web.utilities import http_client
+
+
+def build_response(url: str, status_code: int = 200, seconds: float = 0.5) -> MagicMock:
+    response = MagicMock(url=url, status_code=status_code)
+    response.elapsed = timedelta(seconds=seconds)
+    return response
+
+
+class GetSessionTests(unittest.TestCase):
+    def test_session_is_reused_within_a_process(self):
+        self.assertIs(http_client.get_session(), http_client.get_session())
+
+    def test_new_process_gets_its_own_session(self):
+        session = http_client.get_session()
+        with patch("web.utilities.http_client.os.getpid", return_value=-1):
+            child_session = http_client.get_session()
+        self.assertIsNot(session, child_session)
+        http_client._local.sessions.pop(-1)
+
+    def test_each_thread_gets_its_own_session(self):
+        sessions: list[requests.Session] = []
+        thread = threading.Thread(target=lambda: sessions.append(http_client.get_session()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(sessions[0], http_client.get_session())
+
+    def test_session_stores_no_cookies(self):
+        headers = HTTPMessage()
+        headers["Set-Cookie"] = "session_id=abc; Path=/"
+        request = requests.Request("GET", "https://www.meetup.com/").prepare()
+        session = http_client.get_session()
+        session.cookies.extract_cookies(MockResponse(headers), MockRequest(request))
+        self.assertEqual(len(session.cookies), 0)
+
+    def test_session_sends_project_user_agent(self):
+        self.assertTrue(http_client.get_session().headers["User-Agent"].startswith("spokanetech/"))
+
+
+class RequestTests(unittest.TestCase):
+    def test_default_timeout_is_applied(self):
+        with patch.object(http_client.get_session(), "request") as mock_request:
+            http_client.get("https://example.com/a")
+        mock_request.assert_called_once_with("GET", "https://example.com/a", timeout=http_client.DEFAULT_TIMEOUT)
+
+    def test_explicit_timeout_is_kept(self):
+        with patch.object(http_client.get_session(), "request") as mock_request:
+            http_client.post("https://example.com/a", json={}, timeout=3)
+        mock_request.assert_called_once_with("POST", "https://example.com/a", json={}, timeout=3)
+
+    @override_settings(HTTP_POOL_SIZES={"pool-size.example.com": 2})
+    def test_host_gets_sized_pool(self):
+        session = http_client.get_session()
+        with patch.object(session, "request"):
+            http_client.get("https://pool-size.example.com/a")
+        self.assertEqual(session.adapters["https://pool-size.example.com/"]._pool_maxsize, 2)
+
+    def test_post_is_not_retried(self):
+        self.assertFalse(http_client.get_retry_policy().is_retry("POST", 503))
+        self.assertTrue(http_client.get_retry_policy().is_retry("GET", 503))
+
+
+class HostStatsTests(unittest.TestCase):
+    def setUp(self):
+        http_client.reset_host_stats()
+
+    def test_latency_and_status_are_recorded_per_host(self):
+        http_client.record_response(build_response("https://a.example.com/x", 200, 0.5))
+        http_client.record_response(build_response("https://a.example.com/y", 503, 1.5))
+        http_client.record_response(build_response("https://b.example.com/x", 200, 0.1))
+
+        stats = http_client.get_host_stats()
+        self.assertEqual(stats["a.example.com"].requests, 2)
+        self.assertEqual(stats["a.example.com"].mean_latency, 1.0)
+        self.assertEqual(stats["a.example.com"].max_latency, 1.5)
+        self.assertEqual(stats["a.example.com"].statuses, {200: 1, 503: 1})
+        self.assertEqual(stats["b.example.com"].requests, 1)
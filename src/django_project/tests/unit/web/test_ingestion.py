@@ -0,0 +1,354 @@
+import os
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+import django
+from django.test import TestCase, override_settings
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+django.setup()
+from model_bakery import baker
+from web.models import Event
+from web.tasks import ingest_group_events
+from web.utilities.ingestion import (
+    EventBatchWriter,
+    InvalidScrapedRecord,
+    ScrapedEvent,
+    ScrapedGroup,
+    build_scraped_events,
+    compute_fingerprint,
+    reconcile_events,
+    select_events_to_fetch,
+    update_group_description,
+)
+
+
+def build_event_data(social_platform_id: str, **kwargs) -> dict:
+    event_data = {
+        "name": f"event {social_platform_id}",
+        "description": "some description",
+        "url": f"https://www.meetup.com/some-group/events/{social_platform_id}/",
+        "social_platform_id": social_platform_id,
+        "start_datetime": datetime(2030, 1, 1, 18, tzinfo=timezone.utc),
+        "end_datetime": datetime(2030, 1, 1, 20, tzinfo=timezone.utc),
+        "location_name": "some place",
+        "location_address": "",
+        "map_link": "",
+    }
+    event_data.update(kwargs)
+    return event_data
+
+
+def build_event(social_platform_id: str, **kwargs) -> ScrapedEvent:
+    return ScrapedEvent.from_dict(build_event_data(social_platform_id, **kwargs))
+
+
+class ScrapedEventTests(TestCase):
+    def test_unknown_keys_are_ignored(self):
+        event = ScrapedEvent.from_dict({**build_event_data("1"), "group": object(), "unknown": 1})
+        self.assertEqual(event.as_event_fields(), build_event_data("1"))
+
+    def test_datetime_strings_are_parsed_and_made_aware(self):
+        event = build_event("1", start_datetime="2030-01-01T18:00:00", end_datetime="")
+        self.assertEqual(event.start_datetime, datetime(2030, 1, 1, 18, tzinfo=timezone.utc))
+        self.assertIsNone(event.end_datetime)
+
+    def test_strings_are_stripped_and_clipped(self):
+        event = build_event(" 1 ", name="  some name\n", location_name="x" * 100, tags=[" python ", "", "python"])
+        self.assertEqual((event.social_platform_id, event.name), ("1", "some name"))
+        self.assertEqual(len(event.location_name), 64)
+        self.assertEqual(event.tags, ["python"])
+
+    def test_urls_are_canonicalized(self):
+        event = build_event("1", url="HTTPS://WWW.Meetup.com/some-group/events/1/?utm_source=x&a=1#top")
+        self.assertEqual(event.url, "https://www.meetup.com/some-group/events/1/?a=1")
+        self.assertEqual(ScrapedGroup(website=" https://Some.org/#about ").website, "https://some.org/")
+
+    def test_events_without_required_values_are_invalid(self):
+        for missing in ("social_platform_id", "name", "start_datetime"):
+            with self.subTest(missing=missing), self.assertRaises(InvalidScrapedRecord):
+                ScrapedEvent.from_dict({**build_event_data("1"), missing: ""})
+
+    def test_invalid_records_are_left_out(self):
+        events = build_scraped_events({"1": build_event_data("1"), "2": build_event_data("2", name="")})
+        self.assertEqual(list(events), ["1"])
+
+    def test_records_without_an_id_take_their_listing_key(self):
+        events = build_scraped_events({"1": {**build_event_data("1"), "social_platform_id": ""}})
+        self.assertEqual(events["1"].social_platform_id, "1")
+
+    def test_diff_lists_changed_fields(self):
+        stored = baker.prepare("web.Event", **build_event_data("1"))
+        self.assertEqual(build_event("1", name="renamed").diff(stored), ["name"])
+
+
+class ComputeFingerprintTests(TestCase):
+    def test_key_order_does_not_matter(self):
+        self.assertEqual(compute_fingerprint({"a": 1, "b": 2}), compute_fingerprint({"b": 2, "a": 1}))
+
+    def test_timezone_offset_does_not_matter(self):
+        utc = datetime(2030, 1, 1, 18, tzinfo=timezone.utc)
+        pacific = utc.astimezone(timezone(timedelta(hours=-8)))
+        self.assertEqual(compute_fingerprint({"start": utc}), compute_fingerprint({"start": pacific}))
+
+    def test_values_matter(self):
+        self.assertNotEqual(compute_fingerprint({"a": 1}), compute_fingerprint({"a": 2}))
+
+
+class EventBatchWriterTests(TestCase):
+    def setUp(self):
+        self.group = baker.make("web.TechGroup")
+
+    def make_event(self, social_platform_id: str, **kwargs):
+        event_data = build_event_data(social_platform_id, **kwargs)
+        return baker.make(
+            "web.Event",
+            group=self.group,
+            fingerprint=build_event(social_platform_id, **kwargs).fingerprint,
+            **event_data,
+        )
+
+    def test_creates_updates_and_skips_unchanged(self):
+        self.make_event("1")
+        self.make_event("2")
+        writer = EventBatchWriter(self.group)
+        writer.add(build_event("1"))
+        writer.add(build_event("2", name="renamed"))
+        writer.add(build_event("3"))
+
+        with self.assertNumQueries(5):  # select, savepoint, insert, update, release savepoint
+            result = writer.write()
+
+        self.assertEqual([event.social_platform_id for event in result.unchanged], ["1"])
+        self.assertEqual([event.social_platform_id for event in result.updated], ["2"])
+        self.assertEqual([event.social_platform_id for event in result.created], ["3"])
+        self.assertIsNotNone(result.created[0].pk)
+        self.assertEqual(Event.objects.get(social_platform_id="2").name, "renamed")
+        self.assertEqual(Event.objects.filter(group=self.group).count(), 3)
+        self.assertEqual(writer.pending, {})
+
+    def test_events_inserted_by_an_overlapping_run_are_compared_again(self):
+        self.make_event("1")
+        writer = EventBatchWriter(self.group)
+        writer.add(build_event("1"))
+        writer.add(build_event("2"))
+        # the first load misses event 1, as if the other run inserted it just after this one loaded the group's rows
+        loads = [Event.all_objects.none(), Event.all_objects.filter(group=self.group)]
+        with patch.object(Event.all_objects, "filter", side_effect=lambda **kwargs: loads.pop(0).filter(**kwargs)):
+            result = writer.write()
+
+        self.assertEqual([event.social_platform_id for event in result.unchanged], ["1"])
+        self.assertEqual([event.social_platform_id for event in result.created], ["2"])
+        self.assertEqual(Event.objects.filter(group=self.group).count(), 2)
+
+    def test_same_id_in_other_group_is_not_matched(self):
+        baker.make("web.Event", group=baker.make("web.TechGroup"), **build_event_data("1"))
+        writer = EventBatchWriter(self.group)
+        writer.add(build_event("1"))
+        result = writer.write()
+        self.assertEqual(len(result.created), 1)
+        self.assertEqual(Event.objects.filter(social_platform_id="1").count(), 2)
+
+    def test_matching_fingerprint_skips_write(self):
+        event = self.make_event("1")
+        writer = EventBatchWriter(self.group)
+        writer.add(build_event("1"))
+        with self.assertNumQueries(1):
+            result = writer.write()
+        self.assertEqual(len(result.unchanged), 1)
+        self.assertEqual(Event.objects.get(pk=event.pk).updated_at, event.updated_at)
+        self.assertEqual(str(result), "1 unchanged, 0 updated, 0 created")
+
+    def test_missing_fingerprint_is_backfilled_without_update(self):
+        event = baker.make("web.Event", group=self.group, **build_event_data("1"))
+        writer = EventBatchWriter(self.group)
+        writer.add(build_event("1"))
+        result = writer.write()
+        self.assertEqual(len(result.unchanged), 1)
+        event.refresh_from_db()
+        self.assertEqual(event.fingerprint, build_event("1").fingerprint)
+
+    def test_scrape_state_is_written_without_counting_as_a_change(self):
+        event = self.make_event("1")
+        scraped_at = datetime(2030, 1, 1, tzinfo=timezone.utc)
+        writer = EventBatchWriter(self.group)
+        writer.add(build_event("1"), scrape_state={"listing_fingerprint": "abc", "last_scraped_at": scraped_at})
+        writer.add(build_event("2"), scrape_state={"listing_fingerprint": "def", "last_scraped_at": scraped_at})
+        result = writer.write()
+        self.assertEqual(str(result), "1 unchanged, 0 updated, 1 created")
+        event.refresh_from_db()
+        self.assertEqual((event.listing_fingerprint, event.last_scraped_at), ("abc", scraped_at))
+        self.assertEqual(event.updated_at, Event.objects.get(pk=event.pk).updated_at)
+        self.assertEqual(Event.objects.get(social_platform_id="2").listing_fingerprint, "def")
+
+
+class SelectEventsToFetchTests(TestCase):
+    now = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    def setUp(self):
+        self.group = baker.make("web.TechGroup")
+
+    def make_event(self, social_platform_id: str, days_until_start: int = 10, **kwargs):
+        kwargs.setdefault("last_scraped_at", self.now - timedelta(hours=1))
+        kwargs.setdefault("listing_fingerprint", "same")
+        return baker.make(
+            "web.Event",
+            group=self.group,
+            social_platform_id=social_platform_id,
+            start_datetime=self.now + timedelta(days=days_until_start),
+            **kwargs,
+        )
+
+    def select(self, listing: dict[str, str]) -> tuple[set[str], list[Event]]:
+        with self.assertNumQueries(1):
+            return select_events_to_fetch(
+                self.group, listing, refresh_window=timedelta(hours=48), max_age=timedelta(hours=24), now=self.now
+            )
+
+    def test_known_unchanged_events_are_skipped(self):
+        event = self.make_event("1")
+        to_fetch, skipped = self.select({"1": "same", "2": "new"})
+        self.assertEqual(to_fetch, {"2"})
+        self.assertEqual(skipped, [event])
+
+    def test_changed_listing_is_fetched(self):
+        self.make_event("1")
+        self.assertEqual(self.select({"1": "changed"})[0], {"1"})
+
+    def test_events_starting_soon_are_fetched(self):
+        self.make_event("1", days_until_start=1)
+        self.assertEqual(self.select({"1": "same"})[0], {"1"})
+
+    def test_never_scraped_events_are_fetched(self):
+        self.make_event("1", last_scraped_at=None)
+        self.assertEqual(self.select({"1": "same"})[0], {"1"})
+
+    def test_events_without_listing_data_are_fetched_when_stale(self):
+        self.make_event("1")
+        self.make_event("2", last_scraped_at=self.now - timedelta(days=2))
+        self.assertEqual(self.select({"1": "", "2": ""})[0], {"2"})
+
+
+class ReconcileEventsTests(TestCase):
+    now = datetime(2030, 1, 1, tzinfo=timezone.utc)
+    grace = timedelta(hours=24)
+
+    def setUp(self):
+        self.group = baker.make("web.TechGroup")
+
+    def make_event(self, social_platform_id: str, days_until_start: int = 10, **kwargs):
+        return baker.make(
+            "web.Event",
+            group=self.group,
+            social_platform_id=social_platform_id,
+            start_datetime=self.now + timedelta(days=days_until_start),
+            **kwargs,
+        )
+
+    def reconcile(self, listed: set[str], horizon_days: int = 20):
+        return reconcile_events(self.group, listed, self.now + timedelta(days=horizon_days), self.grace, now=self.now)
+
+    def test_missing_events_are_cancelled_after_the_grace_period(self):
+        self.make_event("1")
+        self.make_event("2", missing_since=self.now - timedelta(hours=1))
+        self.make_event("3", missing_since=self.now - timedelta(hours=25))
+        result = self.reconcile({"4"})
+        self.assertEqual((result.missing, result.cancelled, result.restored), (1, 1, 0))
+        events = {event.social_platform_id: event for event in Event.all_objects.filter(group=self.group)}
+        self.assertEqual(events["1"].missing_since, self.now)
+        self.assertIsNone(events["2"].cancelled_at)
+        self.assertEqual(events["3"].cancelled_at, self.now)
+        self.assertEqual(sorted(Event.objects.values_list("social_platform_id", flat=True)), ["1", "2"])
+
+    def test_listed_events_are_restored(self):
+        self.make_event("1", missing_since=self.now - timedelta(days=2), cancelled_at=self.now - timedelta(days=1))
+        result = self.reconcile({"1"})
+        self.assertEqual((result.missing, result.cancelled, result.restored), (0, 0, 1))
+        self.assertIsNone(Event.objects.get(social_platform_id="1").missing_since)
+
+    def test_past_events_and_events_beyond_the_listing_are_left_alone(self):
+        self.make_event("1", days_until_start=-1)
+        self.make_event("2", days_until_start=30)
+        self.assertFalse(self.reconcile(set()))
+        self.assertFalse(Event.all_objects.filter(missing_since__isnull=False).exists())
+
+
+@override_settings(MEETUP_EVENT_FETCH_CONCURRENCY=2)
+class IngestMeetupGroupEventsTests(TestCase):
+    listing = {
+        "https://www.meetup.com/some-group/events/1/": "fp1",
+        "https://www.meetup.com/some-group/events/2/": "fp2",
+    }
+
+    def setUp(self):
+        platform = baker.make("web.SocialPlatform", name="Meetup")
+        self.group = baker.make("web.TechGroup", name="Some Group", platform=platform)
+        self.group.links.add(
+            baker.make("web.Link", name="Some Group Meetup page", url="https://www.meetup.com/some-group")
+        )
+        self.known = baker.make(
+            "web.Event",
+            group=self.group,
+            social_platform_id="1",
+            start_datetime=datetime(2099, 1, 1, tzinfo=timezone.utc),
+            listing_fingerprint="fp1",
+            last_scraped_at=datetime(2030, 1, 1, tzinfo=timezone.utc),
+        )
+
+    def ingest(self, listing_records: dict, details: list[dict]):
+        with (
+            patch("web.utilities.scrapers.meetup.get_event_listing_page", return_value="<html></html>"),
+            patch("web.utilities.scrapers.meetup.parse_event_listing", return_value=self.listing),
+            patch("web.utilities.scrapers.meetup.parse_event_listing_records", return_value=listing_records),
+            patch("web.utilities.scrapers.meetup.get_events_information", return_value=details) as mock_fetch,
+            self.captureOnCommitCallbacks(),
+        ):
+            message = ingest_group_events(self.group.pk)
+        return message, mock_fetch
+
+    def test_only_new_events_are_fetched(self):
+        message, mock_fetch = self.ingest({}, [build_event_data("2")])
+        mock_fetch.assert_called_once_with(["https://www.meetup.com/some-group/events/2/"], concurrency=2)
+        self.assertIn("skipped 1 known events", message)
+        self.assertIn("1 unchanged, 0 updated, 1 created", message)
+        self.assertEqual(Event.objects.get(social_platform_id="2").listing_fingerprint, "fp2")
+        self.assertEqual(Event.objects.get(pk=self.known.pk).updated_at, self.known.updated_at)
+
+    def test_complete_listing_record_needs_no_detail_page(self):
+        records = {"https://www.meetup.com/some-group/events/2/": build_event_data("2", name="from listing")}
+        message, mock_fetch = self.ingest(records, [])
+        mock_fetch.assert_called_once_with([], concurrency=2)
+        self.assertEqual(Event.objects.get(social_platform_id="2").name, "from listing")
+
+    def test_detail_page_fills_missing_listing_fields(self):
+        records = {"https://www.meetup.com/some-group/events/2/": build_event_data("2", description="")}
+        detail = {"social_platform_id": "2", "description": "<p>full</p>", "name": "from detail"}
+        message, mock_fetch = self.ingest(records, [detail])
+        mock_fetch.assert_called_once_with(["https://www.meetup.com/some-group/events/2/"], concurrency=2)
+        event = Event.objects.get(social_platform_id="2")
+        self.assertEqual(
+            (event.name, event.description, event.location_name), ("from detail", "<p>full</p>", "some place")
+        )
+
+    def test_failed_detail_page_skips_event(self):
+        records = {"https://www.meetup.com/some-group/events/2/": build_event_data("2", description="")}
+        self.ingest(records, [{}])
+        self.assertFalse(Event.objects.filter(social_platform_id="2").exists())
+
+
+class UpdateGroupDescriptionTests(TestCase):
+    def test_new_description_is_saved(self):
+        group = baker.make("web.TechGroup", description="old")
+        self.assertTrue(update_group_description(group, "new"))
+        group.refresh_from_db()
+        self.assertEqual(group.description, "new")
+        self.assertEqual(group.description_fingerprint, compute_fingerprint("new"))
+
+    def test_matching_fingerprint_skips_write(self):
+        group = baker.make("web.TechGroup", description="same", description_fingerprint=compute_fingerprint("same"))
+        with self.assertNumQueries(0):
+            self.assertFalse(update_group_description(group, "same"))
@@ -0,0 +1,164 @@
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import django
+import requests
+from django.test import TestCase, override_settings
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+django.setup()
+from model_bakery import baker
+from web.models import IngestionRun
+from web.tasks import (
+    build_ingestion_sweep,
+    ingest_eventbrite_organization_details,
+    ingest_future_eventbrite_events,
+    ingest_future_meetup_events,
+    ingest_meetup_group_details,
+    launch_event_ingestion,
+    launch_meetup_event_ingestion,
+    run_ingestion_batch,
+    summarize_ingestion_sweep,
+)
+from web.utilities import http_client
+from web.utilities.ingestion import ScrapedEvent, build_scraped_events
+from web.utilities.scrapers.registry import EventListing, PlatformScraper
+from web.utilities.telemetry import record_fetch
+
+
+def build_event_data(social_platform_id: str) -> dict:
+    return {
+        "name": f"event {social_platform_id}",
+        "url": f"https://www.meetup.com/g/events/{social_platform_id}/",
+        "social_platform_id": social_platform_id,
+        "start_datetime": "2030-01-01T18:00:00Z",
+        "end_datetime": "2030-01-01T20:00:00Z",
+    }
+
+
+def build_step_result(group: str, succeeded: bool = True, duration: float = 1.0, **counts) -> dict:
+    return {
+        "group": group,
+        "task": "web.ingest_group_events",
+        "succeeded": succeeded,
+        "duration": duration,
+        "message": "boom" if not succeeded else "",
+        "created": counts.get("created", 0),
+        "updated": counts.get("updated", 0),
+        "unchanged": counts.get("unchanged", 0),
+    }
+
+
+def build_response(status_code: int) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://example.com/"
+    response._content = b""
+    return response
+
+
+class FakeScraper(PlatformScraper):
+    platform_name = "Meetup"
+
+    def __init__(self, error: Exception | None = None) -> None:
+        self.error = error
+
+    async def list_events(self, url: str) -> EventListing:
+        if self.error:
+            raise self.error
+        http_client.record_response(build_response(429))
+        record_fetch(200, 2048)
+        return EventListing(records={"1": build_event_data("1")})
+
+    async def fetch_events(self, listing: EventListing, event_ids: list[str]) -> dict[str, ScrapedEvent]:
+        return build_scraped_events({event_id: listing.records[event_id] for event_id in event_ids})
+
+
+class LegacyTaskNameTests(TestCase):
+    def test_per_platform_tasks_run_the_pipelines(self):
+        with patch("web.tasks.ingest_group", return_value="done") as mock_ingest:
+            ingest_meetup_group_details(1, "https://www.meetup.com/g")
+            ingest_eventbrite_organization_details(2)
+            ingest_future_meetup_events(3)
+            ingest_future_eventbrite_events(4)
+        self.assertEqual(
+            [call.args for call in mock_ingest.call_args_list],
+            [("details", 1), ("details", 2), ("events", 3), ("events", 4)],
+        )
+        self.assertEqual(ingest_future_meetup_events.name, "web.ingest_future_meetup_events")
+
+    def test_ignored_meetup_concurrency_warns(self):
+        with patch("web.tasks.ingest_group", return_value="done") as mock_ingest:
+            with self.assertWarns(DeprecationWarning):
+                ingest_future_meetup_events(3, concurrency=2)
+        mock_ingest.assert_called_once_with("events", 3)
+
+
+@override_settings(INGESTION_BATCH_SIZE=2)
+class BuildIngestionSweepTests(TestCase):
+    def test_groups_are_split_into_batches(self):
+        sweep = build_ingestion_sweep("sweep", "events", [1, 2, 3])
+        batches = list(sweep.tasks)
+        self.assertEqual([task.args for task in batches], [("events", [1, 2]), ("events", [3])])
+        self.assertEqual(len({task.kwargs["sweep_id"] for task in batches}), 1)
+        self.assertEqual(sweep.body.task, "web.summarize_ingestion_sweep")
+
+    def test_launcher_applies_the_sweep(self):
+        platform = baker.make("web.SocialPlatform", name="Meetup")
+        baker.make("web.TechGroup", platform=platform, enabled=True, _quantity=3)
+        baker.make("web.TechGroup", platform=baker.make("web.SocialPlatform", name="Other"), enabled=True)
+        with patch("web.tasks.chord.apply_async") as mock_apply:
+            self.assertEqual(launch_meetup_event_ingestion(), "ingesting future events for 3 tech groups on Meetup")
+            self.assertEqual(launch_event_ingestion(), "ingesting future events for 3 tech groups")
+        self.assertEqual(mock_apply.call_count, 2)
+
+
+class RunIngestionBatchTests(TestCase):
+    def setUp(self):
+        platform = baker.make("web.SocialPlatform", name="Meetup")
+        self.group = baker.make("web.TechGroup", name="Some Group", platform=platform)
+        self.group.links.add(baker.make("web.Link", name="Some Group Meetup page", url="https://www.meetup.com/g"))
+
+    def run_batch(self, scraper: PlatformScraper, **kwargs) -> list[dict]:
+        with patch("web.utilities.pipeline.get_scraper", return_value=scraper), self.captureOnCommitCallbacks():
+            return run_ingestion_batch("events", [self.group.pk], **kwargs)
+
+    def test_outcome_and_telemetry_are_recorded(self):
+        results = self.run_batch(FakeScraper(), sweep_id="abc")
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0]["group"], "Some Group")
+        self.assertTrue(results[0]["succeeded"])
+        self.assertEqual((results[0]["created"], results[0]["unchanged"], results[0]["pages"]), (1, 0, 2))
+        run = IngestionRun.objects.get(sweep_id="abc")
+        self.assertEqual((run.group, run.task, run.created_count), (self.group, "web.ingest_group_events", 1))
+        self.assertEqual((run.pages_fetched, run.bytes_downloaded, run.throttled_count), (2, 2048, 1))
+        self.assertEqual(run.http_statuses, {"200": 1, "429": 1})
+
+    def test_failure_is_recorded_not_raised(self):
+        results = self.run_batch(FakeScraper(error=ValueError("bad page")))
+        self.assertFalse(results[0]["succeeded"])
+        self.assertEqual(results[0]["message"], "ValueError: bad page")
+        run = IngestionRun.objects.get()
+        self.assertFalse(run.succeeded)
+        self.assertIn("ValueError: bad page", run.error)
+
+
+class SummarizeIngestionSweepTests(TestCase):
+    def test_batches_are_aggregated(self):
+        batch_results = [
+            [build_step_result("a", created=1, unchanged=2), build_step_result("b", duration=4.0, updated=1)],
+            [build_step_result("c", succeeded=False, duration=0.5)],
+        ]
+        summary = summarize_ingestion_sweep(batch_results, "meetup event sweep", time.time())
+        self.assertIn("3 groups, 2 succeeded, 1 failed", summary)
+        self.assertIn("2 unchanged, 1 updated, 1 created", summary)
+        self.assertIn("slowest b 4.0s", summary)
+        self.assertIn("failures: c (boom)", summary)
+
+    def test_empty_sweep(self):
+        self.assertIn("0 groups", summarize_ingestion_sweep([], "meetup event sweep", time.time()))
@@ -37,7 +37,9 @@ class DummyCredential:
 
 
 class LinkedInOrganizationClientTests(unittest.TestCase):
-    def build_client(self, env_path: str | None = None, access_token: str | None = "old-token") -> LinkedInOrganizationClient:
+    def build_client(
+        self, env_path: str | None = None, access_token: str | None = "old-token"
+    ) -> LinkedInOrganizationClient:
         return LinkedInOrganizationClient(
             access_token=access_token,
             organization_urn="urn:li:organization:107506588",
@@ -64,7 +66,7 @@ class LinkedInOrganizationClientTests(unittest.TestCase):
             response.raise_for_status.return_value = None
 
             with (
-                patch("web.utilities.notifiers.linkedin.requests.post", return_value=response) as mock_post,
+                patch("web.utilities.notifiers.linkedin.http_client.post", return_value=response) as mock_post,
                 patch("web.utilities.notifiers.linkedin.settings") as mock_settings,
             ):
                 client.refresh_access_token()
@@ -95,7 +97,7 @@ class LinkedInOrganizationClientTests(unittest.TestCase):
 
         with (
             patch(
-                "web.utilities.notifiers.linkedin.requests.post",
+                "web.utilities.notifiers.linkedin.http_client.post",
                 side_effect=[auth_failure_response, refresh_response, success_response],
             ) as mock_post,
             patch("web.utilities.notifiers.linkedin.settings"),
@@ -129,7 +131,7 @@ class LinkedInOrganizationClientTests(unittest.TestCase):
         refresh_response.raise_for_status.return_value = None
 
         with (
-            patch("web.utilities.notifiers.linkedin.requests.post", return_value=refresh_response),
+            patch("web.utilities.notifiers.linkedin.http_client.post", return_value=refresh_response),
             patch("web.utilities.notifiers.linkedin.settings"),
         ):
             client.refresh_access_token()
@@ -153,7 +155,7 @@ class LinkedInOrganizationClientTests(unittest.TestCase):
 
         with (
             patch(
-                "web.utilities.notifiers.linkedin.requests.post",
+                "web.utilities.notifiers.linkedin.http_client.post",
                 side_effect=[refresh_response, success_response],
             ),
             patch("web.utilities.notifiers.linkedin.settings"),
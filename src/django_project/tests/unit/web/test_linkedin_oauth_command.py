@@ -33,7 +33,9 @@ class LinkedInOAuthCommandTests(unittest.TestCase):
             mock_client = mock_client_class.return_value
             mock_client.build_authorization_url.return_value = "https://www.linkedin.com/oauth/v2/authorization?x=1"
 
-            command.handle(redirect_uri="https://example.com/callback", scope=command.default_scope, state=None, code=None)
+            command.handle(
+                redirect_uri="https://example.com/callback", scope=command.default_scope, state=None, code=None
+            )
 
         command.stdout.write.assert_any_call("Open this URL in a browser and complete the LinkedIn consent flow:")
         command.stdout.write.assert_any_call("https://www.linkedin.com/oauth/v2/authorization?x=1")
@@ -0,0 +1,100 @@
+import os
+import threading
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import django
+from django.test import TestCase, override_settings
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+django.setup()
+from model_bakery import baker
+from web.models import Event, SocialPlatform, TechGroup
+from web.scripts.meetup_graphql_standin import serve_fixtures
+from web.utilities.pipeline import prepare_ingestions, run_pipeline
+from web.utilities.scrapers.meetup import MeetupGraphQLScraper, MeetupScraper
+from web.utilities.scrapers.meetup_graphql import (
+    GRAPHQL_SNAPSHOT_KIND,
+    MeetupGraphQLError,
+)
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures" / "meetup_graphql"
+
+
+class MeetupGraphQLTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = serve_fixtures(FIXTURES_DIR)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.settings_override = override_settings(
+            MEETUP_GRAPHQL_URL=f"http://127.0.0.1:{cls.server.server_port}/",
+            MEETUP_GRAPHQL_GROUPS=["python-spokane", "missing-group"],
+        )
+        cls.settings_override.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.settings_override.disable()
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def make_group(self, urlname: str) -> TechGroup:
+        platform, _ = SocialPlatform.objects.get_or_create(name="Meetup")
+        group: TechGroup = baker.make("web.TechGroup", name=urlname, platform=platform)
+        group.links.add(baker.make("web.Link", name=f"{urlname} Meetup page", url=f"https://www.meetup.com/{urlname}"))
+        return group
+
+    def test_backend_is_chosen_per_group(self):
+        ingestions = prepare_ingestions([self.make_group("python-spokane"), self.make_group("other-group")])
+        self.assertIsInstance(ingestions[0].scraper, MeetupGraphQLScraper)
+        self.assertIs(type(ingestions[1].scraper), MeetupScraper)
+
+    def test_events_are_ingested_without_a_browser(self):
+        group = self.make_group("python-spokane")
+        with patch("web.utilities.scrapers.meetup.get_events_information") as mock_details:
+            ingestion = run_pipeline("events", [group])[0]
+        mock_details.assert_not_called()
+        self.assertTrue(ingestion.succeeded)
+        self.assertEqual(dict(ingestion.telemetry.tiers), {"graphql": 1})
+        # the recurring event's alphanumeric id is left out, as on listing pages
+        events = {event.social_platform_id: event for event in Event.objects.filter(group=group)}
+        self.assertEqual(list(events), ["301234567", "301234568"])
+        self.assertEqual(events["301234567"].location_name, "Spokane Public Library")
+        self.assertEqual(events["301234568"].location_name, "Online event")
+        # the end of an event without an end time follows from its duration
+        lightning_talks = events["301234568"]
+        self.assertEqual(lightning_talks.end_datetime - lightning_talks.start_datetime, timedelta(minutes=90))
+
+    def test_group_description_is_read_from_the_same_query(self):
+        group = self.make_group("python-spokane")
+        ingestion = run_pipeline("details", [group])[0]
+        self.assertIn("updated details", ingestion.message)
+        group.refresh_from_db()
+        self.assertEqual(
+            group.description, "<p>Spokane Python User Group.</p>\n\n<p>Monthly talks and hack nights.</p>"
+        )
+
+    def test_page_description_is_not_replaced(self):
+        group = self.make_group("python-spokane")
+        group.description = '<p>Spokane Python User Group. <a href="https://spokanepython.com">Site</a></p>'
+        group.save()
+        ingestion = run_pipeline("details", [group])[0]
+        self.assertEqual(ingestion.message, "no updates needed for python-spokane")
+        group.refresh_from_db()
+        self.assertIn("<a href=", group.description)
+
+    def test_unknown_group_fails_its_ingestion(self):
+        ingestion = run_pipeline("events", [self.make_group("missing-group")])[0]
+        self.assertIsInstance(ingestion.exception, MeetupGraphQLError)
+
+    def test_snapshots_are_reparsed_into_complete_records(self):
+        content: bytes = b'{"data": {"groupByUrlname": ' + (FIXTURES_DIR / "python-spokane.json").read_bytes() + b"}}"
+        listing = MeetupScraper().parse_snapshot(GRAPHQL_SNAPSHOT_KIND, "https://example.com/", content)
+        self.assertEqual(list(listing.records), ["301234567", "301234568"])
+        self.assertFalse(any(MeetupGraphQLScraper().needs_details(record) for record in listing.records.values()))
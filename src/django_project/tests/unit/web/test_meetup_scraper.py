@@ -0,0 +1,246 @@
+import json
+import os
+import threading
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+import django
+
+django.setup()
+
+from django.test import override_settings
+from web.utilities.html_utils import fetch_many_with_playwright, should_block_request
+from web.utilities.scrapers.meetup import (
+    get_event_listing_page,
+    get_events_information,
+    get_missing_fields,
+    parse_event_information,
+    parse_event_information_from_state,
+    parse_event_listing,
+    parse_event_listing_records,
+)
+from web.utilities.telemetry import collect_fetch_telemetry
+
+EVENT_PAGE = """
+<html><body>
+<h1 class="ds2-b32 text-ds2-text-fill-primary-enabled lg:ds2-b48">{name}</h1>
+<time class="block" datetime="2030-02-12T18:00:00-08:00">Tuesday, Feb 12 · 6:00 PM to 8:00 PM PST</time>
+</body></html>
+"""
+
+
+def build_state_page(state: dict) -> str:
+    next_data = {"props": {"pageProps": {"__APOLLO_STATE__": state}}}
+    return (
+        f'<html><head><script id="__NEXT_DATA__" type="application/json">{json.dumps(next_data)}</script></head></html>'
+    )
+
+
+EVENT_STATE = {
+    "Event:305": {
+        "__typename": "Event",
+        "id": "305",
+        "title": "Python Night",
+        "description": "Talks.\n\nPizza.",
+        "dateTime": "2030-02-12T18:00:00-08:00",
+        "endTime": "2030-02-12T20:00:00-08:00",
+        "venue": {"__ref": "Venue:9"},
+    },
+    "Venue:9": {
+        "__typename": "Venue",
+        "id": "9",
+        "name": "Some Hall",
+        "address": "1 Main St",
+        "city": "Spokane",
+        "state": "WA",
+        "country": "us",
+        "lat": 47.6,
+        "lng": -117.4,
+    },
+}
+
+
+class ParseEventInformationFromStateTests(unittest.TestCase):
+    url = "https://www.meetup.com/some-group/events/305/"
+
+    def test_extracts_event_from_page_state(self):
+        event_info = parse_event_information_from_state(self.url, build_state_page(EVENT_STATE))
+        self.assertEqual(event_info["name"], "Python Night")
+        self.assertEqual(event_info["description"], "<p>Talks.</p>\n\n<p>Pizza.</p>")
+        self.assertEqual(event_info["start_datetime"].isoformat(), "2030-02-12T18:00:00-08:00")
+        self.assertEqual(event_info["end_datetime"].hour, 20)
+        self.assertEqual(event_info["location_name"], "Some Hall")
+        self.assertEqual(event_info["location_address"], "1 Main St, Spokane, WA, US")
+        self.assertIn("47.6", event_info["map_link"])
+        self.assertEqual(event_info["social_platform_id"], "305")
+
+    def test_end_time_from_duration(self):
+        state = {"Event:305": {**EVENT_STATE["Event:305"], "endTime": None, "duration": "PT1H30M", "venue": None}}
+        event_info = parse_event_information_from_state(self.url, build_state_page(state))
+        self.assertEqual((event_info["end_datetime"].hour, event_info["end_datetime"].minute), (19, 30))
+        self.assertIsNone(event_info["location_name"])
+
+    def test_missing_state_returns_empty(self):
+        self.assertEqual(parse_event_information_from_state(self.url, EVENT_PAGE.format(name="x")), {})
+
+    def test_other_event_in_state_is_ignored(self):
+        page = build_state_page(EVENT_STATE)
+        self.assertEqual(parse_event_information_from_state("https://www.meetup.com/g/events/999/", page), {})
+
+    def test_parser_falls_back_to_html(self):
+        event_info = parse_event_information(self.url, EVENT_PAGE.format(name="from html"))
+        self.assertEqual(event_info["name"], "from html")
+
+
+class GetEventsInformationTests(unittest.TestCase):
+    def test_results_follow_url_order(self):
+        urls = [f"https://www.meetup.com/some-group/events/{event_id}/" for event_id in (3, 1, 2)]
+        pages = {url: EVENT_PAGE.format(name=f"event {url[-2]}") for url in reversed(urls)}
+        with (
+            patch("web.utilities.scrapers.meetup.fetch_content", side_effect=Exception("403")),
+            patch("web.utilities.scrapers.meetup.fetch_many_with_playwright", return_value=pages) as mock_fetch,
+        ):
+            results = get_events_information(urls, concurrency=3)
+        mock_fetch.assert_called_once_with(urls, concurrency=3, lean=True, wait_for="script#__NEXT_DATA__", stats=None)
+        self.assertEqual([result["social_platform_id"] for result in results], ["3", "1", "2"])
+        self.assertEqual([result["name"] for result in results], ["event 3", "event 1", "event 2"])
+        self.assertEqual(results[0]["end_datetime"].hour, 20)
+
+    def test_static_html_with_page_state_needs_no_browser(self):
+        urls = ["https://www.meetup.com/some-group/events/305/", "https://www.meetup.com/some-group/events/306/"]
+        static_pages = {
+            urls[0]: build_state_page(EVENT_STATE).encode(),
+            urls[1]: EVENT_PAGE.format(name="no description").encode(),
+        }
+        with (
+            collect_fetch_telemetry() as telemetry,
+            patch("web.utilities.scrapers.meetup.fetch_content", side_effect=static_pages.get),
+            patch(
+                "web.utilities.scrapers.meetup.fetch_many_with_playwright",
+                return_value={urls[1]: EVENT_PAGE.format(name="from browser")},
+            ) as mock_fetch,
+        ):
+            results = get_events_information(urls, concurrency=2)
+        self.assertEqual(mock_fetch.call_args.args[0], [urls[1]])
+        self.assertEqual([result["name"] for result in results], ["Python Night", "from browser"])
+        self.assertEqual(telemetry.tiers, {"requests": 1, "playwright": 1})
+
+    def test_static_requests_run_concurrently(self):
+        urls = ["https://www.meetup.com/some-group/events/305/", "https://www.meetup.com/some-group/events/306/"]
+        both_requested = threading.Barrier(2, timeout=5)
+
+        def fetch(url: str) -> bytes:
+            # only returns once both pages are being requested at the same time
+            both_requested.wait()
+            return build_state_page(EVENT_STATE).encode()
+
+        with (
+            patch("web.utilities.scrapers.meetup.fetch_content", side_effect=fetch) as mock_static,
+            patch("web.utilities.scrapers.meetup.fetch_many_with_playwright", return_value={}),
+        ):
+            results = get_events_information(urls, concurrency=2)
+        self.assertEqual(mock_static.call_count, 2)
+        self.assertFalse(both_requested.broken)
+        self.assertEqual(results[0]["name"], "Python Night")
+
+    @override_settings(MEETUP_STATIC_FETCH=False)
+    def test_static_fetch_can_be_disabled(self):
+        url = "https://www.meetup.com/some-group/events/305/"
+        with (
+            patch("web.utilities.scrapers.meetup.fetch_content") as mock_static,
+            patch("web.utilities.scrapers.meetup.fetch_many_with_playwright", return_value={}),
+        ):
+            get_events_information([url])
+        mock_static.assert_not_called()
+
+
+class GetEventListingPageTests(unittest.TestCase):
+    url = "https://www.meetup.com/some-group"
+
+    def test_static_listing_with_page_state_is_used(self):
+        page = build_state_page(EVENT_STATE)
+        with (
+            patch("web.utilities.scrapers.meetup.fetch_content", return_value=page.encode()),
+            patch("web.utilities.scrapers.meetup.fetch_content_with_playwright") as mock_browser,
+        ):
+            self.assertEqual(get_event_listing_page(self.url), page)
+        mock_browser.assert_not_called()
+
+    def test_listing_without_page_state_is_loaded_in_browser(self):
+        with (
+            patch("web.utilities.scrapers.meetup.fetch_content", return_value=b"<html></html>"),
+            patch(
+                "web.utilities.scrapers.meetup.fetch_content_with_playwright", return_value="rendered"
+            ) as mock_browser,
+        ):
+            self.assertEqual(get_event_listing_page(self.url), "rendered")
+        self.assertEqual(mock_browser.call_args.args[0], f"{self.url}/events/?type=upcoming")
+
+
+class FetchManyWithPlaywrightTests(unittest.TestCase):
+    def test_empty_url_list(self):
+        self.assertEqual(fetch_many_with_playwright([]), {})
+
+    def test_concurrency_of_one_uses_pooled_browser(self):
+        urls = ["https://example.com/a", "https://example.com/b"]
+        with patch("web.utilities.html_utils.fetch_content_with_playwright", side_effect=["a", "b"]) as mock_fetch:
+            self.assertEqual(fetch_many_with_playwright(urls, concurrency=1), {urls[0]: "a", urls[1]: "b"})
+        self.assertEqual(mock_fetch.call_count, 2)
+
+
+class ShouldBlockRequestTests(unittest.TestCase):
+    page_url = "https://www.meetup.com/some-group/events/305/"
+
+    def test_first_party_document_and_scripts_are_allowed(self):
+        self.assertFalse(should_block_request("document", self.page_url, self.page_url))
+        self.assertFalse(should_block_request("script", "https://secure.meetup.com/app.js", self.page_url))
+        self.assertFalse(should_block_request("fetch", "https://www.meetup.com/gql2", self.page_url))
+
+    def test_non_essential_resource_types_are_blocked(self):
+        for resource_type in ("image", "font", "stylesheet", "media"):
+            self.assertTrue(should_block_request(resource_type, "https://www.meetup.com/x", self.page_url))
+
+    def test_third_party_requests_are_blocked(self):
+        self.assertTrue(should_block_request("script", "https://www.googletagmanager.com/gtm.js", self.page_url))
+        self.assertTrue(should_block_request("script", "https://notmeetup.com/app.js", self.page_url))
+
+
+class ParseEventListingTests(unittest.TestCase):
+    def build_listing_page(self, state: dict) -> str:
+        urls = "".join(f'"eventUrl":"https://www.meetup.com/some-group/events/{event_id}/",' for event_id in (305, 306))
+        return build_state_page(state).replace("</head>", f"<script>{{{urls}}}</script></head>")
+
+    def test_events_are_fingerprinted_in_listing_order(self):
+        listing = parse_event_listing(self.build_listing_page(EVENT_STATE))
+        self.assertEqual(
+            list(listing), [f"https://www.meetup.com/some-group/events/{event_id}/" for event_id in (305, 306)]
+        )
+        self.assertTrue(listing["https://www.meetup.com/some-group/events/305/"])
+        self.assertEqual(listing["https://www.meetup.com/some-group/events/306/"], "")
+
+    def test_fingerprint_follows_listing_fields(self):
+        renamed = {**EVENT_STATE, "Event:305": {**EVENT_STATE["Event:305"], "title": "Renamed"}}
+        rsvp_change = {**EVENT_STATE, "Event:305": {**EVENT_STATE["Event:305"], "going": 40}}
+        url = "https://www.meetup.com/some-group/events/305/"
+        original = parse_event_listing(self.build_listing_page(EVENT_STATE))[url]
+        self.assertNotEqual(parse_event_listing(self.build_listing_page(renamed))[url], original)
+        self.assertEqual(parse_event_listing(self.build_listing_page(rsvp_change))[url], original)
+
+    def test_listing_records_are_built_from_page_state(self):
+        records = parse_event_listing_records(self.build_listing_page(EVENT_STATE))
+        record = records["https://www.meetup.com/some-group/events/305/"]
+        self.assertEqual((record["name"], record["location_name"]), ("Python Night", "Some Hall"))
+        self.assertEqual(get_missing_fields(record), [])
+        self.assertEqual(records["https://www.meetup.com/some-group/events/306/"], {})
+
+    def test_truncated_description_counts_as_missing(self):
+        excerpt = {**EVENT_STATE, "Event:305": {**EVENT_STATE["Event:305"], "description": "Talks and…"}}
+        record = parse_event_listing_records(self.build_listing_page(excerpt))[
+            "https://www.meetup.com/some-group/events/305/"
+        ]
+        self.assertEqual(get_missing_fields(record), ["description"])
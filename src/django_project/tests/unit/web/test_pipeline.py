@@ -0,0 +1,201 @@
+import asyncio
+import os
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import django
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+django.setup()
+from model_bakery import baker
+from web.models import Event, HttpCacheEntry, SocialPlatform, TechGroup
+from web.utilities.ingestion import ScrapedEvent, build_scraped_events
+from web.utilities.pipeline import (
+    PIPELINES,
+    fetch_group_events,
+    list_group_events,
+    run_pipeline,
+    select_group_events,
+    write_group_events,
+)
+from web.utilities.scrapers.eventbrite import EventbriteScraper
+from web.utilities.scrapers.meetup import MeetupScraper
+from web.utilities.scrapers.registry import EventListing, PlatformScraper, get_scraper
+
+
+class SlowScraper(PlatformScraper):
+    """lists one event per group after a delay, tracking how many groups are being listed at once"""
+
+    def __init__(self, platform_name: str, tracker: dict) -> None:
+        self.platform_name = platform_name
+        self.tracker = tracker
+
+    async def list_events(self, url: str) -> EventListing:
+        self.tracker["active"] += 1
+        self.tracker["peak"] = max(self.tracker["peak"], self.tracker["active"])
+        await asyncio.sleep(0.05)
+        self.tracker["active"] -= 1
+        event_id = url.rsplit("/", 1)[-1]
+        return EventListing(
+            records={
+                event_id: {
+                    "name": f"event {event_id}",
+                    "url": f"{url}/events/{event_id}/",
+                    "social_platform_id": event_id,
+                    "start_datetime": "2030-01-01T18:00:00Z",
+                    "end_datetime": "2030-01-01T20:00:00Z",
+                    "tags": ["python"],
+                }
+            }
+        )
+
+    async def fetch_events(self, listing: EventListing, event_ids: list[str]) -> dict[str, ScrapedEvent]:
+        return build_scraped_events({event_id: listing.records[event_id] for event_id in event_ids})
+
+
+def make_group(platform_name: str, name: str, url: str) -> TechGroup:
+    platform, _ = SocialPlatform.objects.get_or_create(name=platform_name)
+    group: TechGroup = baker.make("web.TechGroup", name=name, platform=platform)
+    group.links.add(baker.make("web.Link", name=f"{name} {platform_name} page", url=url))
+    return group
+
+
+class GetScraperTests(TestCase):
+    def test_scrapers_are_registered_by_platform_name(self):
+        self.assertIsInstance(get_scraper("Meetup"), MeetupScraper)
+        self.assertIsInstance(get_scraper(baker.make("web.SocialPlatform", name="Eventbrite")), EventbriteScraper)
+
+    def test_unknown_platform_has_no_scraper(self):
+        with self.assertRaises(LookupError):
+            get_scraper("Other")
+        with self.assertRaises(LookupError):
+            get_scraper(None)
+
+
+class RunPipelineTests(TestCase):
+    def test_groups_on_different_platforms_are_scraped_concurrently(self):
+        tracker = {"active": 0, "peak": 0}
+        groups = [
+            make_group("Meetup", "Group A", "https://example.com/1"),
+            make_group("Eventbrite", "Group B", "https://example.com/2"),
+        ]
+        with patch("web.utilities.pipeline.get_scraper", side_effect=lambda name: SlowScraper(name, tracker)):
+            ingestions = run_pipeline("events", groups, concurrency={"meetup": 1, "eventbrite": 1})
+        self.assertEqual(tracker["peak"], 2)
+        self.assertTrue(all(ingestion.succeeded for ingestion in ingestions))
+        self.assertIn("0 unchanged, 0 updated, 1 created", ingestions[0].message)
+        self.assertEqual(
+            list(Event.objects.get(social_platform_id="2").tags.values_list("value", flat=True)), ["python"]
+        )
+
+    def test_platform_concurrency_is_bounded(self):
+        tracker = {"active": 0, "peak": 0}
+        groups = [make_group("Meetup", f"Group {index}", f"https://example.com/{index}") for index in range(3)]
+        with patch("web.utilities.pipeline.get_scraper", side_effect=lambda name: SlowScraper(name, tracker)):
+            run_pipeline("events", groups, concurrency={"meetup": 1})
+        self.assertEqual(tracker["peak"], 1)
+
+    @override_settings(EVENT_CANCELLATION_GRACE_HOURS=24)
+    def test_events_missing_from_the_listing_are_cancelled(self):
+        group = make_group("Meetup", "Group A", "https://example.com/1")
+        soon = timezone.now() + timedelta(days=1)
+        baker.make("web.Event", group=group, social_platform_id="9", start_datetime=soon)
+        baker.make(
+            "web.Event",
+            group=group,
+            social_platform_id="8",
+            start_datetime=soon,
+            missing_since=timezone.now() - timedelta(days=2),
+        )
+        tracker = {"active": 0, "peak": 0}
+        with patch("web.utilities.pipeline.get_scraper", side_effect=lambda name: SlowScraper(name, tracker)):
+            ingestion = run_pipeline("events", [group])[0]
+        self.assertIn("events missing from the listing: 1 newly missing, 1 cancelled, 0 restored", ingestion.message)
+        self.assertEqual(
+            sorted(Event.objects.filter(group=group).values_list("social_platform_id", flat=True)), ["1", "9"]
+        )
+        self.assertEqual(Event.all_objects.filter(group=group).count(), 3)
+
+    def test_groups_are_written_while_others_are_still_scraped(self):
+        tracker = {"active": 0, "peak": 0}
+        order: list[str] = []
+
+        class UnevenScraper(SlowScraper):
+            async def list_events(self, url: str) -> EventListing:
+                if url.endswith("/2"):
+                    await asyncio.sleep(0.2)
+                listing = await super().list_events(url)
+                order.append(f"listed {url[-1]}")
+                return listing
+
+        def recording_write(ingestion) -> None:
+            write_group_events(ingestion)
+            order.append(f"written {ingestion.url[-1]}")
+
+        groups = [make_group("Meetup", f"Group {index}", f"https://example.com/{index}") for index in (1, 2)]
+        stages = (list_group_events, select_group_events, fetch_group_events, recording_write)
+        with (
+            patch.dict(PIPELINES, {"events": stages}),
+            patch("web.utilities.pipeline.get_scraper", side_effect=lambda name: UnevenScraper(name, tracker)),
+        ):
+            ingestions = run_pipeline("events", groups, concurrency={"meetup": 2})
+        self.assertEqual(order, ["listed 1", "written 1", "listed 2", "written 2"])
+        self.assertEqual(
+            set(ingestions[1].stage_durations),
+            {"list_group_events", "select_group_events", "fetch_group_events", "recording_write", "queued"},
+        )
+
+    def test_groups_without_a_scraper_or_page_are_skipped(self):
+        unsupported = make_group("Other", "Unsupported", "https://example.com/1")
+        no_page = baker.make("web.TechGroup", name="No Page", platform=SocialPlatform.objects.create(name="Meetup"))
+        ingestions = run_pipeline("events", [unsupported, no_page])
+        self.assertIn("no scraper registered", ingestions[0].message)
+        self.assertEqual(ingestions[1].message, "no Meetup links found for No Page")
+
+
+class GroupDetailsPipelineTests(TestCase):
+    def setUp(self):
+        self.group = make_group("Eventbrite", "Some Org", "https://www.eventbrite.com/o/some-org-42")
+
+    def test_description_and_website_are_saved(self):
+        details = {"long_description": {"text": "<p>about</p>"}, "website": "https://some.org"}
+        with patch("web.utilities.scrapers.eventbrite.get_organization_details", return_value=details) as mock_get:
+            ingestion = run_pipeline("details", [self.group])[0]
+        mock_get.assert_called_once_with("42")
+        self.assertEqual(ingestion.message, "updated details for Some Org")
+        self.assertEqual(ingestion.counts, {"created": 0, "updated": 1, "unchanged": 0})
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.description, "<p>about</p>")
+        self.assertTrue(self.group.links.filter(url="https://some.org").exists())
+
+    def test_unchanged_page_is_not_written(self):
+        with patch.object(EventbriteScraper, "fetch_group", return_value=None):
+            ingestion = run_pipeline("details", [self.group])[0]
+        self.assertEqual(ingestion.message, "no updates needed for Some Org")
+        self.assertEqual(ingestion.counts["unchanged"], 1)
+
+    def test_page_validators_are_saved_only_after_the_write(self):
+        group = make_group("Meetup", "Some Group", "https://www.meetup.com/some-group")
+        fetched = (b"<html></html>", HttpCacheEntry(url="https://www.meetup.com/some-group", etag='"abc"'))
+        with (
+            patch("web.utilities.scrapers.meetup.fetch_content_if_changed", return_value=fetched),
+            patch("web.utilities.scrapers.meetup.parse_group_description", return_value="<p>about</p>"),
+        ):
+            with patch("web.utilities.pipeline.update_group_description", side_effect=RuntimeError("db down")):
+                self.assertFalse(run_pipeline("details", [group])[0].succeeded)
+            self.assertFalse(HttpCacheEntry.objects.exists())
+            self.assertTrue(run_pipeline("details", [group])[0].succeeded)
+        self.assertEqual(HttpCacheEntry.objects.get().etag, '"abc"')
+
+    def test_page_validators_are_loaded_before_the_fetch(self):
+        group = make_group("Meetup", "Some Group", "https://www.meetup.com/some-group")
+        HttpCacheEntry.objects.create(url="https://www.meetup.com/some-group", etag='"old"')
+        with patch("web.utilities.scrapers.meetup.fetch_content_if_changed", return_value=(None, None)) as mock_fetch:
+            run_pipeline("details", [group])
+        self.assertEqual(mock_fetch.call_args.args[1].etag, '"old"')
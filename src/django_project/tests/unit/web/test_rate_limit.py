@@ -0,0 +1,162 @@
+import asyncio
+import os
+import unittest
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock, Mock, patch
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+import django
+
+django.setup()
+
+import redis
+from django.test import override_settings
+from web.utilities import http_client
+from web.utilities.html_utils import _fetch_page_async
+from web.utilities.rate_limit import (
+    LocalTokenBucket,
+    RateLimiter,
+    get_rate_limiter_for_url,
+    get_redis_client,
+    parse_retry_after,
+)
+from web.utilities.replay import replay_session
+
+
+class LocalTokenBucketTests(unittest.TestCase):
+    def test_burst_then_wait(self):
+        with patch("web.utilities.rate_limit.time.monotonic", return_value=100.0):
+            bucket = LocalTokenBucket(rate=2.0, burst=2)
+            self.assertEqual(bucket.try_acquire(), 0.0)
+            self.assertEqual(bucket.try_acquire(), 0.0)
+            self.assertAlmostEqual(bucket.try_acquire(), 0.5)
+
+    def test_tokens_refill_over_time(self):
+        with patch("web.utilities.rate_limit.time.monotonic", side_effect=[100.0, 100.0, 100.5]):
+            bucket = LocalTokenBucket(rate=2.0, burst=1)
+            self.assertEqual(bucket.try_acquire(), 0.0)
+            self.assertEqual(bucket.try_acquire(), 0.0)
+
+    def test_penalize_blocks_until_delay_passes(self):
+        with patch("web.utilities.rate_limit.time.monotonic", return_value=100.0):
+            bucket = LocalTokenBucket(rate=10.0, burst=10)
+            bucket.penalize(30)
+            bucket.penalize(5)  # a shorter penalty never shortens a longer one
+            self.assertEqual(bucket.try_acquire(), 30.0)
+
+
+class RateLimiterTests(unittest.TestCase):
+    def build_limiter(self, acquire_results: list) -> tuple[RateLimiter, MagicMock]:
+        client = MagicMock()
+        acquire_script = Mock(side_effect=acquire_results)
+        penalize_script = Mock()
+        client.register_script.side_effect = [acquire_script, penalize_script]
+        return RateLimiter("eventbrite", rate=1.0, burst=1, client=client), client
+
+    def test_acquire_waits_for_redis_bucket(self):
+        limiter, _ = self.build_limiter(["0.25", "0"])
+        with patch("web.utilities.rate_limit.time.sleep") as mock_sleep:
+            limiter.acquire()
+        mock_sleep.assert_called_once_with(0.25)
+        limiter.acquire_script.assert_called_with(
+            keys=["web:ratelimit:eventbrite:bucket", "web:ratelimit:eventbrite:blocked_until"], args=[1.0, 1]
+        )
+
+    def test_acquire_timeout(self):
+        limiter, _ = self.build_limiter(["120"])
+        with self.assertRaises(TimeoutError):
+            limiter.acquire(timeout=10)
+
+    def test_penalize_is_shared_through_redis(self):
+        limiter, _ = self.build_limiter([])
+        limiter.penalize(12)
+        limiter.penalize_script.assert_called_once_with(keys=["web:ratelimit:eventbrite:blocked_until"], args=[12])
+
+    def test_redis_errors_fall_back_to_local_bucket(self):
+        limiter, _ = self.build_limiter([redis.ConnectionError("down")])
+        self.assertEqual(limiter.try_acquire(), 0.0)
+
+
+class GetRateLimiterForUrlTests(unittest.TestCase):
+    @override_settings(RATE_LIMIT_REDIS_URL=None)
+    def test_platform_hosts_are_limited(self):
+        limiter = get_rate_limiter_for_url("https://www.eventbriteapi.com/v3/organizers/1/events/")
+        self.assertEqual(limiter.name, "eventbrite")
+        self.assertIs(limiter, get_rate_limiter_for_url("https://www.eventbrite.com/api/v3/destination/events/"))
+
+    @override_settings(RATE_LIMIT_REDIS_URL="redis://redis:6379/0", RATE_LIMIT_REDIS_TIMEOUT=1.5)
+    def test_redis_client_times_out(self):
+        with patch("web.utilities.rate_limit.redis.Redis.from_url") as mock_from_url:
+            get_redis_client()
+        mock_from_url.assert_called_once_with("redis://redis:6379/0", socket_timeout=1.5, socket_connect_timeout=1.5)
+
+    def test_other_hosts_are_not_limited(self):
+        self.assertIsNone(get_rate_limiter_for_url("https://discord.com/api/webhooks/1"))
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("7"), 7.0)
+        self.assertIsNone(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"))
+        self.assertIsNone(parse_retry_after(None))
+
+
+class HttpClientRateLimitTests(unittest.TestCase):
+    def test_429_with_retry_after_backs_off_platform(self):
+        limiter = Mock()
+        response = Mock(status_code=429, headers={"Retry-After": "20"})
+        with (
+            patch("web.utilities.http_client.get_rate_limiter_for_url", return_value=limiter),
+            patch.object(http_client.get_session(), "request", return_value=response),
+        ):
+            http_client.get("https://www.eventbriteapi.com/v3/x")
+        limiter.acquire.assert_called_once_with()
+        limiter.penalize.assert_called_once_with(20.0)
+
+    def test_replayed_requests_take_no_token(self):
+        limiter = Mock()
+        with (
+            patch("web.utilities.http_client.get_rate_limiter_for_url", return_value=limiter),
+            patch("web.utilities.http_client.load_response", return_value=Mock(status_code=200)),
+            patch("web.utilities.http_client.record_response"),
+            replay_session("fixtures", mode="replay"),
+        ):
+            http_client.get("https://www.eventbriteapi.com/v3/x")
+        limiter.acquire.assert_not_called()
+
+
+class PlaywrightRateLimitTests(unittest.TestCase):
+    def test_429_is_retried_rather_than_returned(self):
+        limiter = Mock(acquire_async=AsyncMock(), penalize_async=AsyncMock())
+        page = MagicMock(
+            goto=AsyncMock(side_effect=[Mock(status=429, headers={"retry-after": "20"}), Mock(status=200, headers={})]),
+            route=AsyncMock(),
+            wait_for_selector=AsyncMock(),
+            content=AsyncMock(return_value="<html>events</html>"),
+        )
+        context = Mock(new_page=AsyncMock(return_value=page), close=AsyncMock())
+        browser = Mock(new_context=AsyncMock(return_value=context))
+        with (
+            patch("web.utilities.html_utils.get_rate_limiter_for_url", return_value=limiter),
+            patch("web.utilities.html_utils.prepare_page_async", AsyncMock()),
+            patch("web.utilities.html_utils.asyncio.sleep", AsyncMock()),
+            patch("web.utilities.html_utils.record_fetch") as mock_record,
+        ):
+            content = asyncio.run(
+                _fetch_page_async(
+                    browser,
+                    "https://www.meetup.com/g/events/1/",
+                    asyncio.Semaphore(1),
+                    3,
+                    1000,
+                    True,
+                    "main",
+                    None,
+                    None,
+                )
+            )
+        self.assertEqual(content, "<html>events</html>")
+        limiter.penalize_async.assert_awaited_once_with(20.0)
+        page.wait_for_selector.assert_awaited_once()
+        mock_record.assert_called_once_with(200, 0)
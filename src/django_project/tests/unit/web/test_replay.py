@@ -0,0 +1,173 @@
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import django
+import requests
+from django.test import TestCase, override_settings
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+django.setup()
+from model_bakery import baker
+from web.models import Event
+from web.tasks import ingest_group_events
+from web.utilities import http_client
+from web.utilities.replay import (
+    ReplayMissError,
+    get_recording_key,
+    get_replay_config,
+    prepare_page,
+    replay_session,
+)
+
+
+def build_response(url: str, status_code: int = 200, content: bytes = b"{}") -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = url
+    response.headers["Content-Type"] = "application/json"
+    response._content = content
+    return response
+
+
+@override_settings(RATE_LIMITS={})
+class HttpReplayTests(TestCase):
+    url = "https://example.com/api/?b=2&a=1"
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def record(self, url: str, content: bytes, **kwargs) -> None:
+        with (
+            replay_session(self.directory.name, mode="record"),
+            patch.object(http_client.get_session(), "request", return_value=build_response(url, content=content)),
+        ):
+            http_client.request(kwargs.pop("method", "GET"), url, **kwargs)
+
+    def test_recorded_response_is_replayed_without_network(self):
+        self.record(self.url, b'{"ok": true}')
+        with (
+            replay_session(self.directory.name),
+            patch.object(http_client.get_session(), "request") as mock_request,
+        ):
+            response = http_client.get("https://example.com/api/?a=1&b=2")
+        mock_request.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"ok": True})
+
+    def test_unrecorded_request_raises(self):
+        with replay_session(self.directory.name), self.assertRaises(ReplayMissError):
+            http_client.get(self.url)
+
+    def test_post_bodies_are_recorded_separately(self):
+        self.record(self.url, b'{"n": 1}', method="POST", json={"n": 1})
+        self.record(self.url, b'{"n": 2}', method="POST", json={"n": 2})
+        with replay_session(self.directory.name):
+            self.assertEqual(http_client.post(self.url, json={"n": 2}).json(), {"n": 2})
+
+    def test_every_nth_request_is_throttled(self):
+        self.record(self.url, b"{}")
+        with replay_session(self.directory.name, throttle_every=2, retry_after=7) as config:
+            statuses = [http_client.get(self.url).status_code for _ in range(4)]
+        self.assertEqual(statuses, [200, 429, 200, 429])
+        self.assertEqual(config.requests_served, 4)
+
+    def test_latency_is_injected(self):
+        self.record(self.url, b"{}")
+        with replay_session(self.directory.name, latency=0.5), patch("web.utilities.replay.time.sleep") as mock_sleep:
+            http_client.get(self.url)
+        mock_sleep.assert_called_once_with(0.5)
+
+    def test_session_does_not_leak_into_other_threads(self):
+        modes: list[str] = []
+        with replay_session(self.directory.name):
+            thread = threading.Thread(target=lambda: modes.append(get_replay_config().mode))
+            thread.start()
+            thread.join()
+            modes.append(get_replay_config().mode)
+        self.assertEqual(modes, ["off", "replay"])
+
+    def test_volatile_query_params_are_not_part_of_the_key(self):
+        self.assertEqual(
+            get_recording_key("GET", "https://x.test/e/?start_date.range_start=2030-01-01&id=1"),
+            get_recording_key("GET", "https://x.test/e/?id=1&start_date.range_start=2031-05-05"),
+        )
+
+
+class PrepareReplayPageTests(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def test_off_mode_leaves_page_alone(self):
+        page = MagicMock()
+        prepare_page(page, "https://www.meetup.com/g/events/1/")
+        page.route_from_har.assert_not_called()
+
+    def test_record_mode_updates_har(self):
+        page = MagicMock()
+        with replay_session(self.directory.name, mode="record"):
+            prepare_page(page, "https://www.meetup.com/g/events/1/")
+        self.assertTrue(page.route_from_har.call_args.kwargs["update"])
+
+    def test_replay_mode_serves_har(self):
+        page = MagicMock()
+        with replay_session(self.directory.name, mode="record"):
+            prepare_page(page, "https://www.meetup.com/g/events/1/")
+        Path(page.route_from_har.call_args.args[0]).write_text("{}")
+        page.reset_mock()
+        with replay_session(self.directory.name, throttle_every=1):
+            prepare_page(page, "https://www.meetup.com/g/events/1/")
+        self.assertEqual(page.route_from_har.call_args.kwargs, {"not_found": "abort"})
+        page.route.assert_called_once()  # the injected 429
+
+    def test_replay_mode_missing_har_raises(self):
+        with replay_session(self.directory.name), self.assertRaises(ReplayMissError):
+            prepare_page(MagicMock(), "https://www.meetup.com/g/events/2/")
+
+
+@override_settings(RATE_LIMITS={}, EVENTBRITE_API_KEY="key")
+class OfflineIngestionTests(TestCase):
+    def test_eventbrite_ingestion_runs_from_recordings(self):
+        platform = baker.make("web.SocialPlatform", name="Eventbrite")
+        group = baker.make("web.TechGroup", name="Some Org", platform=platform)
+        group.links.add(baker.make("web.Link", name="Some Org Eventbrite page", url="https://eventbrite.com/o/x-42"))
+        event = {
+            "id": "7",
+            "name": {"text": "Some Event"},
+            "description": {"text": "about"},
+            "url": "https://www.eventbrite.com/e/7",
+            "start": {"utc": "2030-01-01T18:00:00Z"},
+            "end": {"utc": "2030-01-01T20:00:00Z"},
+        }
+        details = {"id": "7", "primary_venue": None, "tags": [{"display_name": "python"}]}
+        responses = [
+            build_response("https://www.eventbriteapi.com/", content=json.dumps({"events": [event]}).encode()),
+            build_response("https://www.eventbrite.com/", content=json.dumps({"events": [details]}).encode()),
+        ]
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        with (
+            replay_session(directory.name, mode="record"),
+            patch("requests.Session.request", side_effect=responses),
+            self.captureOnCommitCallbacks(),
+        ):
+            ingest_group_events(group.pk)
+        Event.objects.all().delete()
+
+        with (
+            replay_session(directory.name),
+            patch("requests.Session.request") as mock_request,
+            self.captureOnCommitCallbacks(),
+        ):
+            message = ingest_group_events(group.pk)
+        mock_request.assert_not_called()
+        self.assertIn("1 created", message)
+        self.assertEqual(Event.objects.get(social_platform_id="7").name, "Some Event")
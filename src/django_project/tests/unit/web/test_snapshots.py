@@ -0,0 +1,204 @@
+import contextvars
+import io
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import django
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+django.setup()
+from model_bakery import baker
+from web.models import Event, PageSnapshot, SocialPlatform
+from web.utilities import snapshots
+from web.utilities.pipeline import reparse_snapshots, run_pipeline
+from web.utilities.scrapers.eventbrite import (
+    EVENT_DETAILS_SNAPSHOT_KIND,
+    EVENTS_SNAPSHOT_KIND,
+)
+from web.utilities.snapshots import (
+    collect_snapshots,
+    prune_snapshots,
+    read_snapshot,
+    record_snapshots,
+    save_snapshot,
+)
+
+LISTING_PAYLOAD = {
+    "events": [
+        {
+            "id": "101",
+            "name": {"text": "Python Night"},
+            "description": {"text": "talks"},
+            "url": "https://www.eventbrite.com/e/101",
+            "start": {"utc": "2030-01-01T18:00:00Z"},
+            "end": {"utc": "2030-01-01T20:00:00Z"},
+        },
+        {
+            "id": "102",
+            "name": {"text": "Rust Night"},
+            "url": "https://www.eventbrite.com/e/102",
+            "start": {"utc": "2030-01-02T18:00:00Z"},
+            "end": {"utc": "2030-01-02T20:00:00Z"},
+        },
+    ]
+}
+DETAILS_PAYLOAD = {
+    "events": [
+        {
+            "id": "101",
+            "primary_venue": {"name": "Library", "address": {"localized_address_display": "1 Main St"}},
+            "tags": [{"display_name": "python"}],
+        }
+    ]
+}
+
+
+class SnapshotStoreTestCase(TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.settings_override = override_settings(
+            SCRAPER_SNAPSHOT_DIR=self.directory.name, SCRAPER_SNAPSHOT_COMPRESSION="gzip"
+        )
+        self.settings_override.enable()
+        self.addCleanup(self.settings_override.disable)
+
+    def store(self, group, url: str, content: dict, kind: str) -> None:
+        with collect_snapshots() as collected:
+            save_snapshot(url, json.dumps(content), kind)
+        record_snapshots(group, collected)
+
+
+class SaveSnapshotTests(SnapshotStoreTestCase):
+    def test_nothing_is_stored_outside_a_collector(self):
+        self.assertIsNone(save_snapshot("https://example.com/", b"<html></html>", "page"))
+        self.assertEqual(list(Path(self.directory.name).iterdir()), [])
+
+    def test_identical_content_is_stored_once(self):
+        with collect_snapshots() as collected:
+            first = save_snapshot("https://example.com/1", "<html>same</html>", "page")
+            second = save_snapshot("https://example.com/2", b"<html>same</html>", "page")
+        self.assertEqual(len(collected), 2)
+        self.assertEqual(first.content_hash, second.content_hash)
+        self.assertEqual(len(list(Path(self.directory.name).glob("*/*.gz"))), 1)
+        self.assertEqual(read_snapshot(first.content_hash, first.compression), b"<html>same</html>")
+
+    def test_threads_storing_the_same_content_do_not_collide(self):
+        both_written = threading.Barrier(2, timeout=5)
+        replace = os.replace
+
+        def replace_together(source: Path, destination: Path) -> None:
+            both_written.wait()
+            replace(source, destination)
+
+        with collect_snapshots() as collected, patch(
+            "web.utilities.snapshots.os.replace", side_effect=replace_together
+        ):
+            threads = [
+                threading.Thread(
+                    target=contextvars.copy_context().run,
+                    args=(save_snapshot, f"https://example.com/{index}", "<html>same</html>", "page"),
+                )
+                for index in range(2)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(collected), 2)
+        self.assertEqual(read_snapshot(collected[0].content_hash, "gzip"), b"<html>same</html>")
+        self.assertEqual(list(Path(self.directory.name).glob("*/*.tmp")), [])
+
+    @override_settings(SCRAPER_SNAPSHOT_COMPRESSION="zstd")
+    def test_zstd_falls_back_to_gzip_without_zstandard(self):
+        with patch.object(snapshots, "zstandard", None):
+            self.assertEqual(snapshots.get_compression(), "gzip")
+
+    def test_pipeline_records_snapshots_of_each_group(self):
+        platform = SocialPlatform.objects.create(name="Eventbrite")
+        group = baker.make("web.TechGroup", name="Some Org", platform=platform)
+        group.links.add(baker.make("web.Link", name="Some Org Eventbrite page", url="https://example.com/o/org-42"))
+        response = {"organizers": [{"long_description": {"text": "about"}}]}
+
+        def get_organization_details(organization_id: str) -> dict:
+            save_snapshot(f"https://example.com/api/{organization_id}", json.dumps(response), "organization")
+            return response["organizers"][0]
+
+        with patch("web.utilities.scrapers.eventbrite.get_organization_details", get_organization_details):
+            run_pipeline("details", [group])
+        snapshot = PageSnapshot.objects.get(group=group)
+        self.assertEqual((snapshot.url, snapshot.kind), ("https://example.com/api/42", "organization"))
+
+
+class PruneSnapshotsTests(SnapshotStoreTestCase):
+    def test_expired_snapshots_and_their_blobs_are_deleted(self):
+        group = baker.make("web.TechGroup")
+        self.store(group, "https://example.com/old", {"old": True}, "page")
+        self.store(group, "https://example.com/new", {"new": True}, "page")
+        old = PageSnapshot.objects.get(url="https://example.com/old")
+        old.fetched_at = timezone.now() - timedelta(days=40)
+        old.save()
+        old_blob = snapshots.get_blob_path(Path(self.directory.name), old.content_hash, old.compression)
+        expired: float = time.time() - 40 * 86400
+        os.utime(old_blob, (expired, expired))
+
+        self.assertEqual(prune_snapshots(retention_days=30), (1, 1))
+        self.assertFalse(old_blob.exists())
+        new = PageSnapshot.objects.get()
+        self.assertEqual(read_snapshot(new.content_hash, new.compression), b'{"new": true}')
+
+
+class ReparseSnapshotsTests(SnapshotStoreTestCase):
+    def setUp(self):
+        super().setUp()
+        platform = SocialPlatform.objects.create(name="Eventbrite")
+        self.group = baker.make("web.TechGroup", name="Some Org", platform=platform)
+        self.group.links.add(
+            baker.make("web.Link", name="Some Org Eventbrite page", url="https://www.eventbrite.com/o/org-42")
+        )
+
+    def test_events_are_rebuilt_from_the_latest_snapshots(self):
+        self.store(self.group, "https://example.com/listing", {"events": []}, EVENTS_SNAPSHOT_KIND)
+        self.store(self.group, "https://example.com/listing", LISTING_PAYLOAD, EVENTS_SNAPSHOT_KIND)
+        self.store(self.group, "https://example.com/details", DETAILS_PAYLOAD, EVENT_DETAILS_SNAPSHOT_KIND)
+
+        with patch("web.utilities.http_client.request") as mock_request:
+            ingestion = reparse_snapshots([self.group])[0]
+        mock_request.assert_not_called()
+        self.assertTrue(ingestion.succeeded)
+        self.assertIn("found 2 upcoming events", ingestion.message)
+        # the event without stored details is left alone, as a live ingestion would
+        event = Event.objects.get()
+        self.assertEqual((event.social_platform_id, event.location_name), ("101", "Library"))
+        self.assertEqual(list(event.tags.values_list("value", flat=True)), ["python"])
+
+    def test_group_without_snapshots_is_skipped(self):
+        ingestion = reparse_snapshots([self.group])[0]
+        self.assertEqual(ingestion.message, "no snapshots stored for Some Org")
+
+    def test_missing_blob_fails_the_group(self):
+        self.store(self.group, "https://example.com/listing", LISTING_PAYLOAD, EVENTS_SNAPSHOT_KIND)
+        for path in Path(self.directory.name).glob("*/*"):
+            path.unlink()
+        ingestion = reparse_snapshots([self.group])[0]
+        self.assertIsInstance(ingestion.exception, FileNotFoundError)
+
+    def test_command_reports_each_group(self):
+        output = io.StringIO()
+        self.store(self.group, "https://example.com/listing", LISTING_PAYLOAD, EVENTS_SNAPSHOT_KIND)
+        with patch("web.management.commands.reparse_snapshots.queue_new_event_posts") as mock_queue:
+            call_command("reparse_snapshots", "--workers", "1", stdout=output)
+        mock_queue.assert_called_once_with([])
+        self.assertIn("reparsed 1 groups, 0 failed", output.getvalue())
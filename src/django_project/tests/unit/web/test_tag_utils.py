@@ -0,0 +1,55 @@
+import os
+from pathlib import Path
+
+import django
+from django.test import TestCase
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+django.setup()
+from blogs.models import BlogPost, BlogTag
+from model_bakery import baker
+from web.models import Event, Tag, TechGroup
+from web.utilities.tag_utils import add_tags, resolve_tags
+
+
+class ResolveTagsTests(TestCase):
+    def test_loads_existing_and_creates_missing(self):
+        existing = baker.make("web.Tag", value="Python")
+        with self.assertNumQueries(3):  # select existing, insert missing, select inserted
+            tags = resolve_tags(Tag, ["Python", " Django ", "", "Python"])
+        self.assertEqual(set(tags), {"Python", "Django"})
+        self.assertEqual(tags["Python"].pk, existing.pk)
+        self.assertEqual(Tag.objects.count(), 2)
+
+    def test_no_insert_when_all_exist(self):
+        baker.make("web.Tag", value="Python")
+        with self.assertNumQueries(1):
+            resolve_tags(Tag, ["Python"])
+
+    def test_works_for_blog_tags(self):
+        tags = resolve_tags(BlogTag, ["Python"])
+        self.assertIsInstance(tags["Python"], BlogTag)
+
+
+class AddTagsTests(TestCase):
+    def test_links_event_tags_once(self):
+        events = baker.make("web.Event", _quantity=2)
+        values = {events[0].pk: ["Python", "Django"], events[1].pk: ["Python"]}
+        add_tags(Event.tags, values)
+        add_tags(Event.tags, values)
+        self.assertEqual(sorted(events[0].tags.values_list("value", flat=True)), ["Django", "Python"])
+        self.assertEqual(list(events[1].tags.values_list("value", flat=True)), ["Python"])
+        self.assertEqual(Event.tags.through.objects.count(), 3)
+
+    def test_links_group_tags(self):
+        group = baker.make("web.TechGroup")
+        add_tags(TechGroup.tags, {group.pk: ["Security"]})
+        self.assertEqual(list(group.tags.values_list("value", flat=True)), ["Security"])
+
+    def test_links_blog_post_tags(self):
+        post = baker.make("blogs.BlogPost")
+        add_tags(BlogPost.tags, {post.pk: ["Python"]})
+        self.assertEqual(list(post.tags.values_list("value", flat=True)), ["Python"])
@@ -0,0 +1,90 @@
+import asyncio
+import os
+from datetime import timedelta
+from pathlib import Path
+
+import django
+import requests
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+
+BASE_DIR = Path(__file__).parents[4]
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+os.environ.setdefault("ENV_PATH", f"{BASE_DIR}/envs/.env.test")
+
+django.setup()
+from model_bakery import baker
+from web.admin import IngestionRunAdmin
+from web.models import IngestionRun
+from web.utilities import http_client
+from web.utilities.telemetry import collect_fetch_telemetry, record_fetch
+
+
+def build_response(status_code: int, content: bytes) -> requests.Response:
+    response = requests.Response()
+    response.status_code = status_code
+    response.url = "https://example.com/"
+    response._content = content
+    return response
+
+
+class CollectFetchTelemetryTests(TestCase):
+    def test_fetches_are_counted_inside_the_block_only(self):
+        record_fetch(200, 10)
+        with collect_fetch_telemetry() as telemetry:
+            record_fetch(200, 100)
+            record_fetch(429)
+            record_fetch(None, 50)
+        record_fetch(200, 10)
+        self.assertEqual((telemetry.pages, telemetry.bytes_downloaded, telemetry.throttled), (3, 150, 1))
+        self.assertEqual(telemetry.statuses, {200: 1, 429: 1})
+
+    def test_fetches_in_asyncio_tasks_are_counted(self):
+        async def fetch_all() -> None:
+            await asyncio.gather(*(asyncio.to_thread(record_fetch, 200, 1) for _ in range(3)))
+
+        with collect_fetch_telemetry() as telemetry:
+            asyncio.run(fetch_all())
+        self.assertEqual(telemetry.pages, 3)
+
+    def test_http_responses_are_counted(self):
+        with collect_fetch_telemetry() as telemetry:
+            http_client.record_response(build_response(200, b"x" * 64))
+            http_client.record_response(build_response(429, b""))
+        self.assertEqual((telemetry.pages, telemetry.bytes_downloaded, telemetry.throttled), (2, 64, 1))
+
+
+class IngestionRunAdminTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.group = baker.make("web.TechGroup", name="Some Group")
+        for days_ago, succeeded, duration in [(1, True, 2.0), (2, False, 4.0), (20, True, 12.0), (40, True, 99.0)]:
+            baker.make(
+                "web.IngestionRun",
+                group=self.group,
+                task="web.ingest_group_events",
+                started_at=now - timedelta(days=days_ago),
+                finished_at=now - timedelta(days=days_ago),
+                succeeded=succeeded,
+                duration=duration,
+                pages_fetched=10,
+                throttled_count=1,
+            )
+
+    def test_trends_are_aggregated_per_window(self):
+        trends = IngestionRunAdmin(IngestionRun, None).get_trends()
+        self.assertEqual(len(trends), 1)
+        last_week, last_month = trends[0]["windows"]
+        self.assertEqual((last_week["runs"], last_week["failures"], last_week["failure_rate"]), (2, 1, 0.5))
+        self.assertEqual((last_week["avg_duration"], last_week["max_duration"]), (3.0, 4.0))
+        self.assertEqual((last_month["runs"], last_month["max_duration"], last_month["throttled"]), (3, 12.0, 3))
+
+    def test_changelist_renders_trends(self):
+        user = get_user_model().objects.create_superuser("admin", "admin@example.com", "password")
+        self.client.force_login(user)
+        response = self.client.get(reverse("admin:web_ingestionrun_changelist"))
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "Trends per group")
+        self.assertContains(response, "Some Group")
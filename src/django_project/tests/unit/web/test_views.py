@@ -144,6 +144,18 @@ class TestGetTechEventsView(TestCase):
         self.assertTemplateUsed(response, "web/partials/list/events.htm")
         self.assertIn(self.instance.name, response.content.decode("utf-8"))
 
+    def test_cancelled_events_are_not_listed(self):
+        """verify cancelled events are left out of the GetTechEvents view"""
+        cancelled = baker.make(
+            "web.Event",
+            name="cancelled event",
+            start_datetime=self.instance.start_datetime,
+            cancelled_at=timezone.now(),
+        )
+        url = reverse("web:get_events", kwargs={"display": "list"})
+        response = self.client.get(url, **self.headers)
+        self.assertNotIn(cancelled.name, response.content.decode("utf-8"))
+
 
 class GetTechEventModalView(TestCase):
     def setUp(self):
@@ -1,10 +1,17 @@
+from datetime import timedelta
+
 from django.contrib import admin
+from django.db.models import Avg, Count, Max, Q, Sum
+from django.utils import timezone
 
 # import models
 from web.models import (
     Event,
+    HttpCacheEntry,
+    IngestionRun,
     IntegrationCredential,
     Link,
+    PageSnapshot,
     SocialPlatform,
     Tag,
     TechGroup,
@@ -39,6 +46,94 @@ class IntegrationCredentialAdmin(admin.ModelAdmin):
     search_fields = ["id", "provider"]
 
 
+class HttpCacheEntryAdmin(admin.ModelAdmin):
+    list_display = ["id", "url", "etag", "last_modified", "content_hash", "content_length", "created_at", "updated_at"]
+    search_fields = ["id", "url", "etag", "content_hash"]
+
+
+class PageSnapshotAdmin(admin.ModelAdmin):
+    list_display = ["id", "group", "kind", "url", "content_length", "compression", "fetched_at"]
+    list_filter = ["kind", "group"]
+    search_fields = ["id", "url", "content_hash"]
+    date_hierarchy = "fetched_at"
+
+
+class IngestionRunAdmin(admin.ModelAdmin):
+    list_display = [
+        "id",
+        "group",
+        "task",
+        "started_at",
+        "duration",
+        "succeeded",
+        "pages_fetched",
+        "bytes_downloaded",
+        "throttled_count",
+        "browser_share",
+        "created_count",
+        "updated_count",
+        "unchanged_count",
+    ]
+    search_fields = ["id", "task", "sweep_id", "message", "error"]
+    list_filter = ["succeeded", "task", "group"]
+    date_hierarchy = "started_at"
+    trend_windows = [7, 30]
+
+    @admin.display(description="browser share")
+    def browser_share(self, obj: IngestionRun) -> str:
+        """share of the run's pages that needed Chromium rather than a plain request"""
+        pages: int = sum(obj.fetch_tiers.values())
+        return f"{obj.fetch_tiers.get('playwright', 0) / pages:.0%}" if pages else "-"
+
+    def get_trends(self) -> list[dict]:
+        """aggregate each group's runs over each trend window, slowest groups first
+
+        Returns:
+            list[dict]: one row per group, with runs, failures, failure rate, durations, pages and 429s per window
+        """
+        now = timezone.now()
+        aggregates: dict = {}
+        for days in self.trend_windows:
+            window = Q(started_at__gte=now - timedelta(days=days))
+            aggregates |= {
+                f"runs_{days}d": Count("id", filter=window),
+                f"failures_{days}d": Count("id", filter=window & Q(succeeded=False)),
+                f"avg_duration_{days}d": Avg("duration", filter=window),
+                f"max_duration_{days}d": Max("duration", filter=window),
+                f"avg_pages_{days}d": Avg("pages_fetched", filter=window),
+                f"throttled_{days}d": Sum("throttled_count", filter=window),
+            }
+        rows = (
+            IngestionRun.objects.filter(started_at__gte=now - timedelta(days=max(self.trend_windows)))
+            .values("group__name")
+            .annotate(**aggregates)
+            .order_by(f"-avg_duration_{min(self.trend_windows)}d", "group__name")
+        )
+        return [
+            {
+                "group": row["group__name"] or "(deleted group)",
+                "windows": [
+                    {
+                        "days": days,
+                        "runs": row[f"runs_{days}d"],
+                        "failures": row[f"failures_{days}d"],
+                        "failure_rate": row[f"failures_{days}d"] / row[f"runs_{days}d"] if row[f"runs_{days}d"] else 0,
+                        "avg_duration": row[f"avg_duration_{days}d"],
+                        "max_duration": row[f"max_duration_{days}d"],
+                        "avg_pages": row[f"avg_pages_{days}d"],
+                        "throttled": row[f"throttled_{days}d"] or 0,
+                    }
+                    for days in self.trend_windows
+                ],
+            }
+            for row in rows
+        ]
+
+    def changelist_view(self, request, extra_context=None):
+        extra_context = {**(extra_context or {}), "trends": self.get_trends(), "trend_windows": self.trend_windows}
+        return super().changelist_view(request, extra_context=extra_context)
+
+
 class TechGroupAdmin(admin.ModelAdmin):
     list_display = ["id", "name", "description", "enabled", "platform", "icon", "image", "created_at", "updated_at"]
     search_fields = ["id", "name", "description", "icon", "image"]
@@ -59,6 +154,7 @@ class EventAdmin(admin.ModelAdmin):
         "social_platform_id",
         "group",
         "image",
+        "cancelled_at",
         "created_at",
         "updated_at",
     ]
@@ -73,7 +169,7 @@ class EventAdmin(admin.ModelAdmin):
         "social_platform_id",
         "image",
     ]
-    list_filter = ["group"]
+    list_filter = ["group", "cancelled_at"]
 
 
 # register models
@@ -81,5 +177,8 @@ admin.site.register(Tag, TagAdmin)
 admin.site.register(Link, LinkAdmin)
 admin.site.register(SocialPlatform, SocialPlatformAdmin)
 admin.site.register(IntegrationCredential, IntegrationCredentialAdmin)
+admin.site.register(HttpCacheEntry, HttpCacheEntryAdmin)
+admin.site.register(IngestionRun, IngestionRunAdmin)
+admin.site.register(PageSnapshot, PageSnapshotAdmin)
 admin.site.register(TechGroup, TechGroupAdmin)
 admin.site.register(Event, EventAdmin)
@@ -0,0 +1,46 @@
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+from web.models import TechGroup
+from web.tasks import queue_new_event_posts
+from web.utilities.pipeline import GroupIngestion, reparse_snapshots
+
+
+class Command(BaseCommand):
+    help = "Rebuild upcoming events from stored page snapshots with the current parsers, without fetching anything."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("--group", type=int, action="append", dest="groups", help="Primary key of a group.")
+        parser.add_argument("--platform", help="Only reparse groups on this platform, such as Meetup.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Parser processes. Defaults to the number of CPUs.",
+        )
+        parser.add_argument(
+            "--no-announce",
+            action="store_true",
+            help="Do not announce events the reparse creates.",
+        )
+
+    def handle(self, *args, **options) -> None:
+        if options["workers"] < 1:
+            raise CommandError("--workers must be at least 1.")
+        groups = TechGroup.objects.filter(enabled=True).select_related("platform").order_by("pk")
+        if options["groups"]:
+            groups = groups.filter(pk__in=options["groups"])
+        if options["platform"]:
+            groups = groups.filter(platform__name__iexact=options["platform"])
+
+        ingestions: list[GroupIngestion] = reparse_snapshots(groups, workers=options["workers"])
+        failed: int = 0
+        for ingestion in ingestions:
+            if ingestion.result and not options["no_announce"]:
+                queue_new_event_posts(ingestion.result.created)
+            if ingestion.succeeded:
+                self.stdout.write(ingestion.message)
+            else:
+                failed += 1
+                self.stderr.write(f"{ingestion.group.name}: {ingestion.message}")
+        self.stdout.write(f"reparsed {len(ingestions)} groups, {failed} failed")
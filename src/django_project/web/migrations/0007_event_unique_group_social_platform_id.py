@@ -0,0 +1,38 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:15
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def delete_duplicate_events(apps, schema_editor):
+    """keep the first of a group's events sharing a social_platform_id, so that the constraint can be added"""
+    Event = apps.get_model("web", "Event")
+    duplicates = (
+        Event.objects.exclude(social_platform_id="")
+        .values("group", "social_platform_id")
+        .annotate(first_pk=Min("pk"), count=Count("pk"))
+        .filter(count__gt=1)
+    )
+    for duplicate in duplicates:
+        Event.objects.filter(group=duplicate["group"], social_platform_id=duplicate["social_platform_id"]).exclude(
+            pk=duplicate["first_pk"]
+        ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0006_integrationcredential"),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_duplicate_events, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="event",
+            constraint=models.UniqueConstraint(
+                condition=models.Q(("social_platform_id", ""), _negated=True),
+                fields=("group", "social_platform_id"),
+                name="unique_event_per_group_social_platform_id",
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0007_event_unique_group_social_platform_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="HttpCacheEntry",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("url", models.URLField(max_length=1024, unique=True)),
+                ("etag", models.CharField(blank=True, max_length=255)),
+                (
+                    "last_modified",
+                    models.CharField(blank=True, help_text="Last-Modified header value, as sent", max_length=64),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(blank=True, help_text="sha256 hex digest of the response body", max_length=64),
+                ),
+                (
+                    "content_length",
+                    models.PositiveIntegerField(default=0, help_text="size of the response body in bytes"),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "HTTP cache entries",
+                "ordering": ["url"],
+            },
+        ),
+    ]
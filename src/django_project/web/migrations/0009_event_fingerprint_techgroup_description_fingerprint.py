@@ -0,0 +1,31 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:18
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0008_httpcacheentry"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="fingerprint",
+            field=models.CharField(
+                blank=True,
+                help_text="hash of the scraped event data as of the last ingestion; used to skip no-op writes",
+                max_length=64,
+            ),
+        ),
+        migrations.AddField(
+            model_name="techgroup",
+            name="description_fingerprint",
+            field=models.CharField(
+                blank=True,
+                help_text="hash of the scraped description as of the last ingestion; used to skip no-op writes",
+                max_length=64,
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0009_event_fingerprint_techgroup_description_fingerprint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="last_scraped_at",
+            field=models.DateTimeField(blank=True, help_text="date and time the event was last scraped", null=True),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="listing_fingerprint",
+            field=models.CharField(
+                blank=True,
+                help_text="hash of the event's entry on the group's event listing as of its last scrape",
+                max_length=64,
+            ),
+        ),
+    ]
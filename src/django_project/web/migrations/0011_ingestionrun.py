@@ -0,0 +1,56 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:34
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0010_event_scrape_state"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngestionRun",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("task", models.CharField(help_text="registered name of the ingestion task", max_length=128)),
+                (
+                    "sweep_id",
+                    models.CharField(blank=True, db_index=True, help_text="sweep the run was part of", max_length=64),
+                ),
+                ("started_at", models.DateTimeField()),
+                ("finished_at", models.DateTimeField()),
+                ("duration", models.FloatField(default=0, help_text="wall time in seconds")),
+                ("succeeded", models.BooleanField(default=True)),
+                (
+                    "pages_fetched",
+                    models.PositiveIntegerField(default=0, help_text="HTTP responses and rendered pages"),
+                ),
+                ("bytes_downloaded", models.PositiveBigIntegerField(default=0)),
+                (
+                    "http_statuses",
+                    models.JSONField(blank=True, default=dict, help_text="count of responses per HTTP status"),
+                ),
+                ("throttled_count", models.PositiveIntegerField(default=0, help_text="429 responses")),
+                ("created_count", models.PositiveIntegerField(default=0)),
+                ("updated_count", models.PositiveIntegerField(default=0)),
+                ("unchanged_count", models.PositiveIntegerField(default=0)),
+                ("message", models.TextField(blank=True, help_text="result message of the task")),
+                ("error", models.TextField(blank=True)),
+                (
+                    "group",
+                    models.ForeignKey(
+                        blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to="web.techgroup"
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-started_at"],
+                "indexes": [models.Index(fields=["group", "-started_at"], name="web_ingesti_group_i_a28f6a_idx")],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0011_ingestionrun"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ingestionrun",
+            name="fetch_tiers",
+            field=models.JSONField(blank=True, default=dict, help_text="count of pages served per fetch tier"),
+        ),
+    ]
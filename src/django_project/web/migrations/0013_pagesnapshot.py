@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:46
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0012_ingestionrun_fetch_tiers"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PageSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("url", models.URLField(max_length=1024)),
+                (
+                    "kind",
+                    models.CharField(help_text="what the content is, and so which parser reads it", max_length=64),
+                ),
+                (
+                    "content_hash",
+                    models.CharField(db_index=True, help_text="sha256 hex digest of the content", max_length=64),
+                ),
+                ("compression", models.CharField(help_text="codec of the stored blob; zstd or gzip", max_length=8)),
+                (
+                    "content_length",
+                    models.PositiveIntegerField(default=0, help_text="size of the content in bytes, uncompressed"),
+                ),
+                ("fetched_at", models.DateTimeField(db_index=True)),
+                ("group", models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to="web.techgroup")),
+            ],
+            options={
+                "ordering": ["-fetched_at"],
+                "indexes": [
+                    models.Index(fields=["group", "kind", "-fetched_at"], name="web_pagesna_group_i_8e726c_idx")
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0013_pagesnapshot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ingestionrun",
+            name="stage_durations",
+            field=models.JSONField(
+                blank=True, default=dict, help_text="seconds spent in each pipeline stage, and queued for the database"
+            ),
+        ),
+    ]
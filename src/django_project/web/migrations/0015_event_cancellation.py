@@ -0,0 +1,42 @@
+# Generated by Django 4.2.30 on 2026-10-18 13:58
+
+import django.db.models.manager
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("web", "0014_ingestionrun_stage_durations"),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="event",
+            options={"default_manager_name": "all_objects", "ordering": ["start_datetime"]},
+        ),
+        migrations.AlterModelManagers(
+            name="event",
+            managers=[
+                ("all_objects", django.db.models.manager.Manager()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="cancelled_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="date and time the event was cancelled for staying missing from its group's listing",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="event",
+            name="missing_since",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="date and time the event was first found missing from its group's listing",
+                null=True,
+            ),
+        ),
+    ]
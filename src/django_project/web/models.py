@@ -6,8 +6,19 @@ from encrypted_fields.fields import EncryptedTextField
 from handyhelpers.models import HandyHelperBaseModel
 
 
+class ScheduledEventManager(models.Manager):
+    """Manager of the events that have not been cancelled"""
+
+    def get_queryset(self) -> models.QuerySet[Event]:
+        return super().get_queryset().filter(cancelled_at__isnull=True)
+
+
 class Event(HandyHelperBaseModel):
-    """An event on a specific day and time"""
+    """An event on a specific day and time
+
+    `Event.objects` leaves out cancelled events, so lists, the calendar and notifications skip them; use
+    `Event.all_objects` (the default manager) to include them.
+    """
 
     name = models.CharField(max_length=255)
     description = models.TextField(blank=True)
@@ -45,9 +56,39 @@ class Event(HandyHelperBaseModel):
     group = models.ForeignKey("TechGroup", blank=True, null=True, on_delete=models.SET_NULL)
     tags = models.ManyToManyField("Tag", blank=True)
     image = models.ImageField(upload_to="tech_events/", blank=True, null=True)
+    fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="hash of the scraped event data as of the last ingestion; used to skip no-op writes",
+    )
+    listing_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="hash of the event's entry on the group's event listing as of its last scrape",
+    )
+    last_scraped_at = models.DateTimeField(blank=True, null=True, help_text="date and time the event was last scraped")
+    missing_since = models.DateTimeField(
+        blank=True, null=True, help_text="date and time the event was first found missing from its group's listing"
+    )
+    cancelled_at = models.DateTimeField(
+        blank=True,
+        null=True,
+        help_text="date and time the event was cancelled for staying missing from its group's listing",
+    )
+
+    objects = ScheduledEventManager()
+    all_objects = models.Manager()
 
     class Meta:
         ordering = ["start_datetime"]
+        default_manager_name = "all_objects"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["group", "social_platform_id"],
+                condition=~models.Q(social_platform_id=""),
+                name="unique_event_per_group_social_platform_id",
+            ),
+        ]
 
     def __str__(self) -> str:
         return self.name
@@ -81,6 +122,74 @@ class SocialPlatform(HandyHelperBaseModel):
         return self.name
 
 
+class HttpCacheEntry(HandyHelperBaseModel):
+    """Validators and a content hash for the last response fetched from a url, used for conditional requests"""
+
+    url = models.URLField(max_length=1024, unique=True)
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True, help_text="Last-Modified header value, as sent")
+    content_hash = models.CharField(max_length=64, blank=True, help_text="sha256 hex digest of the response body")
+    content_length = models.PositiveIntegerField(default=0, help_text="size of the response body in bytes")
+
+    class Meta:
+        ordering = ["url"]
+        verbose_name_plural = "HTTP cache entries"
+
+    def __str__(self) -> str:
+        return self.url
+
+
+class IngestionRun(HandyHelperBaseModel):
+    """Telemetry of one ingestion task run for one group, recorded by ingestion sweeps"""
+
+    group = models.ForeignKey("TechGroup", blank=True, null=True, on_delete=models.SET_NULL)
+    task = models.CharField(max_length=128, help_text="registered name of the ingestion task")
+    sweep_id = models.CharField(max_length=64, blank=True, db_index=True, help_text="sweep the run was part of")
+    started_at = models.DateTimeField()
+    finished_at = models.DateTimeField()
+    duration = models.FloatField(default=0, help_text="wall time in seconds")
+    succeeded = models.BooleanField(default=True)
+    pages_fetched = models.PositiveIntegerField(default=0, help_text="HTTP responses and rendered pages")
+    bytes_downloaded = models.PositiveBigIntegerField(default=0)
+    http_statuses = models.JSONField(default=dict, blank=True, help_text="count of responses per HTTP status")
+    throttled_count = models.PositiveIntegerField(default=0, help_text="429 responses")
+    fetch_tiers = models.JSONField(default=dict, blank=True, help_text="count of pages served per fetch tier")
+    stage_durations = models.JSONField(
+        default=dict, blank=True, help_text="seconds spent in each pipeline stage, and queued for the database"
+    )
+    created_count = models.PositiveIntegerField(default=0)
+    updated_count = models.PositiveIntegerField(default=0)
+    unchanged_count = models.PositiveIntegerField(default=0)
+    message = models.TextField(blank=True, help_text="result message of the task")
+    error = models.TextField(blank=True)
+
+    class Meta:
+        ordering = ["-started_at"]
+        indexes = [models.Index(fields=["group", "-started_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.task} for {self.group} at {self.started_at}"
+
+
+class PageSnapshot(HandyHelperBaseModel):
+    """A raw page or API payload fetched while ingesting a group, stored compressed in the snapshot store"""
+
+    group = models.ForeignKey("TechGroup", on_delete=models.CASCADE)
+    url = models.URLField(max_length=1024)
+    kind = models.CharField(max_length=64, help_text="what the content is, and so which parser reads it")
+    content_hash = models.CharField(max_length=64, db_index=True, help_text="sha256 hex digest of the content")
+    compression = models.CharField(max_length=8, help_text="codec of the stored blob; zstd or gzip")
+    content_length = models.PositiveIntegerField(default=0, help_text="size of the content in bytes, uncompressed")
+    fetched_at = models.DateTimeField(db_index=True)
+
+    class Meta:
+        ordering = ["-fetched_at"]
+        indexes = [models.Index(fields=["group", "kind", "-fetched_at"])]
+
+    def __str__(self) -> str:
+        return f"{self.kind} snapshot of {self.url} at {self.fetched_at}"
+
+
 class IntegrationCredential(HandyHelperBaseModel):
     """Stores third-party integration credentials shared across app processes."""
 
@@ -125,6 +234,11 @@ class TechGroup(HandyHelperBaseModel):
     links = models.ManyToManyField("Link", blank=True)
     image = models.ImageField(upload_to="techgroups/", blank=True, null=True)
     discord_webhook_url = EncryptedTextField(blank=True, null=True)
+    description_fingerprint = models.CharField(
+        max_length=64,
+        blank=True,
+        help_text="hash of the scraped description as of the last ingestion; used to skip no-op writes",
+    )
 
     class Meta:
         ordering = ["name"]
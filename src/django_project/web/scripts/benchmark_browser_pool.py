@@ -0,0 +1,78 @@
+"""compare Playwright page throughput with a browser launched per fetch against the pooled browser
+
+usage:
+    python manage.py runscript benchmark_browser_pool
+    python manage.py runscript benchmark_browser_pool --script-args https://www.meetup.com/python-spokane/events/ ...
+
+With no urls the enabled Meetup groups' event listing pages are used.
+"""
+
+import os
+import time
+
+from playwright.sync_api import sync_playwright
+from web.models import TechGroup
+from web.utilities.browser_pool import (
+    CONTEXT_OPTIONS,
+    BrowserPool,
+    get_process_tree_rss_mb,
+)
+
+
+def fetch_with_new_browser(url: str) -> str:
+    """fetch a page the way html_utils did before the pool: a new driver and browser per url"""
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_context(**CONTEXT_OPTIONS).new_page()
+        page.goto(url, wait_until="load", timeout=30000)
+        html_content: str = page.content()
+        browser.close()
+    return html_content
+
+
+def fetch_with_pool(pool: BrowserPool, url: str) -> str:
+    """fetch a page using a context from the pooled browser"""
+    with pool.page() as page:
+        page.goto(url, wait_until="load", timeout=30000)
+        return page.content()
+
+
+def get_default_urls() -> list[str]:
+    urls: list[str] = []
+    for group in TechGroup.objects.filter(enabled=True, platform__name="Meetup"):
+        for link in group.links.filter(name=f"{group.name} {group.platform.name} page"):
+            urls.append(f"{link.url}/events/?type=upcoming")
+    return urls
+
+
+def report(label: str, page_count: int, elapsed: float, peak_rss_mb: float) -> None:
+    pages_per_minute: float = page_count / elapsed * 60 if elapsed else 0.0
+    print(
+        f"{label:<16} {page_count:>5} pages {elapsed:>8.1f}s {pages_per_minute:>8.1f} pages/min {peak_rss_mb:>8.0f} MB"
+    )
+
+
+def run(*args) -> None:
+    urls: list[str] = list(args) or get_default_urls()
+    if not urls:
+        print("no urls to benchmark")
+        return
+
+    peak_rss_mb = 0.0
+    start: float = time.perf_counter()
+    for url in urls:
+        fetch_with_new_browser(url)
+        peak_rss_mb = max(peak_rss_mb, get_process_tree_rss_mb(os.getpid()))
+    report("browser per url", len(urls), time.perf_counter() - start, peak_rss_mb)
+
+    pool = BrowserPool()
+    peak_rss_mb = 0.0
+    start = time.perf_counter()
+    try:
+        for url in urls:
+            fetch_with_pool(pool, url)
+            peak_rss_mb = max(peak_rss_mb, get_process_tree_rss_mb(os.getpid()))
+    finally:
+        pool.close()
+    report("pooled browser", len(urls), time.perf_counter() - start, peak_rss_mb)
+    print(f"pooled browser launched {pool.launch_count} time(s)")
@@ -0,0 +1,127 @@
+"""benchmark the scrapers and the ingestion pipeline over a recorded corpus
+
+Each stage reports its wall time, throughput, query count and RSS.
+
+usage:
+    python manage.py runscript benchmark_ingestion --script-args <corpus directory> [output=results.json]
+        [compare=previous.json] [repeat=100]
+
+The corpus is a directory recorded with `runscript replay_ingestion --script-args record <directory>`; every
+request is served from it, so runs are repeatable offline. Rate limits are disabled while benchmarking. The full
+ingestion pipeline runs inside a transaction that is rolled back, so every run writes the same rows.
+"""
+
+import json
+import re
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.db import transaction
+from django.test import override_settings
+from django.utils import timezone
+from web.models import TechGroup
+from web.tasks import ingest_groups
+from web.utilities.benchmark import (
+    StageResult,
+    compare_results,
+    measure_stage,
+    write_results,
+)
+from web.utilities.replay import replay_session
+from web.utilities.scrapers.eventbrite import (
+    filter_events_by_date,
+    get_events_for_organization,
+)
+from web.utilities.scrapers.meetup import (
+    get_event_information,
+    get_event_links,
+    get_group_description,
+)
+
+NUMERIC_EVENT_PATTERN = re.compile(r"/events/(\d+)/")
+
+
+def get_platform_links(platform_name: str) -> list[tuple[TechGroup, str]]:
+    links: list[tuple[TechGroup, str]] = []
+    for group in TechGroup.objects.filter(enabled=True, platform__name=platform_name):
+        for link in group.links.filter(name=f"{group.name} {platform_name} page").distinct():
+            links.append((group, link.url))
+    return links
+
+
+def benchmark_pipeline(results: list[StageResult], platform_name: str, group_pks: list[int]) -> None:
+    """run the event ingestion pipeline over a platform's groups, once per group and once for all groups at once"""
+    with measure_stage(f"{platform_name} events pipeline", results) as stage:
+        for group_pk in group_pks:
+            with transaction.atomic():
+                ingest_groups("events", [group_pk])
+                transaction.set_rollback(True)
+            stage.calls += 1
+    with measure_stage(f"{platform_name} events pipeline, concurrent", results) as stage:
+        with transaction.atomic():
+            ingest_groups("events", group_pks)
+            transaction.set_rollback(True)
+        stage.calls += 1
+
+
+def benchmark_meetup(results: list[StageResult]) -> None:
+    links: list[tuple[TechGroup, str]] = get_platform_links("Meetup")
+    with measure_stage("meetup.get_group_description", results) as stage:
+        for _, url in links:
+            get_group_description(url)
+            stage.calls += 1
+
+    event_urls: list[str] = []
+    with measure_stage("meetup.get_event_links", results) as stage:
+        for _, url in links:
+            event_urls.extend(link for link in get_event_links(url) if NUMERIC_EVENT_PATTERN.search(link))
+            stage.calls += 1
+
+    with measure_stage("meetup.get_event_information", results) as stage:
+        for url in event_urls:
+            get_event_information(url)
+            stage.calls += 1
+
+    benchmark_pipeline(results, "meetup", [group.pk for group in dict.fromkeys(group for group, _ in links)])
+
+
+def benchmark_eventbrite(results: list[StageResult], repeat: int) -> None:
+    links: list[tuple[TechGroup, str]] = get_platform_links("Eventbrite")
+    events: list[dict] = []
+    with measure_stage("eventbrite.get_events_for_organization", results) as stage:
+        for _, url in links:
+            events.extend(get_events_for_organization(url.split("-")[-1]))
+            stage.calls += 1
+
+    date_filter = timezone.now() - timedelta(days=14)
+    with measure_stage("eventbrite.filter_events_by_date", results) as stage:
+        for _ in range(repeat):
+            filter_events_by_date(events, date_filter)
+            stage.calls += 1
+
+    benchmark_pipeline(results, "eventbrite", [group.pk for group in dict.fromkeys(group for group, _ in links)])
+
+
+def run(*args) -> None:
+    if not args or not Path(args[0]).is_dir():
+        print(__doc__)
+        return
+    corpus: str = args[0]
+    options: dict[str, str] = dict(arg.split("=", 1) for arg in args[1:] if "=" in arg)
+
+    results: list[StageResult] = []
+    api_key: str = getattr(settings, "EVENTBRITE_API_KEY", None) or "replay"
+    with override_settings(RATE_LIMITS={}, EVENTBRITE_API_KEY=api_key), replay_session(corpus, mode="replay"):
+        benchmark_meetup(results)
+        benchmark_eventbrite(results, repeat=int(options.get("repeat", 100)))
+
+    for result in results:
+        print(result)
+    if options.get("compare"):
+        print()
+        for line in compare_results(json.loads(Path(options["compare"]).read_text(encoding="utf-8")), results):
+            print(line)
+    if options.get("output"):
+        write_results(options["output"], results, corpus=corpus)
+        print(f"\nresults written to {options['output']}")
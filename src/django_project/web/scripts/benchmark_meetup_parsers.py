@@ -0,0 +1,72 @@
+"""compare parse time and peak memory of the page-state and html paths of the Meetup event parser
+
+usage:
+    python manage.py runscript benchmark_meetup_parsers --script-args <saved page or directory> [...]
+
+Saved pages are the rendered html of meetup.com event pages, named after the event id (for example 305871234.html).
+"""
+
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable
+
+from web.utilities.scrapers.meetup import (
+    parse_event_information_from_html,
+    parse_event_information_from_state,
+)
+
+ITERATIONS = 5
+
+
+def get_saved_pages(paths: tuple[str, ...]) -> list[Path]:
+    pages: list[Path] = []
+    for path in map(Path, paths):
+        pages.extend(sorted(path.glob("*.htm*")) if path.is_dir() else [path])
+    return pages
+
+
+def measure(parser: Callable[[str, str], dict], url: str, page_content: str) -> tuple[float, float, dict]:
+    """run a parser ITERATIONS times, returning mean seconds, peak traced memory in MB and the last result"""
+    result: dict = {}
+    start: float = time.perf_counter()
+    for _ in range(ITERATIONS):
+        result = parser(url, page_content)
+    elapsed: float = (time.perf_counter() - start) / ITERATIONS
+
+    tracemalloc.start()
+    parser(url, page_content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / (1024 * 1024), result
+
+
+def run(*args) -> None:
+    pages: list[Path] = get_saved_pages(args)
+    if not pages:
+        print(__doc__)
+        return
+
+    print(f"{'page':<24} {'state ms':>9} {'state MB':>9} {'html ms':>9} {'html MB':>9}  fields match")
+    totals: list[float] = [0.0, 0.0, 0.0, 0.0]
+    for page in pages:
+        url: str = f"https://www.meetup.com/saved-page/events/{page.stem}/"
+        page_content: str = page.read_text(encoding="utf-8")
+        state_time, state_mb, state_result = measure(parse_event_information_from_state, url, page_content)
+        html_time, html_mb, html_result = measure(parse_event_information_from_html, url, page_content)
+        matching: list[str] = [
+            key
+            for key in ("name", "start_datetime", "end_datetime", "location_name")
+            if state_result.get(key) == html_result.get(key)
+        ]
+        for index, value in enumerate((state_time, state_mb, html_time, html_mb)):
+            totals[index] += value
+        print(
+            f"{page.name[:24]:<24} {state_time * 1000:>9.1f} {state_mb:>9.1f} {html_time * 1000:>9.1f} {html_mb:>9.1f}"
+            f"  {', '.join(matching) if state_result else 'no page state'}"
+        )
+    count: int = len(pages)
+    print(
+        f"{'mean':<24} {totals[0] / count * 1000:>9.1f} {totals[1] / count:>9.1f} "
+        f"{totals[2] / count * 1000:>9.1f} {totals[3] / count:>9.1f}"
+    )
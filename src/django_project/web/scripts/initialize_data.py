@@ -1,8 +1,5 @@
 from web.models import Link, SocialPlatform, TechGroup
-from web.tasks import (
-    ingest_eventbrite_organization_details,
-    ingest_meetup_group_details,
-)
+from web.tasks import ingest_group_details
 
 
 def create_groups() -> None:
@@ -194,21 +191,13 @@ def create_social_platforms() -> None:
         SocialPlatform.objects.update_or_create(name=data["name"], defaults=data)
 
 
-def get_eventbrite_organization_details():
-    for group in TechGroup.objects.filter(enabled=True, platform__name="Eventbrite"):
-        job = ingest_eventbrite_organization_details.s(group.pk)
-        job.apply()
-
-
-def get_meetup_group_details():
-    for group in TechGroup.objects.filter(enabled=True, platform__name="Meetup"):
-        link = group.links.filter(name=f"{group.name} {group.platform.name} page").distinct()[0]
-        job = ingest_meetup_group_details.s(group.pk, link.url)
+def get_group_details():
+    for group in TechGroup.objects.filter(enabled=True):
+        job = ingest_group_details.s(group.pk)
         job.apply()
 
 
 def run():
     create_social_platforms()
     create_groups()
-    get_eventbrite_organization_details()
-    get_meetup_group_details()
+    get_group_details()
@@ -0,0 +1,70 @@
+"""serve a directory of Meetup group fixtures as a local stand-in for the Meetup GraphQL API
+
+usage:
+    python manage.py runscript meetup_graphql_standin --script-args <directory> [host=127.0.0.1] [port=8765]
+
+<directory> holds one <urlname>.json file per group, with the group as the API's groupByUrlname query returns it
+(see tests/unit/web/fixtures/meetup_graphql). Run ingestion against it with MEETUP_GRAPHQL_URL=http://127.0.0.1:<port>/
+and the groups' urlnames in MEETUP_GRAPHQL_GROUPS.
+"""
+
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+
+class FixtureRequestHandler(BaseHTTPRequestHandler):
+    """answers group queries with the json file of the queried urlname, as the Meetup GraphQL API would"""
+
+    directory: Path
+
+    def do_POST(self) -> None:
+        body: dict = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+        urlname: str = str(body.get("variables", {}).get("urlname", ""))
+        path: Path = self.directory / f"{Path(urlname).name}.json"
+        group: dict | None = json.loads(path.read_text(encoding="utf-8")) if urlname and path.exists() else None
+        content: bytes = json.dumps({"data": {"groupByUrlname": group}}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
+
+
+def serve_fixtures(directory: str | Path, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """create a local stand-in for the Meetup GraphQL API, serving groups from a directory of json files
+
+    A file named <urlname>.json holds the groupByUrlname result of that group. Point settings.MEETUP_GRAPHQL_URL at
+    the server's address, and call serve_forever() (in a thread, for tests) to start answering.
+
+    Args:
+        directory (str | Path): directory holding the group files
+        host (str, optional): address to listen on. Defaults to "127.0.0.1".
+        port (int, optional): port to listen on; 0 picks a free one. Defaults to 0.
+
+    Returns:
+        ThreadingHTTPServer: the server, bound but not yet serving
+    """
+    handler: type[FixtureRequestHandler] = type(
+        "GroupFixtureRequestHandler", (FixtureRequestHandler,), {"directory": Path(directory)}
+    )
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def run(*args) -> None:
+    if not args:
+        print(__doc__)
+        return
+    options: dict[str, str] = dict(arg.split("=", 1) for arg in args[1:] if "=" in arg)
+    host: str = options.get("host", "127.0.0.1")
+    server = serve_fixtures(args[0], host=host, port=int(options.get("port", 8765)))
+    print(f"INFO: serving Meetup GraphQL fixtures from {args[0]} at http://{host}:{server.server_port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,44 @@
+"""record the scraper traffic of a full ingestion run, or replay a recorded run offline
+
+usage:
+    python manage.py runscript replay_ingestion --script-args record <directory> [group name ...]
+    python manage.py runscript replay_ingestion --script-args replay <directory> [latency=0.2] [throttle_every=5]
+
+Every enabled group (or only the named ones) has its details and future events ingested inline, all groups at
+once. Recording needs network access; replay serves every request from <directory> and fails on any request that
+was not recorded.
+"""
+
+import time
+
+from web.models import TechGroup
+from web.tasks import ingest_groups
+from web.utilities.replay import ReplayConfig, replay_session
+
+
+def run(*args) -> None:
+    if len(args) < 2 or args[0] not in ("record", "replay"):
+        print(__doc__)
+        return
+    mode, directory = args[0], args[1]
+    options: dict[str, str] = dict(arg.split("=", 1) for arg in args[2:] if "=" in arg)
+    names: list[str] = [arg for arg in args[2:] if "=" not in arg]
+
+    groups = TechGroup.objects.filter(enabled=True).select_related("platform")
+    if names:
+        groups = groups.filter(name__in=names)
+
+    config: ReplayConfig
+    with replay_session(
+        directory,
+        mode=mode,
+        latency=float(options.get("latency", 0)),
+        throttle_every=int(options.get("throttle_every", 0)),
+    ) as config:
+        start: float = time.perf_counter()
+        group_pks: list[int] = [group.pk for group in groups]
+        for pipeline in ("details", "events"):
+            for ingestion in ingest_groups(pipeline, group_pks):
+                print(f"INFO: {ingestion.message}")
+        elapsed: float = time.perf_counter() - start
+    print(f"INFO: {mode}ed {groups.count()} groups in {elapsed:.1f}s ({config.requests_served} replayed requests)")
@@ -1,31 +1,52 @@
 import logging
-import random
-import re
 import time
+import uuid
+import warnings
 from datetime import timedelta
+from functools import partial
 from typing import Any
 
 import requests
 from bs4 import BeautifulSoup
+from celery import chord
+from celery import group as task_group
 from celery import shared_task
 from django.conf import settings
+from django.db import transaction
 from django.db.models.manager import BaseManager
 from django.utils import timezone
-from web.models import Event, IntegrationCredential, Link, Tag, TechGroup
+from web.models import Event, IngestionRun, IntegrationCredential, TechGroup
+from web.utilities import http_client
 from web.utilities.dt_utils import convert_to_pacific
+from web.utilities.ingestion import RESULT_OUTCOMES
 from web.utilities.notifiers.discord import DiscordNotifier
 from web.utilities.notifiers.linkedin import LinkedInOrganizationClient
-from web.utilities.scrapers.eventbrite import (
-    create_google_map_link,
-    get_event_details,
-    get_events_for_organization,
-    get_organization_details,
-)
-from web.utilities.scrapers.meetup import (
-    get_event_information,
-    get_event_links,
-    get_group_description,
-)
+from web.utilities.pipeline import GroupIngestion, run_pipeline
+from web.utilities.scrapers.registry import has_scraper
+from web.utilities.snapshots import prune_snapshots
+
+
+def queue_new_event_posts(events: list[Event]) -> None:
+    """queue the announcements for newly created events once the current transaction commits
+
+    Args:
+        events (list[Event]): newly created events
+    """
+    for event in events:
+        transaction.on_commit(partial(_post_new_event, event))
+
+
+def _post_new_event(event: Event) -> None:
+    """post a new event to Discord and LinkedIn, and to the SPUG website for SPUG events"""
+    discord_job: Any = post_event_to_discord.s(event.pk, is_new=True)
+    discord_job.apply_async()
+
+    linkedin_job: Any = post_event_to_linkedin.s(event.pk, is_new=True)
+    linkedin_job.apply_async()
+
+    if event.group and event.group.name == "Spokane Python User Group":
+        spug_job: Any = post_event_to_spug_task.s(event.pk)
+        spug_job.apply_async()
 
 
 @shared_task(time_limit=30, max_retries=0, name="web.test_task")
@@ -36,175 +57,262 @@ def test_task() -> str:
     return "test task completed!"
 
 
+def ingest_groups(pipeline: str, group_pks: list[int]) -> list[GroupIngestion]:
+    """run an ingestion pipeline for groups and queue the announcements of the events it created
+
+    Args:
+        pipeline (str): "details" or "events"; see web.utilities.pipeline.PIPELINES
+        group_pks (list[int]): primary keys of the groups; unknown keys are ignored
+
+    Returns:
+        list[GroupIngestion]: outcome of each group
+    """
+    groups = TechGroup.objects.filter(pk__in=group_pks).select_related("platform").order_by("pk")
+    ingestions: list[GroupIngestion] = run_pipeline(pipeline, groups)
+    for ingestion in ingestions:
+        if ingestion.result:
+            queue_new_event_posts(ingestion.result.created)
+    return ingestions
+
+
+def ingest_group(pipeline: str, group_pk: int) -> str:
+    """run an ingestion pipeline for a single group, raising its failure
+
+    Returns:
+        str: result message of the group's ingestion
+    """
+    ingestions: list[GroupIngestion] = ingest_groups(pipeline, [group_pk])
+    if not ingestions:
+        return f"group with pk {group_pk} not found"
+    if ingestions[0].exception:
+        raise ingestions[0].exception
+    return ingestions[0].message
+
+
+@shared_task(time_limit=900, max_retries=3, name="web.ingest_group_details")
+def ingest_group_details(group_pk: int) -> str:
+    """ingest the description and website of a group on any platform with a registered scraper"""
+    return ingest_group("details", group_pk)
+
+
+@shared_task(time_limit=900, max_retries=3, name="web.ingest_group_events")
+def ingest_group_events(group_pk: int) -> str:
+    """ingest the upcoming events of a group on any platform with a registered scraper
+
+    Incremental scrapers (Meetup) skip known events whose listing entry is unchanged; see select_events_to_fetch().
+    """
+    return ingest_group("events", group_pk)
+
+
+# per-platform task names from before the scraper registry, kept for one release so that periodic tasks and queued
+# messages that still use them keep working; point schedules at ingest_group_details / ingest_group_events instead
 @shared_task(time_limit=900, max_retries=3, name="web.ingest_meetup_group_details")
-def ingest_meetup_group_details(group_pk, url: str) -> str:
-    updated = False
-    group = TechGroup.objects.get(pk=group_pk)
-    group_details = get_group_description(url)
-    if not group_details:
-        return f"no details found for {group.name}"
-    if group.description != group_details:
-        group.description = group_details
-        group.save()
-        updated = True
-    if updated:
-        return f"updated details for {group.name}"
-    else:
-        return f"no updates needed for {group.name}"
+def ingest_meetup_group_details(group_pk: int, url: str = "") -> str:
+    """deprecated alias of ingest_group_details; the url is looked up from the group's links"""
+    return ingest_group("details", group_pk)
 
 
 @shared_task(time_limit=900, max_retries=3, name="web.ingest_eventbrite_organization_details")
-def ingest_eventbrite_organization_details(group_pk) -> str:
-    updated = False
-    group = TechGroup.objects.get(pk=group_pk)
-    link = group.links.filter(name=f"{group.name} {group.platform.name} page").distinct()[0]
-    eb_group_id = link.url.split("-")[-1]
-
-    organization_details = get_organization_details(eb_group_id)
-    description = organization_details["long_description"]["text"]
-    if description:
-        if group.description != description:
-            group.update(description=description)
-            updated = True
-    if organization_details.get("website"):
-        website = organization_details["website"]
-        if website and not group.links.filter(url=website):
-            link = Link.objects.create(url=website, name="website")
-            group.links.add(link)
-            updated = True
-    if updated:
-        return f"updated details for {group.name}"
-    return f"no updates needed for {group.name}"
+def ingest_eventbrite_organization_details(group_pk: int) -> str:
+    """deprecated alias of ingest_group_details"""
+    return ingest_group("details", group_pk)
 
 
 @shared_task(time_limit=900, max_retries=3, name="web.ingest_future_meetup_events")
-def ingest_future_meetup_events(group_pk) -> str:
-    group = TechGroup.objects.get(pk=group_pk)
-    if not group:
-        return f"group with pk {group_pk} not found"
-    platform_links = group.links.filter(name=f"{group.name} {group.platform.name} page").distinct()
-    if not platform_links:
-        return f"no {group.platform.name} links found for {group.name}"
-
-    event_links: list = []
-    event_count: int = 0
-
-    # filter event links for future recurring events. Meetup uses a numeric event id in the url for upcoming events
-    # and a alphanumeric event id for recurring events. This is causing duplicate events to be added to the database.
-    numeric_event_pattern = re.compile(r"/events/(\d+)/")
-
-    for link in group.links.filter(name=f"{group.name} {group.platform.name} page").distinct():
-        ingest_links: list = [url for url in get_event_links(link.url) if numeric_event_pattern.search(url)]
-        event_links.extend(ingest_links)
-        for event_link in ingest_links:
-            event_info = get_event_information(event_link)
-            event_info["group"] = group
-            if event_info:
-                event_info.setdefault("location_name", "")
-                event_info.setdefault("location_address", "")
-                event_info.setdefault("map_link", "")
-                if not event_info.get("name", None):
-                    logging.error(f"error parsing name for event hosted by {group.name}; data = {event_info}")
-                    continue
-                if event_info["social_platform_id"]:
-                    _, is_new = Event.objects.update_or_create(
-                        social_platform_id=event_info["social_platform_id"], defaults=event_info
-                    )
-                else:
-                    _, is_new = Event.objects.update_or_create(
-                        name=event_info["name"], start_datetime=event_info["start_datetime"], defaults=event_info
-                    )
-                if is_new:
-                    event_count += 1
-    return f"found {len(event_links)} upcoming events for {group.name}; added {event_count} new events"
+def ingest_future_meetup_events(group_pk: int, concurrency: int | None = None) -> str:
+    """deprecated alias of ingest_group_events; concurrency is only accepted so that queued messages still run"""
+    if concurrency is not None:
+        warnings.warn(
+            "the concurrency argument of ingest_future_meetup_events is ignored; "
+            "set settings.MEETUP_EVENT_FETCH_CONCURRENCY instead",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+    return ingest_group("events", group_pk)
 
 
 @shared_task(time_limit=900, max_retries=3, name="web.ingest_future_eventbrite_events")
-def ingest_future_eventbrite_events(group_pk) -> str:
-    group: TechGroup = TechGroup.objects.get(pk=group_pk)
-    if not group:
-        return f"group with pk {group_pk} not found"
-    event_count = 0
-    link: Any = group.links.filter(name=f"{group.name} {group.platform.name} page").distinct()[0]
-    eb_group_id: str = link.url.split("-")[-1]
-    event_list: list = get_events_for_organization(eb_group_id)
-    for item in event_list:
-        event_details: dict = get_event_details(item["id"])
-        if event_details:
-            location_data: dict = event_details["primary_venue"]
-            tag_data: list[dict[str, Any]] = event_details["tags"]
-
-            event_data: dict[str, Any] = {
-                "group": group,
-                "name": item["name"].get("text", "") if item.get("name") else "",
-                "description": item["description"].get("text", "") if item.get("description") else "",
-                "url": item.get("url", ""),
-                "social_platform_id": item.get("id", ""),
-                "start_datetime": item["start"].get("utc", "") if item.get("start") else "",
-                "end_datetime": item["end"].get("utc", "") if item.get("end") else "",
-                "location_name": location_data.get("name", "") if location_data else "",
-                "location_address": (
-                    location_data.get("address", {}).get("localized_address_display", "") if location_data else ""
-                ),
-                "map_link": (
-                    create_google_map_link(location_data.get("address", {}).get("localized_address_display", ""))
-                    if location_data
-                    else ""
-                ),
+def ingest_future_eventbrite_events(group_pk: int) -> str:
+    """deprecated alias of ingest_group_events"""
+    return ingest_group("events", group_pk)
+
+
+@shared_task(time_limit=1800, max_retries=0, name="web.run_ingestion_batch")
+def run_ingestion_batch(pipeline: str, group_pks: list[int], sweep_id: str = "") -> list[dict]:
+    """run an ingestion pipeline for a batch of groups within one worker, recording each group's outcome
+
+    Failures are recorded rather than raised, so one broken group neither stops the rest of the batch nor the
+    sweep's summary callback. Every group's run is stored as an IngestionRun with its fetch telemetry.
+
+    Args:
+        pipeline (str): "details" or "events"
+        group_pks (list[int]): primary keys of the groups
+        sweep_id (str, optional): identifier of the sweep, stored on the IngestionRuns
+
+    Returns:
+        list[dict]: outcome of each group
+    """
+    task_name: str = f"web.ingest_group_{pipeline}"
+    outcomes: list[dict] = []
+    runs: list[IngestionRun] = []
+    for ingestion in ingest_groups(pipeline, group_pks):
+        counts: dict[str, int] = ingestion.counts if ingestion.succeeded else dict.fromkeys(RESULT_OUTCOMES, 0)
+        duration: float = round(ingestion.duration, 3)
+        runs.append(
+            IngestionRun(
+                group=ingestion.group,
+                task=task_name,
+                sweep_id=sweep_id,
+                started_at=ingestion.started_at,
+                finished_at=ingestion.finished_at or ingestion.started_at,
+                duration=duration,
+                succeeded=ingestion.succeeded,
+                pages_fetched=ingestion.telemetry.pages,
+                bytes_downloaded=ingestion.telemetry.bytes_downloaded,
+                http_statuses={str(status): count for status, count in sorted(ingestion.telemetry.statuses.items())},
+                throttled_count=ingestion.telemetry.throttled,
+                fetch_tiers=dict(ingestion.telemetry.tiers),
+                stage_durations={stage: round(seconds, 3) for stage, seconds in ingestion.stage_durations.items()},
+                created_count=counts["created"],
+                updated_count=counts["updated"],
+                unchanged_count=counts["unchanged"],
+                message=ingestion.message,
+                error=ingestion.error,
+            )
+        )
+        outcomes.append(
+            {
+                "group": ingestion.group.name,
+                "task": task_name,
+                "succeeded": ingestion.succeeded,
+                "duration": duration,
+                "message": ingestion.message,
+                "pages": ingestion.telemetry.pages,
+                **counts,
             }
+        )
+    IngestionRun.objects.bulk_create(runs)
+    return outcomes
+
+
+@shared_task(time_limit=300, max_retries=0, name="web.summarize_ingestion_sweep")
+def summarize_ingestion_sweep(batch_results: list[list[dict]], sweep_name: str, started_at: float) -> str:
+    """chord callback that aggregates the per-group outcomes of an ingestion sweep into one summary
+
+    Args:
+        batch_results (list[list[dict]]): outcomes returned by each of the sweep's run_ingestion_batch tasks
+        sweep_name (str): name of the sweep, used in the summary
+        started_at (float): unix timestamp the sweep was launched at
+    """
+    results: list[dict] = [result for batch in batch_results for result in batch]
+    failed: list[dict] = [result for result in results if not result["succeeded"]]
+    totals: dict[str, int] = {outcome: sum(result[outcome] for result in results) for outcome in RESULT_OUTCOMES}
+    summary: str = (
+        f"{sweep_name} finished in {time.time() - started_at:.1f}s: {len(results)} groups, "
+        f"{len(results) - len(failed)} succeeded, {len(failed)} failed; "
+        f"{totals['unchanged']} unchanged, {totals['updated']} updated, {totals['created']} created"
+    )
+    if results:
+        slowest: dict = max(results, key=lambda result: result["duration"])
+        summary += f"; slowest {slowest['group']} {slowest['duration']:.1f}s"
+    if failed:
+        summary += "; failures: " + ", ".join(f"{result['group']} ({result['message']})" for result in failed)
+        logging.error(summary)
+    else:
+        logging.info(summary)
+    return summary
+
+
+def build_ingestion_sweep(sweep_name: str, pipeline: str, group_pks: list[int]) -> Any:
+    """build a chord that runs an ingestion pipeline over groups in batches, then summarizes the sweep
+
+    The groups are split into batches of settings.INGESTION_BATCH_SIZE, whatever their platform. Each batch runs in
+    one worker, which scrapes its groups concurrently with at most settings.INGESTION_SWEEP_CONCURRENCY[platform]
+    groups of a platform at once; the chord's callback runs once every batch has finished.
+
+    Args:
+        sweep_name (str): name of the sweep, used in the summary
+        pipeline (str): "details" or "events"
+        group_pks (list[int]): primary keys of the groups
+
+    Returns:
+        celery.chord: the sweep, ready for apply_async()
+    """
+    batch_size: int = max(1, getattr(settings, "INGESTION_BATCH_SIZE", 20))
+    sweep_id: str = uuid.uuid4().hex
+    return chord(
+        task_group(
+            run_ingestion_batch.s(pipeline, group_pks[index : index + batch_size], sweep_id=sweep_id)
+            for index in range(0, len(group_pks), batch_size)
+        ),
+        summarize_ingestion_sweep.s(sweep_name, time.time()),
+    )
 
-            event, is_new = Event.objects.update_or_create(
-                group=group, social_platform_id=item["id"], defaults=event_data
-            )
-            if is_new:
-                event_count += 1
-            for tag in tag_data:
-                obj, _ = Tag.objects.get_or_create(value=tag["display_name"], defaults={"value": tag["display_name"]})
-                event.tags.add(obj)
-    return f"added {event_count} new events for {group.name}"
+
+def get_ingestible_groups(platform_name: str | None = None) -> list[int]:
+    """get the primary keys of the enabled groups whose platform has a registered scraper
+
+    Args:
+        platform_name (str, optional): only include groups on this platform
+    """
+    groups = TechGroup.objects.filter(enabled=True).select_related("platform").order_by("pk")
+    if platform_name:
+        groups = groups.filter(platform__name=platform_name)
+    return [group.pk for group in groups if has_scraper(group.platform)]
 
 
 @shared_task(time_limit=900, max_retries=3, name="web.launch_group_detail_ingestion")
 def launch_group_detail_ingestion() -> str:
     """parent task for ingesting details for all tech groups"""
-    for group in TechGroup.objects.filter(enabled=True):
-        for link in group.links.filter(name=f"""{group.name} {group.platform} page"""):
-            if group.platform.name.lower() == "meetup":
-                job = ingest_meetup_group_details.s(group.pk, link.url)
-                job.apply_async()
-            elif group.platform.name.lower() == "eventbrite":
-                job = ingest_eventbrite_organization_details.s(group.pk)
-                job.apply_async()
-    return f"ingesting details for {TechGroup.objects.filter(enabled=True).count()} tech groups"
+    group_pks: list[int] = get_ingestible_groups()
+    if group_pks:
+        build_ingestion_sweep("group detail sweep", "details", group_pks).apply_async()
+    return f"ingesting details for {len(group_pks)} tech groups"
+
+
+def launch_event_sweep(platform_name: str | None = None) -> int:
+    """launch an event ingestion sweep over the enabled groups, optionally of one platform only
+
+    Returns:
+        int: number of groups in the sweep
+    """
+    group_pks: list[int] = get_ingestible_groups(platform_name)
+    if group_pks:
+        sweep_name: str = f"{platform_name.lower()} event sweep" if platform_name else "event sweep"
+        build_ingestion_sweep(sweep_name, "events", group_pks).apply_async()
+    return len(group_pks)
+
+
+@shared_task(time_limit=900, max_retries=0, name="web.launch_event_ingestion")
+def launch_event_ingestion() -> str:
+    """parent task for ingesting future events for tech groups on every platform"""
+    return f"ingesting future events for {launch_event_sweep()} tech groups"
 
 
 @shared_task(time_limit=900, max_retries=0, name="web.launch_meetup_event_ingestion")
 def launch_meetup_event_ingestion() -> str:
     """parent task for ingesting future events for tech groups on Meetup"""
-    tech_group_list = TechGroup.objects.filter(enabled=True, platform__name="Meetup")
-    for group in tech_group_list:
-        job = ingest_future_meetup_events.s(group.pk)
-        job.apply_async()
-    return f"ingesting future events for {len(tech_group_list)} tech groups on Meetup"
+    return f"ingesting future events for {launch_event_sweep('Meetup')} tech groups on Meetup"
 
 
 @shared_task(time_limit=900, max_retries=0, name="web.launch_eventbrite_event_ingestion")
 def launch_eventbrite_event_ingestion() -> str:
     """parent task for ingesting future events for tech groups on Eventbrite"""
+    return f"ingesting future events for {launch_event_sweep('Eventbrite')} tech groups on Eventbrite"
+
 
-    tech_group_list = TechGroup.objects.filter(enabled=True, platform__name="Eventbrite")
-    for group in tech_group_list:
-        job = ingest_future_eventbrite_events.s(group.pk)
-        job.apply_async()
-        time.sleep(random.randint(1, 3))  # nosec
-    return f"ingesting future events for {len(tech_group_list)} tech groups on Eventbrite"
+@shared_task(time_limit=900, max_retries=0, name="web.prune_page_snapshots")
+def prune_page_snapshots() -> str:
+    """delete page snapshots older than settings.SCRAPER_SNAPSHOT_RETENTION_DAYS, and their unreferenced blobs"""
+    deleted_snapshots, deleted_blobs = prune_snapshots()
+    return f"deleted {deleted_snapshots} page snapshots and {deleted_blobs} snapshot blobs"
 
 
 @shared_task(time_limit=300, max_retries=0, name="web.post_event_to_linkedin")
 def post_event_to_linkedin(event_pk: int, is_new: bool) -> str:
-    event: Event = Event.objects.get(pk=event_pk)
+    event: Event | None = Event.objects.filter(pk=event_pk).first()
     if not event:
-        return f"Event with pk {event_pk} not found."
+        return f"Event with pk {event_pk} not found or cancelled."
 
     linkedin_credential = IntegrationCredential.objects.filter(provider="linkedin").first()
     access_token = linkedin_credential.access_token if linkedin_credential else settings.LINKEDIN_ACCESS_TOKEN
@@ -239,9 +347,9 @@ def post_event_to_linkedin(event_pk: int, is_new: bool) -> str:
 @shared_task(time_limit=300, max_retries=0, name="web.post_event_to_discord")
 def post_event_to_discord(event_pk: int, is_new: bool = True) -> str:
     """post an event to Discord via webhook"""
-    event: Event = Event.objects.get(pk=event_pk)
+    event: Event | None = Event.objects.filter(pk=event_pk).first()
     if not event:
-        return f"Event with pk {event_pk} not found."
+        return f"Event with pk {event_pk} not found or cancelled."
 
     # Ensure Discord webhook URL is set
     if not settings.DISCORD_WEBHOOK_URL:
@@ -293,9 +401,9 @@ def launch_reminders_for_tomorrows_events() -> str:
 @shared_task(time_limit=900, max_retries=3, name="web.post_event_to_spug_task")
 def post_event_to_spug_task(event_pk: int) -> str:
     """post an event to SPUG via their API"""
-    event: Event = Event.objects.get(pk=event_pk)
+    event: Event | None = Event.objects.filter(pk=event_pk).first()
     if not event:
-        return f"Event with pk {event_pk} not found."
+        return f"Event with pk {event_pk} not found or cancelled."
     spug_url: str | None = getattr(settings, "SPUG_API_URL", None)
     spug_token: str | None = getattr(settings, "SPUG_API_TOKEN", None)
     if not spug_url or not spug_token:
@@ -313,7 +421,7 @@ def post_event_to_spug_task(event_pk: int) -> str:
         "Authorization": f"Token {spug_token}",
         "Content-Type": "application/json",
     }
-    response: requests.Response = requests.post(spug_url, json=payload, headers=headers, timeout=15)
+    response: requests.Response = http_client.post(spug_url, json=payload, headers=headers, timeout=15)
     response.raise_for_status()
     return f"Event {event.name} posted to SPUG successfully."
 
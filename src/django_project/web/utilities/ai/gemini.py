@@ -3,6 +3,7 @@ from typing import Any
 
 import requests
 from django.conf import settings
+from web.utilities import http_client
 
 
 def generate_post_content(prompt: str, model: str = "gemini-2.5-flash-lite") -> str:
@@ -25,7 +26,7 @@ def generate_post_content(prompt: str, model: str = "gemini-2.5-flash-lite") ->
     url: str = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
     payload: str = json.dumps({"contents": [{"parts": [{"text": prompt}]}]})
     headers: dict[str, str] = {"x-goog-api-key": gemini_api_key, "Content-Type": "application/json"}
-    response: requests.Response = requests.request("POST", url, headers=headers, data=payload)
+    response: requests.Response = http_client.post(url, headers=headers, data=payload, timeout=60)
     response.raise_for_status()
     data: Any = response.json()
     try:
@@ -0,0 +1,128 @@
+import json
+import os
+import subprocess  # nosec
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Iterator
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from web.utilities.browser_pool import get_process_tree_rss_mb
+from web.utilities.replay import get_replay_config
+
+
+@dataclass
+class StageResult:
+    """measurements of one benchmark stage"""
+
+    name: str
+    wall_time: float = 0.0
+    calls: int = 0
+    requests: int = 0  # requests and page loads served from the replay corpus
+    db_queries: int = 0
+    peak_rss_mb: float = 0.0
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.wall_time if self.wall_time else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**asdict(self), "requests_per_second": round(self.requests_per_second, 2)}
+
+    def __str__(self) -> str:
+        return (
+            f"{self.name:<32} {self.wall_time:>8.3f}s {self.calls:>6} calls {self.requests:>6} req "
+            f"{self.requests_per_second:>8.1f} req/s {self.db_queries:>6} queries {self.peak_rss_mb:>8.1f} MB"
+        )
+
+
+class RssSampler:
+    """sample the resident set size of this process and its children (Chromium) in a background thread"""
+
+    def __init__(self, interval: float = 0.05) -> None:
+        self.interval: float = interval
+        self.peak_mb: float = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self) -> None:
+        while True:
+            self.peak_mb = max(self.peak_mb, get_process_tree_rss_mb(os.getpid()))
+            if self._stop.wait(self.interval):
+                return
+
+    def __enter__(self) -> "RssSampler":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+@contextmanager
+def measure_stage(name: str, results: list[StageResult]) -> Iterator[StageResult]:
+    """measure wall time, replayed requests, database queries and peak RSS of the block
+
+    The caller sets `calls` on the yielded StageResult; the result is appended to `results` when the block exits.
+    """
+    result = StageResult(name=name)
+    replay_config = get_replay_config()
+    requests_before: int = replay_config.requests_served
+    with RssSampler() as sampler, CaptureQueriesContext(connection) as queries:
+        start: float = time.perf_counter()
+        try:
+            yield result
+        finally:
+            result.wall_time = time.perf_counter() - start
+    result.requests = replay_config.requests_served - requests_before
+    result.db_queries = len(queries.captured_queries)
+    result.peak_rss_mb = sampler.peak_mb
+    results.append(result)
+
+
+def get_commit() -> str:
+    """get the current git commit, or an empty string outside a git checkout"""
+    try:
+        return subprocess.run(  # nosec
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def write_results(path: str | Path, results: list[StageResult], **metadata: Any) -> dict[str, Any]:
+    """write benchmark results as json, with the commit and time they were measured at
+
+    Returns:
+        dict[str, Any]: the written document
+    """
+    document: dict[str, Any] = {
+        "commit": get_commit(),
+        "measured_at": datetime.now(timezone.utc).isoformat(),
+        **metadata,
+        "stages": [result.as_dict() for result in results],
+    }
+    Path(path).write_text(json.dumps(document, indent=2), encoding="utf-8")
+    return document
+
+
+def compare_results(previous: dict[str, Any], results: list[StageResult]) -> list[str]:
+    """describe how each stage's wall time and query count changed relative to an earlier results document"""
+    previous_stages: dict[str, dict] = {stage["name"]: stage for stage in previous.get("stages", [])}
+    lines: list[str] = []
+    for result in results:
+        before: dict | None = previous_stages.get(result.name)
+        if not before:
+            lines.append(f"{result.name:<32} new stage")
+            continue
+        change: float = (result.wall_time / before["wall_time"] - 1) * 100 if before["wall_time"] else 0.0
+        lines.append(
+            f"{result.name:<32} wall {before['wall_time']:.3f}s -> {result.wall_time:.3f}s ({change:+.0f}%), "
+            f"queries {before['db_queries']} -> {result.db_queries}"
+        )
+    return lines
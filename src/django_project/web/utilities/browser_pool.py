@@ -0,0 +1,279 @@
+import asyncio
+import atexit
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import Any, Coroutine, Iterator, TypeVar
+
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from playwright.async_api import Browser as AsyncBrowser
+from playwright.async_api import Playwright as AsyncPlaywright
+from playwright.async_api import async_playwright
+from playwright.sync_api import sync_playwright
+from playwright.sync_api._generated import Browser, BrowserContext, Page, Playwright
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36"
+)
+CONTEXT_OPTIONS: dict[str, Any] = {
+    "user_agent": USER_AGENT,
+    "viewport": {"width": 1280, "height": 800},
+    "java_script_enabled": True,
+}
+
+
+def get_process_tree_rss_mb(pid: int) -> float:
+    """get the combined resident set size of a process and all of its descendants
+
+    Args:
+        pid (int): process id at the root of the tree
+
+    Returns:
+        float: resident set size in MB; 0.0 when /proc is not available (non-Linux hosts)
+    """
+    if not os.path.isdir("/proc"):
+        return 0.0
+    children: dict[int, list[int]] = {}
+    rss_pages: dict[int, int] = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", encoding="utf-8") as stat_file:
+                # the process name may contain spaces, so split after the closing paren
+                fields: list[str] = stat_file.read().rsplit(")", 1)[1].split()
+        except (OSError, IndexError):
+            continue
+        children.setdefault(int(fields[1]), []).append(int(entry))
+        rss_pages[int(entry)] = int(fields[21])
+    total_pages = 0
+    pending: list[int] = [pid]
+    while pending:
+        current: int = pending.pop()
+        total_pages += rss_pages.get(current, 0)
+        pending.extend(children.get(current, []))
+    return total_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+
+
+class BaseBrowserPool(ABC):
+    """The recycling policy shared by the sync and async browser pools
+
+    A pooled browser is recycled after serving `max_pages` pages or when the resident memory of the process tree
+    grows past `max_rss_mb`. The tree holds every browser the worker runs, sync and async alike, so either pool
+    recycles its browser once the worker as a whole has grown too large. Measuring the memory walks all of /proc, so
+    it is only sampled every `rss_check_pages` pages rather than on every checkout.
+
+    Playwright objects are bound to the thread that created them, so a pool records its owning thread and is closed
+    from it; see close_thread_browser_pools().
+    """
+
+    def __init__(
+        self, max_pages: int | None = None, max_rss_mb: int | None = None, rss_check_pages: int | None = None
+    ) -> None:
+        self.max_pages: int = max_pages or int(getattr(settings, "PLAYWRIGHT_POOL_MAX_PAGES", 50))
+        self.max_rss_mb: int = max_rss_mb or int(getattr(settings, "PLAYWRIGHT_POOL_MAX_RSS_MB", 1024))
+        self.rss_check_pages: int = rss_check_pages or int(getattr(settings, "PLAYWRIGHT_POOL_RSS_CHECK_PAGES", 10))
+        self.pages_served: int = 0
+        self.launch_count: int = 0
+        self.owner: int = threading.get_ident()
+
+    def needs_recycle(self) -> bool:
+        """check if the browser has served enough pages, or grown large enough, to warrant a restart
+
+        The memory is only sampled once every `rss_check_pages` pages served by the running browser.
+        """
+        if self.pages_served >= self.max_pages:
+            return True
+        if self.pages_served == 0 or self.pages_served % self.rss_check_pages:
+            return False
+        return get_process_tree_rss_mb(os.getpid()) > self.max_rss_mb
+
+    @abstractmethod
+    def close(self) -> None:
+        """close the browser and stop the Playwright driver"""
+
+
+class BrowserPool(BaseBrowserPool):
+    """A long-lived Chromium instance that hands out a fresh BrowserContext per fetch
+
+    The browser is launched lazily on first use and recycled as described in BaseBrowserPool. Playwright sync objects
+    are bound to the thread that created them, so pools are handed out per thread by get_browser_pool().
+    """
+
+    def __init__(
+        self, max_pages: int | None = None, max_rss_mb: int | None = None, rss_check_pages: int | None = None
+    ) -> None:
+        super().__init__(max_pages, max_rss_mb, rss_check_pages)
+        self.playwright: Playwright | None = None
+        self.browser: Browser | None = None
+
+    def start(self) -> Browser:
+        """launch the browser if it is not already running"""
+        if self.browser is None or not self.browser.is_connected():
+            if self.playwright is None:
+                self.playwright = sync_playwright().start()
+            self.browser = self.playwright.chromium.launch(headless=True)
+            self.pages_served = 0
+            self.launch_count += 1
+            logger.info("launched pooled Chromium browser (launch #%s)", self.launch_count)
+        return self.browser
+
+    def recycle(self) -> None:
+        """close the running browser; the next fetch launches a new one"""
+        if self.browser is not None:
+            try:
+                self.browser.close()
+            except Exception as err:
+                logger.warning("error closing pooled browser: %s", err)
+        self.browser = None
+
+    def close(self) -> None:
+        self.recycle()
+        if self.playwright is not None:
+            try:
+                self.playwright.stop()
+            except Exception as err:
+                logger.warning("error stopping Playwright driver: %s", err)
+        self.playwright = None
+
+    @contextmanager
+    def page(self) -> Iterator[Page]:
+        """yield a page in a fresh, isolated BrowserContext; the context is closed on exit
+
+        If the fetch raises, the browser is recycled, as a crashed or hung browser would fail every later fetch too.
+        """
+        if self.browser is not None and self.needs_recycle():
+            logger.info("recycling pooled browser after %s pages", self.pages_served)
+            self.recycle()
+        context: BrowserContext = self.start().new_context(**CONTEXT_OPTIONS)
+        try:
+            yield context.new_page()
+        except Exception:
+            self.recycle()
+            raise
+        finally:
+            self.pages_served += 1
+            try:
+                context.close()
+            except Exception:  # nosec B110 - the browser may already be gone
+                pass
+
+
+class AsyncBrowserPool(BaseBrowserPool):
+    """A long-lived Chromium instance driven by the async Playwright API, for loading several pages at once
+
+    Async Playwright objects are bound to the event loop that created them, so the pool owns an event loop and runs
+    every batch of fetches on it with run(). A thread thus runs at most two browsers, this one and the one of its
+    BrowserPool, and both count towards the memory that triggers a recycle. Pools are handed out per thread by
+    get_async_browser_pool().
+    """
+
+    def __init__(
+        self, max_pages: int | None = None, max_rss_mb: int | None = None, rss_check_pages: int | None = None
+    ) -> None:
+        super().__init__(max_pages, max_rss_mb, rss_check_pages)
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self.playwright: AsyncPlaywright | None = None
+        self.browser: AsyncBrowser | None = None
+
+    def run(self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """run a coroutine using this pool's browser on the pool's event loop"""
+        return self.loop.run_until_complete(coroutine)
+
+    async def start(self) -> AsyncBrowser:
+        """get the browser for a batch of fetches, launching it, or recycling it if it is due, first"""
+        if self.browser is not None and self.needs_recycle():
+            logger.info("recycling pooled async browser after %s pages", self.pages_served)
+            await self.recycle()
+        if self.browser is None or not self.browser.is_connected():
+            if self.playwright is None:
+                self.playwright = await async_playwright().start()
+            self.browser = await self.playwright.chromium.launch(headless=True)
+            self.pages_served = 0
+            self.launch_count += 1
+            logger.info("launched pooled async Chromium browser (launch #%s)", self.launch_count)
+        return self.browser
+
+    async def recycle(self) -> None:
+        """close the running browser; the next batch launches a new one"""
+        if self.browser is not None:
+            try:
+                await self.browser.close()
+            except Exception as err:
+                logger.warning("error closing pooled async browser: %s", err)
+        self.browser = None
+
+    async def stop(self) -> None:
+        await self.recycle()
+        if self.playwright is not None:
+            try:
+                await self.playwright.stop()
+            except Exception as err:
+                logger.warning("error stopping async Playwright driver: %s", err)
+        self.playwright = None
+
+    def close(self) -> None:
+        if not self.loop.is_closed():
+            self.run(self.stop())
+            self.loop.close()
+
+
+_local = threading.local()
+_pools: list[BaseBrowserPool] = []
+
+
+def get_browser_pool() -> BrowserPool:
+    """get the BrowserPool for the current worker process and thread"""
+    pool: BrowserPool | None = getattr(_local, "pool", None)
+    if pool is None:
+        pool = BrowserPool()
+        _local.pool = pool
+        _pools.append(pool)
+    return pool
+
+
+def get_async_browser_pool() -> AsyncBrowserPool:
+    """get the AsyncBrowserPool for the current worker process and thread"""
+    pool: AsyncBrowserPool | None = getattr(_local, "async_pool", None)
+    if pool is None:
+        pool = AsyncBrowserPool()
+        _local.async_pool = pool
+        _pools.append(pool)
+    return pool
+
+
+def close_thread_browser_pools() -> None:
+    """close the browser pools opened by the current thread
+
+    Threads that keep pools for their whole life, like the scraper threads, call this before they are stopped; see
+    web.utilities.scrapers.registry.shutdown_scraper_executor().
+    """
+    thread: int = threading.get_ident()
+    for pool in [pool for pool in _pools if pool.owner == thread]:
+        _pools.remove(pool)
+        pool.close()
+    _local.__dict__.pop("pool", None)
+    _local.__dict__.pop("async_pool", None)
+
+
+@atexit.register
+def close_browser_pools(**kwargs) -> None:
+    """close the browser pools of the shutting down thread, and drop those of threads that did not close theirs
+
+    A sync pool cannot be closed from another thread; the browsers of a dropped pool exit with the Playwright driver
+    when the process does.
+    """
+    close_thread_browser_pools()
+    if _pools:
+        logger.warning("%s browser pools were not closed by their threads", len(_pools))
+        _pools.clear()
+
+
+worker_process_shutdown.connect(close_browser_pools)
@@ -1,11 +1,31 @@
+import asyncio
+import logging
 import time
+from dataclasses import dataclass
+from functools import partial
 from typing import Any
+from urllib.parse import urlparse
 
-import requests
 from bs4 import BeautifulSoup, Tag
 from bs4.element import NavigableString, PageElement
-from playwright.sync_api import sync_playwright
-from playwright.sync_api._generated import Browser, BrowserContext, Page
+from playwright.async_api import Browser as AsyncBrowser
+from playwright.async_api import Request as AsyncRequest
+from playwright.async_api import Route as AsyncRoute
+from playwright.async_api import TimeoutError as AsyncPlaywrightTimeoutError
+from playwright.sync_api import Request, Route
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from web.utilities import http_client
+from web.utilities.browser_pool import (
+    CONTEXT_OPTIONS,
+    AsyncBrowserPool,
+    get_async_browser_pool,
+    get_browser_pool,
+)
+from web.utilities.rate_limit import get_rate_limiter_for_url, parse_retry_after
+from web.utilities.replay import ReplayMissError, prepare_page, prepare_page_async
+from web.utilities.telemetry import record_fetch
+
+logger = logging.getLogger(__name__)
 
 
 def fetch_content(url, timeout=30) -> bytes | Any:
@@ -22,35 +42,152 @@ def fetch_content(url, timeout=30) -> bytes | Any:
         str: response text from the url
     """
     headers = {"Cache-Control": "no-cache", "Pragma": "no-cache", "User-Agent": "Mozilla/5.0"}
-    response = requests.get(url, headers=headers, timeout=timeout)
+    response = http_client.get(url, headers=headers, timeout=timeout)
     if response.status_code == 200:
         return response.content
     else:
         raise Exception(f"Failed to fetch content from {url}: {response.status_code}")
 
 
-def fetch_content_with_playwright(url, retries=3, timeout=30000) -> str:
-    """Fetch HTML content from a URL using Playwright"""
+# resource types a lean fetch never downloads; the html and the scripts/xhr that build it are all we parse
+BLOCKED_RESOURCE_TYPES: frozenset[str] = frozenset({"image", "media", "font", "stylesheet", "manifest", "other"})
+
+
+@dataclass
+class FetchStats:
+    """timing and transfer counters for a single page fetch"""
+
+    url: str
+    status: int | None = None
+    elapsed: float = 0.0
+    requests: int = 0
+    blocked_requests: int = 0
+    bytes_transferred: int = 0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.url}: status {self.status}, {self.elapsed:.2f}s, {self.requests} requests "
+            f"({self.blocked_requests} blocked), {self.bytes_transferred} bytes"
+        )
+
+
+def is_first_party(request_url: str, page_url: str) -> bool:
+    """check if a request goes to the same site as the page; www.meetup.com and secure.meetup.com are one site"""
+    request_host: str = urlparse(request_url).hostname or ""
+    page_host: str = urlparse(page_url).hostname or ""
+    site: str = ".".join(page_host.split(".")[-2:])
+    return request_host == site or request_host.endswith(f".{site}")
+
+
+def should_block_request(resource_type: str, request_url: str, page_url: str) -> bool:
+    """check if a lean fetch should abort a request: non-essential resource types and third-party domains"""
+    return resource_type in BLOCKED_RESOURCE_TYPES or not is_first_party(request_url, page_url)
+
+
+def count_request(fetch_stats: FetchStats, request: Request) -> None:
+    """page "requestfinished" handler adding a request and its transfer size to the stats of a fetch"""
+    sizes = request.sizes()
+    fetch_stats.requests += 1
+    fetch_stats.bytes_transferred += sizes["responseHeadersSize"] + sizes["responseBodySize"]
+
+
+def route_lean_request(fetch_stats: FetchStats, page_url: str, route: Route) -> None:
+    """route handler of a lean fetch, aborting the requests should_block_request() rejects"""
+    if should_block_request(route.request.resource_type, route.request.url, page_url):
+        fetch_stats.blocked_requests += 1
+        route.abort()
+    else:
+        route.fallback()
+
+
+async def count_request_async(fetch_stats: FetchStats, request: AsyncRequest) -> None:
+    """async counterpart of count_request()"""
+    sizes = await request.sizes()
+    fetch_stats.requests += 1
+    fetch_stats.bytes_transferred += sizes["responseHeadersSize"] + sizes["responseBodySize"]
+
+
+async def route_lean_request_async(fetch_stats: FetchStats, page_url: str, route: AsyncRoute) -> None:
+    """async counterpart of route_lean_request()"""
+    if should_block_request(route.request.resource_type, route.request.url, page_url):
+        fetch_stats.blocked_requests += 1
+        await route.abort()
+    else:
+        await route.fallback()
+
+
+def fetch_content_with_playwright(
+    url,
+    retries=3,
+    timeout=30000,
+    lean: bool = False,
+    wait_for: str | None = None,
+    wait_for_function: str | None = None,
+    stats: list[FetchStats] | None = None,
+) -> str:
+    """Fetch HTML content from a URL using the worker's pooled Playwright browser
+
+    A default fetch waits for the load event plus a fixed 2 seconds. A lean fetch aborts images, fonts, stylesheets
+    and third-party requests, navigates only until DOMContentLoaded, and then waits for `wait_for` (a css selector)
+    and/or `wait_for_function` (a javascript predicate) to be satisfied, up to `timeout`. Navigation waits for a
+    token from the platform's rate limiter, if it has one.
+
+    Args:
+        url (str): url to fetch content from
+        retries (int, optional): number of attempts to make. Defaults to 3.
+        timeout (int, optional): navigation timeout in milliseconds. Defaults to 30000.
+        lean (bool, optional): use a lean fetch. Defaults to False.
+        wait_for (str, optional): css selector of an element the parser needs; lean fetches only
+        wait_for_function (str, optional): javascript predicate that is truthy once the page is ready; lean fetches only
+        stats (list[FetchStats], optional): list to append the stats of the successful fetch to
+
+    Returns:
+        str: rendered html of the page; empty string if all attempts fail
+    """
+    rate_limiter = get_rate_limiter_for_url(url)
     attempt = 0
     while attempt < retries:
+        fetch_stats = FetchStats(url=url)
+        start: float = time.perf_counter()
         try:
-            with sync_playwright() as p:
-                browser: Browser = p.chromium.launch(headless=True)
-                context: BrowserContext = browser.new_context(
-                    user_agent=(
-                        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                        "AppleWebKit/537.36 (KHTML, like Gecko) "
-                        "Chrome/122.0.0.0 Safari/537.36"
-                    ),
-                    viewport={"width": 1280, "height": 800},
-                    java_script_enabled=True,
-                )
-                page: Page = context.new_page()
-                page.goto(url, wait_until="load", timeout=timeout)
-                page.wait_for_timeout(2000)
-                html_content: str = page.content()
-                browser.close()
+            with get_browser_pool().page() as page:
+                page.on("requestfinished", partial(count_request, fetch_stats))
+                prepare_page(page, url)
+                if lean:
+                    page.route("**/*", partial(route_lean_request, fetch_stats, url))
+                if rate_limiter:
+                    rate_limiter.acquire()
+                response = page.goto(url, wait_until="domcontentloaded" if lean else "load", timeout=timeout)
+                fetch_stats.status = response.status if response else None
+                retry_after: float | None = None
+                html_content: str = ""
+                if response is not None and response.status == 429:
+                    retry_after = parse_retry_after(response.headers.get("retry-after")) or 30
+                else:
+                    if not lean:
+                        page.wait_for_timeout(2000)
+                    else:
+                        try:
+                            if wait_for:
+                                page.wait_for_selector(wait_for, state="attached", timeout=timeout)
+                            if wait_for_function:
+                                page.wait_for_function(wait_for_function, timeout=timeout)
+                        except PlaywrightTimeoutError:
+                            logger.warning("timed out waiting for %s on %s; using the page as loaded", wait_for, url)
+                    html_content = page.content()
+            # raised outside the page block, as a throttled fetch is no reason to recycle the browser
+            if retry_after is not None:
+                if rate_limiter:
+                    rate_limiter.penalize(retry_after)
+                raise Exception(f"Failed to fetch content from {url}: 429")
+            fetch_stats.elapsed = time.perf_counter() - start
+            logger.info("fetched %s", fetch_stats)
+            record_fetch(fetch_stats.status, fetch_stats.bytes_transferred)
+            if stats is not None:
+                stats.append(fetch_stats)
             return html_content
+        except ReplayMissError:
+            raise
         except Exception as e:
             print(f"Error: {e}. Retrying... ({attempt + 1}/{retries})")
             attempt += 1
@@ -59,6 +196,126 @@ def fetch_content_with_playwright(url, retries=3, timeout=30000) -> str:
     return ""
 
 
+async def _fetch_page_async(
+    browser: AsyncBrowser,
+    url: str,
+    semaphore: asyncio.Semaphore,
+    retries: int,
+    timeout: int,
+    lean: bool,
+    wait_for: str | None,
+    wait_for_function: str | None,
+    stats: list[FetchStats] | None,
+) -> str:
+    """fetch a single page in its own BrowserContext once a concurrency slot and a rate limit token are free"""
+    rate_limiter = get_rate_limiter_for_url(url)
+    async with semaphore:
+        for attempt in range(1, retries + 1):
+            fetch_stats = FetchStats(url=url)
+            start: float = time.perf_counter()
+            context = await browser.new_context(**CONTEXT_OPTIONS)
+            try:
+                page = await context.new_page()
+                page.on("requestfinished", partial(count_request_async, fetch_stats))
+                await prepare_page_async(page, url)
+                if lean:
+                    await page.route("**/*", partial(route_lean_request_async, fetch_stats, url))
+                if rate_limiter:
+                    await rate_limiter.acquire_async()
+                response = await page.goto(url, wait_until="domcontentloaded" if lean else "load", timeout=timeout)
+                fetch_stats.status = response.status if response else None
+                if response is not None and response.status == 429:
+                    if rate_limiter:
+                        await rate_limiter.penalize_async(parse_retry_after(response.headers.get("retry-after")) or 30)
+                    raise Exception(f"Failed to fetch content from {url}: 429")
+                if not lean:
+                    await page.wait_for_timeout(2000)
+                else:
+                    try:
+                        if wait_for:
+                            await page.wait_for_selector(wait_for, state="attached", timeout=timeout)
+                        if wait_for_function:
+                            await page.wait_for_function(wait_for_function, timeout=timeout)
+                    except AsyncPlaywrightTimeoutError:
+                        logger.warning("timed out waiting for %s on %s; using the page as loaded", wait_for, url)
+                html_content: str = await page.content()
+                fetch_stats.elapsed = time.perf_counter() - start
+                logger.info("fetched %s", fetch_stats)
+                record_fetch(fetch_stats.status, fetch_stats.bytes_transferred)
+                if stats is not None:
+                    stats.append(fetch_stats)
+                return html_content
+            except ReplayMissError:
+                raise
+            except Exception as e:
+                print(f"Error fetching {url}: {e}. Retrying... ({attempt}/{retries})")
+                await asyncio.sleep(2 + attempt)
+            finally:
+                await context.close()
+    print(f"Max retries reached. Could not fetch the content of {url}.")
+    return ""
+
+
+async def _fetch_many_async(
+    pool: AsyncBrowserPool, urls: list[str], concurrency: int, retries: int, timeout: int, **options
+) -> list[str]:
+    """fetch pages concurrently in the pool's browser, returning their content in the order of urls
+
+    If the batch raises, the browser is recycled, as a crashed or hung browser would fail every later batch too.
+    """
+    browser: AsyncBrowser = await pool.start()
+    semaphore = asyncio.Semaphore(concurrency)
+    try:
+        return await asyncio.gather(
+            *(_fetch_page_async(browser, url, semaphore, retries, timeout, **options) for url in urls)
+        )
+    except Exception:
+        await pool.recycle()
+        raise
+    finally:
+        pool.pages_served += len(urls)
+
+
+def fetch_many_with_playwright(
+    urls: list[str],
+    concurrency: int = 4,
+    retries=3,
+    timeout=30000,
+    lean: bool = False,
+    wait_for: str | None = None,
+    wait_for_function: str | None = None,
+    stats: list[FetchStats] | None = None,
+) -> dict[str, str]:
+    """Fetch HTML content from several URLs, loading up to `concurrency` pages in parallel within one browser
+
+    The pages are loaded in the long-lived browser of the thread's AsyncBrowserPool, which is recycled like the one
+    fetch_content_with_playwright() uses.
+
+    Args:
+        urls (list[str]): urls to fetch content from
+        concurrency (int, optional): max number of pages loading at once. Defaults to 4.
+        retries (int, optional): number of attempts to make per url. Defaults to 3.
+        timeout (int, optional): navigation timeout in milliseconds. Defaults to 30000.
+        lean, wait_for, wait_for_function, stats: as for fetch_content_with_playwright()
+
+    Returns:
+        dict[str, str]: rendered html keyed by url, in the order of urls; empty string for urls that failed
+    """
+    if not urls:
+        return {}
+    options: dict[str, Any] = {
+        "lean": lean,
+        "wait_for": wait_for,
+        "wait_for_function": wait_for_function,
+        "stats": stats,
+    }
+    if concurrency <= 1:
+        return {url: fetch_content_with_playwright(url, retries=retries, timeout=timeout, **options) for url in urls}
+    pool: AsyncBrowserPool = get_async_browser_pool()
+    contents: list[str] = pool.run(_fetch_many_async(pool, urls, concurrency, retries, timeout, **options))
+    return dict(zip(urls, contents))
+
+
 def find_target(
     url, parent="ul", classes="flex w-full flex-col space-y-5 px-4 md:px-0", max_retries=3
 ) -> PageElement | Tag | NavigableString:
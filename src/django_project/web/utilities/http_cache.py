@@ -0,0 +1,110 @@
+import hashlib
+from dataclasses import dataclass
+
+import requests
+from web.models import HttpCacheEntry
+from web.utilities import http_client
+
+
+@dataclass
+class FetchCacheStats:
+    """counters for the conditional fetches made during one ingestion run"""
+
+    requests: int = 0
+    hits: int = 0
+    bytes_downloaded: int = 0
+    bytes_saved: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.requests if self.requests else 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"cache hits {self.hits}/{self.requests} ({self.hit_rate:.0%}), "
+            f"{self.bytes_downloaded} bytes downloaded, {self.bytes_saved} bytes saved"
+        )
+
+
+def get_cache_entry(url: str) -> HttpCacheEntry | None:
+    """get the stored validators of a url, to pass to fetch_content_if_changed()"""
+    return HttpCacheEntry.objects.filter(url=url).first()
+
+
+def fetch_content_if_changed(
+    url: str, entry: HttpCacheEntry | None, timeout: int = 30, stats: FetchCacheStats | None = None
+) -> tuple[bytes | None, HttpCacheEntry | None]:
+    """fetch content from a url, returning None if it has not changed since the last fetch
+
+    The ETag and Last-Modified validators of the previous response, as loaded by get_cache_entry(), are sent as
+    If-None-Match and If-Modified-Since. A 304 response, or a 200 response whose body hashes to the stored content
+    hash, is treated as unchanged.
+
+    The database is neither read nor written here, so the fetch can run in any thread. Save the returned entry of a
+    changed response with save_cache_entry() once the content has been processed, so that content which fails to
+    parse or write is fetched again next time.
+
+    Args:
+        url (str): url to fetch content from
+        entry (HttpCacheEntry | None): stored validators of the url; None if it was never fetched
+        timeout (int, optional): timeout in seconds. Defaults to 30.
+        stats (FetchCacheStats, optional): counters to update for this fetch
+
+    Raises:
+        Exception: if the response status code is not 200 or 304
+
+    Returns:
+        tuple[bytes | None, HttpCacheEntry | None]: response content, or None if the content is unchanged; and an
+                                                    unsaved cache entry for the response, or None if unchanged
+    """
+    stats = stats if stats is not None else FetchCacheStats()
+    headers: dict[str, str] = {"Cache-Control": "no-cache", "Pragma": "no-cache", "User-Agent": "Mozilla/5.0"}
+    if entry and entry.etag:
+        headers["If-None-Match"] = entry.etag
+    if entry and entry.last_modified:
+        headers["If-Modified-Since"] = entry.last_modified
+
+    response: requests.Response = http_client.get(url, headers=headers, timeout=timeout)
+    stats.requests += 1
+    if response.status_code == 304 and entry:
+        stats.hits += 1
+        stats.bytes_saved += entry.content_length
+        return None, None
+    if response.status_code != 200:
+        raise Exception(f"Failed to fetch content from {url}: {response.status_code}")
+
+    content: bytes = response.content
+    stats.bytes_downloaded += len(content)
+    content_hash: str = hashlib.sha256(content).hexdigest()
+    if entry and entry.content_hash == content_hash:
+        stats.hits += 1
+        return None, None
+    return content, HttpCacheEntry(
+        url=url,
+        etag=response.headers.get("ETag", ""),
+        last_modified=response.headers.get("Last-Modified", ""),
+        content_hash=content_hash,
+        content_length=len(content),
+    )
+
+
+def save_cache_entry(entry: HttpCacheEntry) -> None:
+    """store the validators of a response returned by fetch_content_if_changed(), after its content was processed"""
+    HttpCacheEntry.objects.update_or_create(
+        url=entry.url,
+        defaults={
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "content_hash": entry.content_hash,
+            "content_length": entry.content_length,
+        },
+    )
+
+
+def forget_cached_response(url: str) -> None:
+    """drop the cache entry for a url, so the next fetch is treated as changed
+
+    Call this when content fetched with fetch_content_if_changed() could not be processed, so that a later run
+    retries it rather than skipping it as unchanged.
+    """
+    HttpCacheEntry.objects.filter(url=url).delete()
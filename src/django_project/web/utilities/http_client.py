@@ -0,0 +1,175 @@
+import os
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from web.utilities.rate_limit import get_rate_limiter_for_url, parse_retry_after
+from web.utilities.replay import (
+    ReplayConfig,
+    get_replay_config,
+    get_request_body,
+    load_response,
+    save_response,
+)
+from web.utilities.telemetry import record_fetch
+
+DEFAULT_TIMEOUT: float = 15
+DEFAULT_POOL_SIZE: int = 10
+
+
+@dataclass
+class HostStats:
+    """latency and status counters for the responses received from one host"""
+
+    requests: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+    statuses: Counter = field(default_factory=Counter)
+
+    @property
+    def mean_latency(self) -> float:
+        return self.total_latency / self.requests if self.requests else 0.0
+
+
+_lock = threading.Lock()
+_local = threading.local()
+_host_stats: dict[str, HostStats] = {}
+
+
+def get_user_agent() -> str:
+    """get the User-Agent sent by default; scrapers that must look like a browser pass their own header"""
+    return getattr(settings, "HTTP_USER_AGENT", "") or (
+        f"{getattr(settings, 'PROJECT_NAME', 'spokanetech')}/{getattr(settings, 'PROJECT_VERSION', '0.0.0')} "
+        f"(+{getattr(settings, 'PROJECT_SOURCE', 'https://github.com/SpokaneTech/SpokaneTechWeb')})"
+    )
+
+
+def get_retry_policy() -> Retry:
+    """retry connection errors and transient 5xx responses with exponential backoff, for idempotent methods only
+
+    429 responses are not retried here; callers that handle rate limits do so with their own backoff.
+    """
+    return Retry(
+        total=getattr(settings, "HTTP_MAX_RETRIES", 3),
+        backoff_factor=getattr(settings, "HTTP_BACKOFF_FACTOR", 0.5),
+        status_forcelist=(500, 502, 503, 504),
+        allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+        raise_on_status=False,
+    )
+
+
+def record_response(response: requests.Response, *args, **kwargs) -> None:
+    """response hook that records latency and status for the response's host, and counts it for telemetry"""
+    host: str = urlparse(response.url).hostname or ""
+    latency: float = response.elapsed.total_seconds()
+    with _lock:
+        stats: HostStats = _host_stats.setdefault(host, HostStats())
+        stats.requests += 1
+        stats.total_latency += latency
+        stats.max_latency = max(stats.max_latency, latency)
+        stats.statuses[response.status_code] += 1
+    # read the size without touching response.content, which would consume a streamed body
+    body: bytes | bool | None = getattr(response, "_content", False)
+    size: int = len(body) if isinstance(body, bytes) else int(response.headers.get("Content-Length") or 0)
+    record_fetch(response.status_code, size)
+
+
+def get_host_stats() -> dict[str, HostStats]:
+    """get the response counters recorded by this process, keyed by host"""
+    with _lock:
+        return dict(_host_stats)
+
+
+def reset_host_stats() -> None:
+    """clear the response counters recorded by this process"""
+    with _lock:
+        _host_stats.clear()
+
+
+def get_session() -> requests.Session:
+    """get the pooled keep-alive session for the current process and thread
+
+    A requests.Session is not thread-safe, so every thread, such as each scraper thread, has its own. Sessions are
+    also keyed by process id, so Celery prefork children never share sockets inherited from the parent. Sessions
+    store no cookies, so those set by one platform are never sent along with the requests of another caller.
+    """
+    sessions: dict[int, requests.Session] = _local.__dict__.setdefault("sessions", {})
+    pid: int = os.getpid()
+    session: requests.Session | None = sessions.get(pid)
+    if session is None:
+        session = requests.Session()
+        session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+        session.headers["User-Agent"] = get_user_agent()
+        session.hooks["response"].append(record_response)
+        adapter = HTTPAdapter(pool_maxsize=DEFAULT_POOL_SIZE, max_retries=get_retry_policy())
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        sessions[pid] = session
+    return session
+
+
+def mount_host_adapter(session: requests.Session, url: str) -> None:
+    """give a host its own connection pool, sized from settings.HTTP_POOL_SIZES, the first time it is requested"""
+    parsed = urlparse(url)
+    prefix: str = f"{parsed.scheme}://{parsed.netloc}/"
+    if prefix in session.adapters:
+        return
+    pool_sizes: dict[str, int] = getattr(settings, "HTTP_POOL_SIZES", {})
+    pool_size: int = pool_sizes.get(parsed.hostname or "", DEFAULT_POOL_SIZE)
+    session.mount(prefix, HTTPAdapter(pool_maxsize=pool_size, max_retries=get_retry_policy()))
+
+
+def request(method: str, url: str, **kwargs: Any) -> requests.Response:
+    """send a request through the pooled session, applying the default timeout
+
+    Requests to rate limited platforms (settings.RATE_LIMIT_HOSTS) wait for a token first, and a 429 with a
+    Retry-After header backs off every worker sharing that platform's budget.
+
+    When web.utilities.replay is recording, responses are saved; when it is replaying, they are served from the
+    recordings, nothing is sent and no token is taken.
+
+    Args:
+        method (str): HTTP method
+        url (str): url to request
+        **kwargs: passed to requests.Session.request
+
+    Returns:
+        requests.Response: the response
+    """
+    kwargs.setdefault("timeout", getattr(settings, "HTTP_TIMEOUT", DEFAULT_TIMEOUT))
+    session: requests.Session = get_session()
+    mount_host_adapter(session, url)
+    rate_limiter = get_rate_limiter_for_url(url)
+    replay_config: ReplayConfig = get_replay_config()
+    replaying: bool = replay_config.active and replay_config.mode == "replay"
+    if rate_limiter and not replaying:
+        rate_limiter.acquire()
+    if replaying:
+        response: requests.Response = load_response(replay_config, method, url, get_request_body(kwargs))
+        record_response(response)
+    else:
+        response = session.request(method, url, **kwargs)
+        if replay_config.active:
+            save_response(replay_config, method, url, get_request_body(kwargs), response)
+    if rate_limiter and response.status_code == 429:
+        retry_after: float | None = parse_retry_after(response.headers.get("Retry-After"))
+        if retry_after is not None:
+            rate_limiter.penalize(retry_after)
+    return response
+
+
+def get(url: str, **kwargs: Any) -> requests.Response:
+    """send a GET request through the pooled session"""
+    return request("GET", url, **kwargs)
+
+
+def post(url: str, **kwargs: Any) -> requests.Response:
+    """send a POST request through the pooled session"""
+    return request("POST", url, **kwargs)
@@ -0,0 +1,471 @@
+import hashlib
+import json
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from web.models import Event, HttpCacheEntry, TechGroup
+
+logger = logging.getLogger(__name__)
+
+# Event fields that ingestion is allowed to write
+EVENT_FIELDS: tuple[str, ...] = (
+    "name",
+    "description",
+    "start_datetime",
+    "end_datetime",
+    "location_name",
+    "location_address",
+    "map_link",
+    "url",
+    "social_platform_id",
+)
+
+
+class InvalidScrapedRecord(ValueError):
+    """raised for scraped data that cannot be written, such as an event without a name"""
+
+
+def canonicalize_url(url: str | None) -> str:
+    """strip a url and lowercase its scheme and host, dropping the fragment and any utm_ tracking parameters"""
+    url = (url or "").strip()
+    if not url:
+        return ""
+    parsed = urlparse(url)
+    params: list[tuple[str, str]] = parse_qsl(parsed.query, keep_blank_values=True)
+    tracked: bool = any(key.lower().startswith("utm_") for key, _ in params)
+    return urlunparse(
+        parsed._replace(
+            scheme=parsed.scheme.lower(),
+            netloc=parsed.netloc.lower(),
+            query=(
+                urlencode([param for param in params if not param[0].lower().startswith("utm_")])
+                if tracked
+                else parsed.query
+            ),
+            fragment="",
+        )
+    )
+
+
+def to_aware_datetime(value: datetime | str | None) -> datetime | None:
+    """parse an ISO 8601 string if needed, taking naive datetimes as UTC; empty or unparseable values become None"""
+    parsed: datetime | None = value if not isinstance(value, str) else None
+    if isinstance(value, str) and value.strip():
+        parsed = parse_datetime(value.strip())
+    if parsed is not None and timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed, dt_timezone.utc)
+    return parsed
+
+
+def clip(value: str, field_name: str) -> str:
+    """cut a string to the max_length of an Event field"""
+    max_length: int | None = Event._meta.get_field(field_name).max_length
+    return value[:max_length] if max_length else value
+
+
+@dataclass(slots=True)
+class ScrapedEvent:
+    """an event as scraped from a social platform, normalized and validated when it is created
+
+    Strings are stripped (and clipped to their Event field), urls canonicalized, and datetimes parsed and made
+    timezone-aware, naive ones being taken as UTC. An event needs a social_platform_id, a name and a start.
+
+    Raises:
+        InvalidScrapedRecord: if a required value is missing
+    """
+
+    social_platform_id: str
+    name: str
+    start_datetime: datetime
+    end_datetime: datetime | None = None
+    description: str = ""
+    url: str = ""
+    location_name: str = ""
+    location_address: str = ""
+    map_link: str = ""
+    tags: list[str] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        self.social_platform_id = str(self.social_platform_id or "").strip()
+        for field_name in ("name", "location_name", "location_address"):
+            setattr(self, field_name, clip(str(getattr(self, field_name) or "").strip(), field_name))
+        self.description = str(self.description or "").strip()
+        self.url = canonicalize_url(self.url)
+        self.map_link = canonicalize_url(self.map_link)
+        start_datetime: datetime | None = to_aware_datetime(self.start_datetime)
+        self.end_datetime = to_aware_datetime(self.end_datetime)
+        self.tags = list(dict.fromkeys(tag.strip() for tag in self.tags or [] if tag and tag.strip()))
+        if not self.social_platform_id:
+            raise InvalidScrapedRecord(f"event at {self.url or 'an unknown url'} has no social_platform_id")
+        if not self.name:
+            raise InvalidScrapedRecord(f"event {self.social_platform_id} has no name")
+        if start_datetime is None:
+            raise InvalidScrapedRecord(f"event {self.social_platform_id} has no start")
+        self.start_datetime = start_datetime
+
+    @classmethod
+    def from_dict(cls, event_data: dict[str, Any]) -> "ScrapedEvent":
+        """build a ScrapedEvent from event information as parsed by a scraper, ignoring keys that are not fields
+
+        Raises:
+            InvalidScrapedRecord: if a required value is missing
+        """
+        values: dict[str, Any] = {key: event_data.get(key) for key in ("social_platform_id", "name", "start_datetime")}
+        values.update({key: value for key, value in event_data.items() if key in cls.__dataclass_fields__})
+        return cls(**values)
+
+    def as_event_fields(self) -> dict[str, Any]:
+        """get the values of EVENT_FIELDS"""
+        return {key: getattr(self, key) for key in EVENT_FIELDS}
+
+    @property
+    def fingerprint(self) -> str:
+        return compute_fingerprint(self.as_event_fields())
+
+    def diff(self, event: Event) -> list[str]:
+        """list the EVENT_FIELDS whose value differs from a stored event's"""
+        return [key for key, value in self.as_event_fields().items() if getattr(event, key) != value]
+
+
+def build_scraped_events(records: dict[str, dict[str, Any]]) -> dict[str, ScrapedEvent]:
+    """build ScrapedEvents from scraped event information, logging and leaving out the records that are invalid
+
+    Records whose own information lacks a social_platform_id, as when a detail page could not be fully parsed, take
+    the id they are keyed by in the listing, so that they still match their stored event.
+
+    Args:
+        records (dict[str, dict]): event information keyed by social_platform_id
+
+    Returns:
+        dict[str, ScrapedEvent]: the valid events, in the order of records
+    """
+    events: dict[str, ScrapedEvent] = {}
+    for event_id, event_data in records.items():
+        try:
+            events[event_id] = ScrapedEvent.from_dict(
+                {**event_data, "social_platform_id": event_data.get("social_platform_id") or event_id}
+            )
+        except InvalidScrapedRecord as err:
+            logger.error(f"skipping scraped event: {err}; data = {event_data}")
+    if len(events) < len(records):
+        logger.warning(f"skipped {len(records) - len(events)} of {len(records)} scraped events as invalid")
+    return events
+
+
+@dataclass(slots=True)
+class ScrapedGroup:
+    """a group's details as scraped from a social platform, with the description stripped and the website canonical"""
+
+    description: str = ""
+    website: str = ""
+    # validators of the fetched page, saved by the pipeline once the details are written; see http_cache
+    cache_entry: HttpCacheEntry | None = None
+    # False for a description only used where the group has none yet, as it is a lossier rendering than the one
+    # another backend of the platform scrapes
+    replaces_description: bool = True
+
+    def __post_init__(self) -> None:
+        self.description = str(self.description or "").strip()
+        self.website = canonicalize_url(self.website)
+
+
+def compute_fingerprint(payload: Any) -> str:
+    """compute a stable hash of scraped data
+
+    Dict keys are sorted and datetimes converted to UTC, so equal data always hashes the same regardless of key
+    order or the timezone offset it was scraped with.
+
+    Args:
+        payload: json-serializable data, which may include datetimes
+
+    Returns:
+        str: sha256 hex digest
+    """
+
+    def encode(value: Any) -> str:
+        if isinstance(value, datetime):
+            return value.astimezone(dt_timezone.utc).isoformat() if timezone.is_aware(value) else value.isoformat()
+        return str(value)
+
+    serialized: str = json.dumps(payload, sort_keys=True, default=encode, separators=(",", ":"))
+    return hashlib.sha256(serialized.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class EventWriteResult:
+    """events written by an EventBatchWriter, grouped by outcome"""
+
+    created: list[Event] = field(default_factory=list)
+    updated: list[Event] = field(default_factory=list)
+    unchanged: list[Event] = field(default_factory=list)
+
+    @property
+    def events(self) -> dict[str, Event]:
+        """every written event, keyed by social_platform_id"""
+        return {event.social_platform_id: event for event in self.created + self.updated + self.unchanged}
+
+    @property
+    def counts(self) -> dict[str, int]:
+        """number of events per outcome, keyed by RESULT_OUTCOMES"""
+        return {"created": len(self.created), "updated": len(self.updated), "unchanged": len(self.unchanged)}
+
+    def __str__(self) -> str:
+        return f"{len(self.unchanged)} unchanged, {len(self.updated)} updated, {len(self.created)} created"
+
+
+# Event fields describing when and from what listing data an event was last scraped; not part of its fingerprint
+SCRAPE_STATE_FIELDS: tuple[str, ...] = ("listing_fingerprint", "last_scraped_at")
+
+# outcomes an ingestion counts its records by: events written, or a group whose details were written
+RESULT_OUTCOMES: tuple[str, ...] = ("created", "updated", "unchanged")
+
+
+class EventBatchWriter:
+    """Collect a group's scraped events and write them in a constant number of queries
+
+    Existing rows are loaded with a single query keyed on social_platform_id. Each event's fingerprint is compared
+    in memory, so unchanged events are not written at all; new rows are inserted with one bulk_create and changed
+    rows saved with one bulk_update. As bulk writes bypass post_save, callers are responsible for announcing the
+    events in EventWriteResult.created.
+    """
+
+    def __init__(self, group: TechGroup, batch_size: int = 100) -> None:
+        self.group: TechGroup = group
+        self.batch_size: int = batch_size
+        self.pending: dict[str, ScrapedEvent] = {}
+        self.scrape_state: dict[str, dict[str, Any]] = {}
+
+    def add(self, event: ScrapedEvent, scrape_state: dict[str, Any] | None = None) -> None:
+        """queue a scraped event to be written; a later event with the same social_platform_id wins
+
+        Args:
+            event (ScrapedEvent): scraped event
+            scrape_state (dict[str, Any], optional): values of SCRAPE_STATE_FIELDS to store with the event. They are
+                written even when the event data is unchanged, but never count as a change to the event.
+        """
+        self.pending[event.social_platform_id] = event
+        if scrape_state:
+            self.scrape_state[event.social_platform_id] = {
+                key: value for key, value in scrape_state.items() if key in SCRAPE_STATE_FIELDS
+            }
+
+    def write(self) -> EventWriteResult:
+        """write all queued events and clear the queue
+
+        An overlapping run for the same group (a sweep and a manual run, or a Celery retry) can insert some of the
+        events after their rows were loaded. The insert then fails on the unique social_platform_id constraint, the
+        write is rolled back, and the events are compared once more against the rows the other run wrote.
+
+        Returns:
+            EventWriteResult: created, updated and unchanged events
+        """
+        pending, scrape_states = self.pending, self.scrape_state
+        self.pending = {}
+        self.scrape_state = {}
+        if not pending:
+            return EventWriteResult()
+        try:
+            return self._write(pending, scrape_states)
+        except IntegrityError:
+            logger.info("events of %s were written by another run; comparing them again", self.group)
+            return self._write(pending, scrape_states)
+
+    def _write(self, pending: dict[str, ScrapedEvent], scrape_states: dict[str, dict[str, Any]]) -> EventWriteResult:
+        """compare events with their stored rows and write the changes in one transaction"""
+        result = EventWriteResult()
+        existing: dict[str, Event] = {
+            event.social_platform_id: event
+            for event in Event.all_objects.filter(group=self.group, social_platform_id__in=list(pending))
+        }
+        now: datetime = timezone.now()
+        changed_fields: set[str] = set()
+        backfilled: list[Event] = []
+        for social_platform_id, scraped in pending.items():
+            event: Event | None = existing.get(social_platform_id)
+            scrape_state: dict[str, Any] = scrape_states.get(social_platform_id, {})
+            fingerprint: str = scraped.fingerprint
+            if event is None:
+                result.created.append(
+                    Event(group=self.group, **scraped.as_event_fields(), fingerprint=fingerprint, **scrape_state)
+                )
+                continue
+            scrape_state_changed: bool = False
+            for key, value in scrape_state.items():
+                if getattr(event, key) != value:
+                    setattr(event, key, value)
+                    scrape_state_changed = True
+            if event.fingerprint == fingerprint:
+                if scrape_state_changed:
+                    backfilled.append(event)
+                result.unchanged.append(event)
+                continue
+            event_changed_fields: list[str] = scraped.diff(event)
+            event.fingerprint = fingerprint
+            if not event_changed_fields:
+                # rows written before fingerprints existed: store the fingerprint without touching updated_at
+                backfilled.append(event)
+                result.unchanged.append(event)
+                continue
+            for key in event_changed_fields:
+                setattr(event, key, getattr(scraped, key))
+            event.updated_at = now
+            changed_fields.update(event_changed_fields)
+            result.updated.append(event)
+
+        state_fields: list[str] = sorted({key for state in scrape_states.values() for key in state})
+        if not (result.created or result.updated or backfilled):
+            return result
+        with transaction.atomic():
+            if result.created:
+                result.created = Event.all_objects.bulk_create(result.created, batch_size=self.batch_size)
+            if result.updated:
+                Event.all_objects.bulk_update(
+                    result.updated,
+                    fields=sorted(changed_fields) + ["fingerprint", "updated_at"] + state_fields,
+                    batch_size=self.batch_size,
+                )
+            if backfilled:
+                Event.all_objects.bulk_update(
+                    backfilled, fields=["fingerprint"] + state_fields, batch_size=self.batch_size
+                )
+        return result
+
+
+def select_events_to_fetch(
+    group: TechGroup,
+    listing: dict[str, str],
+    refresh_window: timedelta,
+    max_age: timedelta,
+    now: datetime | None = None,
+) -> tuple[set[str], list[Event]]:
+    """decide which of a group's listed events need their detail page fetched, with a single query
+
+    An event is fetched when it is not in the database yet, has never been scraped, starts within `refresh_window`,
+    or its listing entry changed since its last scrape. Events whose listing entry has no fingerprint (the listing
+    carried no data for them) are fetched once they were last scraped more than `max_age` ago.
+
+    Args:
+        group (TechGroup): group the events belong to
+        listing (dict[str, str]): listing fingerprint of each listed event, keyed by social_platform_id
+        refresh_window (timedelta): events starting this soon are always fetched
+        max_age (timedelta): events without a listing fingerprint are fetched when their last scrape is this old
+        now (datetime, optional): current time. Defaults to timezone.now().
+
+    Returns:
+        tuple[set[str], list[Event]]: social_platform_ids to fetch, and the known events that can be skipped
+    """
+    now = now or timezone.now()
+    known: dict[str, Event] = {
+        event.social_platform_id: event
+        for event in Event.all_objects.filter(group=group, social_platform_id__in=list(listing))
+    }
+    to_fetch: set[str] = set()
+    skipped: list[Event] = []
+    for social_platform_id, listing_fingerprint in listing.items():
+        event: Event | None = known.get(social_platform_id)
+        if (
+            event is None
+            or event.last_scraped_at is None
+            or event.start_datetime <= now + refresh_window
+            or (listing_fingerprint and listing_fingerprint != event.listing_fingerprint)
+            or (not listing_fingerprint and event.last_scraped_at <= now - max_age)
+        ):
+            to_fetch.add(social_platform_id)
+        else:
+            skipped.append(event)
+    return to_fetch, skipped
+
+
+@dataclass
+class EventReconcileResult:
+    """changes made by reconcile_events(), counted by outcome"""
+
+    missing: int = 0
+    cancelled: int = 0
+    restored: int = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.missing or self.cancelled or self.restored)
+
+    def __str__(self) -> str:
+        return f"{self.missing} newly missing, {self.cancelled} cancelled, {self.restored} restored"
+
+
+def reconcile_events(
+    group: TechGroup, listed: set[str], horizon: datetime, grace: timedelta, now: datetime | None = None
+) -> EventReconcileResult:
+    """cancel a group's upcoming events that its listing has stopped showing, once they stay missing for `grace`
+
+    The upcoming events held for the group, up to the last listed start time, are compared with the listed
+    social_platform_ids. Events missing from the listing are marked missing when first found, and cancelled once
+    they have been missing for `grace`; listed events that were marked missing or cancelled are restored. Each
+    outcome is written with a single update. Events starting after `horizon` may simply be beyond what the listing
+    shows, and are left alone.
+
+    Args:
+        group (TechGroup): group the events belong to
+        listed (set[str]): social_platform_ids of every event the listing shows
+        horizon (datetime): start time of the last listed event
+        grace (timedelta): how long an event stays missing before it is cancelled
+        now (datetime, optional): current time. Defaults to timezone.now().
+
+    Returns:
+        EventReconcileResult: number of events marked missing, cancelled and restored
+    """
+    now = now or timezone.now()
+    events = Event.all_objects.filter(group=group).exclude(social_platform_id="")
+    result = EventReconcileResult()
+    result.restored = (
+        events.filter(social_platform_id__in=list(listed))
+        .filter(Q(missing_since__isnull=False) | Q(cancelled_at__isnull=False))
+        .update(missing_since=None, cancelled_at=None)
+    )
+    held: dict[str, datetime | None] = dict(
+        events.filter(start_datetime__gte=now, start_datetime__lte=horizon, cancelled_at__isnull=True).values_list(
+            "social_platform_id", "missing_since"
+        )
+    )
+    missing: set[str] = set(held) - listed
+    newly_missing: list[str] = [event_id for event_id in missing if held[event_id] is None]
+    overdue: list[str] = [
+        event_id
+        for event_id in missing
+        if (missing_since := held[event_id]) is not None and missing_since <= now - grace
+    ]
+    if newly_missing:
+        result.missing = events.filter(social_platform_id__in=newly_missing).update(missing_since=now)
+    if overdue:
+        result.cancelled = events.filter(social_platform_id__in=overdue).update(cancelled_at=now)
+    return result
+
+
+def update_group_description(group: TechGroup, description: str) -> bool:
+    """save a scraped description on a group unless its fingerprint matches the stored one
+
+    Args:
+        group (TechGroup): group to update
+        description (str): scraped description
+
+    Returns:
+        bool: True if the group was written
+    """
+    fingerprint: str = compute_fingerprint(description)
+    if group.description_fingerprint == fingerprint:
+        return False
+    if group.description == description:
+        # rows written before fingerprints existed: store the fingerprint without touching updated_at
+        group.description_fingerprint = fingerprint
+        group.save(update_fields=["description_fingerprint"])
+        return False
+    group.description = description
+    group.description_fingerprint = fingerprint
+    group.save(update_fields=["description", "description_fingerprint", "updated_at"])
+    return True
@@ -5,6 +5,7 @@ from typing import Any
 import requests
 from django.utils import timezone
 from web.models import Event
+from web.utilities import http_client
 from web.utilities.ai.gemini import generate_post_content
 from web.utilities.ai.prompts import (
     create_event_reminder_prompt,
@@ -33,7 +34,7 @@ class DiscordNotifier:
         """
 
         headers: dict[str, str] = {"Content-Type": "application/json"}
-        response: requests.Response = requests.post(
+        response: requests.Response = http_client.post(
             url or self.webhook_url, data=json.dumps(payload), headers=headers, timeout=15
         )
         response.raise_for_status()
@@ -9,6 +9,7 @@ from bs4 import BeautifulSoup
 from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
+from web.utilities import http_client
 from web.utilities.ai.gemini import generate_post_content
 from web.utilities.ai.prompts import (
     create_event_reminder_prompt,
@@ -99,7 +100,7 @@ class LinkedInOrganizationClient:
         if not self.client_id or not self.client_secret:
             raise ValueError("LinkedIn client ID and client secret are required to exchange an authorization code.")
 
-        response = requests.post(
+        response = http_client.post(
             self.access_token_url,
             data={
                 "grant_type": "authorization_code",
@@ -119,7 +120,7 @@ class LinkedInOrganizationClient:
         return token_data
 
     def _request_token_refresh(self, refresh_token: Optional[str]) -> dict[str, Any]:
-        response = requests.post(
+        response = http_client.post(
             self.access_token_url,
             data={
                 "grant_type": "refresh_token",
@@ -236,7 +237,7 @@ class LinkedInOrganizationClient:
             }
 
         payload_json: str = json.dumps(payload)
-        response = requests.post(self.post_url, headers=self.headers, data=payload_json, timeout=15)
+        response = http_client.post(self.post_url, headers=self.headers, data=payload_json, timeout=15)
 
         try:
             response.raise_for_status()
@@ -247,7 +248,7 @@ class LinkedInOrganizationClient:
 
         logger.info("LinkedIn post received %s; refreshing access token and retrying once.", response.status_code)
         self.refresh_access_token()
-        retry_response = requests.post(self.post_url, headers=self.headers, data=payload_json, timeout=15)
+        retry_response = http_client.post(self.post_url, headers=self.headers, data=payload_json, timeout=15)
         retry_response.raise_for_status()
         return retry_response
 
@@ -0,0 +1,479 @@
+import asyncio
+import contextvars
+import logging
+import queue
+import threading
+import time
+import traceback
+from collections import defaultdict
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Iterable
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+from web.models import Event, HttpCacheEntry, Link, PageSnapshot, TechGroup
+from web.utilities.http_cache import (
+    forget_cached_response,
+    get_cache_entry,
+    save_cache_entry,
+)
+from web.utilities.ingestion import (
+    RESULT_OUTCOMES,
+    EventBatchWriter,
+    EventReconcileResult,
+    EventWriteResult,
+    ScrapedEvent,
+    ScrapedGroup,
+    build_scraped_events,
+    reconcile_events,
+    select_events_to_fetch,
+    to_aware_datetime,
+    update_group_description,
+)
+from web.utilities.scrapers.registry import EventListing, PlatformScraper, get_scraper
+from web.utilities.snapshots import (
+    Snapshot,
+    collect_snapshots,
+    get_snapshot_dir,
+    parse_snapshot_file,
+    record_snapshots,
+)
+from web.utilities.tag_utils import add_tags
+from web.utilities.telemetry import FetchTelemetry, collect_fetch_telemetry
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class GroupIngestion:
+    """one group's pass through an ingestion pipeline: its scraper, what each stage produced, and the outcome
+
+    A stage that settles the outcome early sets `message`; a stage that raises sets `exception`. Either way the
+    group's remaining stages are skipped.
+    """
+
+    group: TechGroup
+    # groups on a platform without a registered scraper keep the base class, and are finished before any stage runs
+    scraper: PlatformScraper = field(default_factory=PlatformScraper)
+    url: str = ""
+    started_at: datetime = field(default_factory=timezone.now)
+    finished_at: datetime | None = None
+    duration: float = 0.0  # seconds spent in this group's own stages, excluding waits for other groups
+    # seconds per stage, and queued for the database
+    stage_durations: dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    telemetry: FetchTelemetry = field(default_factory=FetchTelemetry)
+    snapshots: list[Snapshot] = field(default_factory=list)
+    message: str = ""
+    exception: Exception | None = None
+    error: str = ""
+    cache_entry: HttpCacheEntry | None = None
+    details: ScrapedGroup | None = None
+    listing: EventListing = field(default_factory=EventListing)
+    to_fetch: list[str] = field(default_factory=list)
+    skipped: list[Event] = field(default_factory=list)
+    records: dict[str, ScrapedEvent] = field(default_factory=dict)
+    result: EventWriteResult | None = None
+    reconciliation: EventReconcileResult | None = None
+    # records written per outcome of RESULT_OUTCOMES: the group itself for details, its events for events
+    counts: dict[str, int] = field(default_factory=lambda: dict.fromkeys(RESULT_OUTCOMES, 0))
+
+    @property
+    def succeeded(self) -> bool:
+        return self.exception is None
+
+    @property
+    def finished(self) -> bool:
+        return bool(self.message) or self.exception is not None
+
+    @property
+    def platform(self) -> str:
+        """platform key of settings.INGESTION_SWEEP_CONCURRENCY"""
+        return self.scraper.platform_name.lower()
+
+
+def prepare_ingestions(groups: Iterable[TechGroup]) -> list[GroupIngestion]:
+    """look up each group's scraper and platform page
+
+    Args:
+        groups (Iterable[TechGroup]): groups to ingest; select_related("platform") saves a query per group
+
+    Returns:
+        list[GroupIngestion]: one per group; groups without a scraper or a platform page are already finished
+    """
+    ingestions: list[GroupIngestion] = []
+    for group in groups:
+        platform_name: str = group.platform.name if group.platform else ""
+        ingestion = GroupIngestion(group=group)
+        try:
+            ingestion.scraper = get_scraper(platform_name)
+        except LookupError:
+            ingestion.message = f"no scraper registered for {platform_name or 'the platform'} of {group.name}"
+            ingestions.append(ingestion)
+            continue
+        link: Link | None = group.links.filter(name=f"{group.name} {platform_name} page").first()
+        if link is None:
+            ingestion.message = f"no {platform_name} links found for {group.name}"
+        else:
+            ingestion.url = link.url
+            ingestion.scraper = ingestion.scraper.for_group(link.url)
+        ingestions.append(ingestion)
+    return ingestions
+
+
+def load_group_cache_entry(ingestion: GroupIngestion) -> None:
+    """load the stored validators of the group's page, so that it is fetched without touching the database"""
+    ingestion.cache_entry = get_cache_entry(ingestion.url)
+
+
+async def fetch_group_details(ingestion: GroupIngestion) -> None:
+    ingestion.details = await ingestion.scraper.fetch_group(ingestion.url, ingestion.cache_entry)
+
+
+def write_group_details(ingestion: GroupIngestion) -> None:
+    group: TechGroup = ingestion.group
+    if ingestion.details is None:
+        ingestion.counts["unchanged"] = 1
+        ingestion.message = f"no updates needed for {group.name}"
+        return
+    description: str = ingestion.details.description
+    website: str = ingestion.details.website
+    if not description and not website:
+        # retry the parse on the next run rather than skipping the page as unchanged
+        forget_cached_response(ingestion.url)
+        ingestion.message = f"no details found for {group.name}"
+        return
+    if not ingestion.details.replaces_description and group.description:
+        description = ""
+    updated: bool = bool(description) and update_group_description(group, description)
+    if website and not group.links.filter(url=website).exists():
+        group.links.add(Link.objects.create(url=website, name="website"))
+        updated = True
+    if ingestion.details.cache_entry:
+        save_cache_entry(ingestion.details.cache_entry)
+    ingestion.counts["updated" if updated else "unchanged"] = 1
+    if updated:
+        ingestion.message = f"updated details for {group.name}"
+    else:
+        ingestion.message = f"no updates needed for {group.name}"
+
+
+async def list_group_events(ingestion: GroupIngestion) -> None:
+    ingestion.listing = await ingestion.scraper.list_events(ingestion.url)
+
+
+def select_group_events(ingestion: GroupIngestion) -> None:
+    """pick the listed events to fetch; incremental scrapers skip known events whose listing entry is unchanged"""
+    event_ids: list[str] = list(ingestion.listing.records)
+    scraper: PlatformScraper = ingestion.scraper
+    if not scraper.incremental:
+        ingestion.to_fetch = event_ids
+        return
+    to_fetch, ingestion.skipped = select_events_to_fetch(
+        ingestion.group,
+        {event_id: ingestion.listing.fingerprints.get(event_id, "") for event_id in event_ids},
+        scraper.refresh_window,
+        scraper.max_age,
+    )
+    ingestion.to_fetch = [event_id for event_id in event_ids if event_id in to_fetch]
+
+
+def reconcile_group_events(ingestion: GroupIngestion) -> None:
+    """mark the group's known upcoming events that the listing no longer shows, cancelling those that stay missing
+
+    See reconcile_events(). The listing's start times bound the events compared; a listing without any leaves the
+    group's events alone, as it may come from a page that failed to load.
+    """
+    starts: list[datetime] = [
+        start
+        for record in ingestion.listing.records.values()
+        if (start := to_aware_datetime(record.get("start_datetime")))
+    ]
+    if not starts:
+        return
+    ingestion.reconciliation = reconcile_events(
+        ingestion.group,
+        set(ingestion.listing.records),
+        max(starts),
+        timedelta(hours=getattr(settings, "EVENT_CANCELLATION_GRACE_HOURS", 24)),
+    )
+
+
+async def fetch_group_events(ingestion: GroupIngestion) -> None:
+    ingestion.records = await ingestion.scraper.fetch_events(ingestion.listing, ingestion.to_fetch)
+
+
+def write_group_events(ingestion: GroupIngestion) -> None:
+    group: TechGroup = ingestion.group
+    writer = EventBatchWriter(group)
+    event_tags: dict[str, list[str]] = {}
+    scraped_at: datetime = timezone.now()
+    for event_id, event in ingestion.records.items():
+        scrape_state: dict | None = None
+        if ingestion.scraper.incremental:
+            scrape_state = {
+                "listing_fingerprint": ingestion.listing.fingerprints.get(event_id, ""),
+                "last_scraped_at": scraped_at,
+            }
+        writer.add(event, scrape_state=scrape_state)
+        if event.tags:
+            event_tags[event.social_platform_id] = event.tags
+    result: EventWriteResult = writer.write()
+    result.unchanged.extend(ingestion.skipped)
+    if event_tags:
+        add_tags(
+            Event.tags,
+            {event.pk: event_tags[event_id] for event_id, event in result.events.items() if event_id in event_tags},
+        )
+    ingestion.result = result
+    ingestion.counts = result.counts
+    ingestion.message = (
+        f"found {len(ingestion.listing.records)} upcoming events for {group.name}; "
+        f"skipped {len(ingestion.skipped)} known events; added {len(result.created)} new events; {result}; "
+        f"fetched {ingestion.telemetry.pages} pages ({ingestion.telemetry.tiers['playwright']} in Chromium), "
+        f"{ingestion.telemetry.bytes_downloaded} bytes"
+    )
+    if ingestion.reconciliation:
+        ingestion.message += f"; events missing from the listing: {ingestion.reconciliation}"
+
+
+# the stages of each pipeline, in order. Coroutine stages do the network work and run concurrently across groups;
+# plain stages do the database work and run one group at a time in the calling thread. Each group moves on to its
+# next stage as soon as it is done with the previous one, so one group's fetches overlap another's writes.
+PIPELINES: dict[str, tuple[Callable[[GroupIngestion], Awaitable[None] | None], ...]] = {
+    "details": (load_group_cache_entry, fetch_group_details, write_group_details),
+    "events": (list_group_events, select_group_events, reconcile_group_events, fetch_group_events, write_group_events),
+}
+
+
+def fail_ingestion(ingestion: GroupIngestion, stage: Callable, err: Exception) -> None:
+    logger.exception(f"{stage.__name__} failed for {ingestion.group.name}")
+    ingestion.exception = err
+    ingestion.error = traceback.format_exc()
+    ingestion.message = f"{type(err).__name__}: {err}"
+
+
+def run_stage(ingestion: GroupIngestion, stage: Callable[[GroupIngestion], None]) -> None:
+    """run a database stage for one group, collecting its fetch telemetry and recording a failure"""
+    if ingestion.finished:
+        return
+    start: float = time.perf_counter()
+    with collect_fetch_telemetry(ingestion.telemetry), collect_snapshots(ingestion.snapshots):
+        try:
+            stage(ingestion)
+        except Exception as err:
+            fail_ingestion(ingestion, stage, err)
+    elapsed: float = time.perf_counter() - start
+    ingestion.duration += elapsed
+    ingestion.stage_durations[stage.__name__] += elapsed
+    ingestion.finished_at = timezone.now()
+
+
+async def run_async_stage(ingestion: GroupIngestion, stage: Callable[[GroupIngestion], Awaitable[None]]) -> None:
+    """run a network stage for one group, collecting its fetch telemetry and recording a failure"""
+    start: float = time.perf_counter()
+    with collect_fetch_telemetry(ingestion.telemetry), collect_snapshots(ingestion.snapshots):
+        try:
+            await stage(ingestion)
+        except Exception as err:
+            fail_ingestion(ingestion, stage, err)
+    elapsed: float = time.perf_counter() - start
+    ingestion.duration += elapsed
+    ingestion.stage_durations[stage.__name__] += elapsed
+    ingestion.finished_at = timezone.now()
+
+
+# a group waiting for a database stage: the stage, the future to resolve once it has run, and when it was queued.
+# None ends the queue.
+DatabaseWork = tuple[GroupIngestion, Callable[[GroupIngestion], None], asyncio.Future, float] | None
+
+
+async def stream_groups(
+    ingestions: list[GroupIngestion],
+    stages: tuple[Callable, ...],
+    concurrency: dict[str, int],
+    database_queue: queue.Queue[DatabaseWork],
+) -> None:
+    """move every group through the stages on its own, running network stages here and queueing database stages
+
+    At most concurrency[platform] groups of a platform are in a network stage at once. Putting a group on the
+    bounded database queue waits while the queue is full, so the network stages pause when writes fall behind.
+    """
+    semaphores: dict[str, asyncio.Semaphore] = {}
+
+    async def run(ingestion: GroupIngestion) -> None:
+        for stage in stages:
+            if ingestion.finished:
+                return
+            if asyncio.iscoroutinefunction(stage):
+                semaphore: asyncio.Semaphore = semaphores.setdefault(
+                    ingestion.platform, asyncio.Semaphore(max(1, concurrency.get(ingestion.platform, 4)))
+                )
+                async with semaphore:
+                    await run_async_stage(ingestion, stage)
+            else:
+                done: asyncio.Future = asyncio.get_running_loop().create_future()
+                await asyncio.to_thread(database_queue.put, (ingestion, stage, done, time.perf_counter()))
+                await done
+
+    try:
+        await asyncio.gather(*(run(ingestion) for ingestion in ingestions))
+    finally:
+        await asyncio.to_thread(database_queue.put, None)
+
+
+def run_pipeline(
+    pipeline: str, groups: Iterable[TechGroup], concurrency: dict[str, int] | None = None
+) -> list[GroupIngestion]:
+    """ingest the details ("details") or upcoming events ("events") of groups on any registered platform
+
+    Groups stream through the stages independently: network stages run in an event loop on a helper thread, which
+    scrapes many groups at once, and hands each group over a bounded queue to the calling thread for its database
+    stages. One group's pages are thus fetched while another's events are written. A group whose stage fails skips
+    its remaining stages without affecting the other groups. The pages fetched for each group are recorded as its
+    PageSnapshots.
+
+    Args:
+        pipeline (str): key of PIPELINES
+        groups (Iterable[TechGroup]): groups to ingest
+        concurrency (dict[str, int], optional): max groups per platform in a network stage at once.
+            Defaults to settings.INGESTION_SWEEP_CONCURRENCY.
+
+    Returns:
+        list[GroupIngestion]: outcome of each group, in the order of groups
+    """
+    if concurrency is None:
+        concurrency = getattr(settings, "INGESTION_SWEEP_CONCURRENCY", {})
+    ingestions: list[GroupIngestion] = prepare_ingestions(groups)
+    database_queue: queue.Queue[DatabaseWork] = queue.Queue(maxsize=getattr(settings, "INGESTION_QUEUE_SIZE", 8))
+    # the network thread runs in a copy of the caller's context, so that a replay_session around the call applies
+    network_thread = threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(asyncio.run, stream_groups(ingestions, PIPELINES[pipeline], concurrency, database_queue)),
+        name="ingestion-network",
+    )
+    network_thread.start()
+    try:
+        while (work := database_queue.get()) is not None:
+            ingestion, stage, done, queued_at = work
+            ingestion.stage_durations["queued"] += time.perf_counter() - queued_at
+            run_stage(ingestion, stage)
+            done.get_loop().call_soon_threadsafe(done.set_result, None)
+    finally:
+        network_thread.join()
+    for ingestion in ingestions:
+        if ingestion.snapshots:
+            record_snapshots(ingestion.group, ingestion.snapshots)
+    return ingestions
+
+
+def get_reparse_snapshots(ingestion: GroupIngestion) -> list[PageSnapshot]:
+    """get the snapshots a group's events are rebuilt from: its latest listing, then its event details, oldest first
+
+    Details stored more than once are parsed once, at their latest fetch. Returns an empty list if the group has no
+    listing snapshot.
+    """
+    scraper: PlatformScraper = ingestion.scraper
+    snapshots = PageSnapshot.objects.filter(group=ingestion.group)
+    listing: PageSnapshot | None = (
+        snapshots.filter(kind=scraper.listing_snapshot_kind).order_by("-fetched_at", "-pk").first()
+    )
+    if listing is None:
+        return []
+    details: dict[tuple[str, str], PageSnapshot] = {}
+    for snapshot in snapshots.filter(kind=scraper.detail_snapshot_kind).order_by("fetched_at", "pk"):
+        details.pop((snapshot.url, snapshot.content_hash), None)
+        details[(snapshot.url, snapshot.content_hash)] = snapshot
+    return [listing, *details.values()]
+
+
+def merge_reparsed_events(
+    scraper: PlatformScraper, listing: EventListing, details: list[EventListing]
+) -> dict[str, dict]:
+    """complete a reparsed listing's records with the reparsed details, later details winning
+
+    Listed events that need details but have none stored are left out, as fetch_events() leaves out events whose
+    details could not be fetched.
+
+    Returns:
+        dict[str, dict]: event information keyed by social_platform_id, in listing order
+    """
+    detail_records: dict[str, dict] = {}
+    for detail in details:
+        detail_records.update(detail.records)
+    records: dict[str, dict] = {}
+    for event_id, record in listing.records.items():
+        if event_id in detail_records:
+            values: dict = {key: value for key, value in detail_records[event_id].items() if value not in (None, "")}
+            records[event_id] = {**record, **values}
+        elif not scraper.needs_details(record):
+            records[event_id] = record
+    return records
+
+
+def reparse_snapshots(groups: Iterable[TechGroup], workers: int = 1) -> list[GroupIngestion]:
+    """rebuild the upcoming events of groups from their stored snapshots, without fetching anything
+
+    Each group's latest listing snapshot and event detail snapshots are parsed again with its scraper's current
+    parsers, in `workers` processes, and the events written by write_group_events() as an events ingestion would.
+
+    Args:
+        groups (Iterable[TechGroup]): groups to reparse
+        workers (int, optional): parser processes; 1 parses in a thread of this process. Defaults to 1.
+
+    Returns:
+        list[GroupIngestion]: outcome of each group, in the order of groups
+    """
+    ingestions: list[GroupIngestion] = prepare_ingestions(groups)
+    directory: str = str(get_snapshot_dir() or "")
+    pending: list[tuple[GroupIngestion, list[PageSnapshot]]] = []
+    for ingestion in ingestions:
+        if ingestion.finished:
+            continue
+        if not ingestion.scraper.listing_snapshot_kind:
+            ingestion.message = f"{ingestion.scraper.platform_name} snapshots cannot be reparsed"
+            continue
+        snapshots: list[PageSnapshot] = get_reparse_snapshots(ingestion)
+        if not snapshots:
+            ingestion.message = f"no snapshots stored for {ingestion.group.name}"
+            continue
+        pending.append((ingestion, snapshots))
+    executor: Executor = ThreadPoolExecutor(max_workers=1)
+    if workers > 1:
+        # forked workers must not share this process's database connections
+        connections.close_all()
+        executor = ProcessPoolExecutor(max_workers=workers)
+    with executor:
+        futures: list[tuple[GroupIngestion, list[Future]]] = [
+            (
+                ingestion,
+                [
+                    executor.submit(
+                        parse_snapshot_file,
+                        ingestion.scraper.platform_name,
+                        snapshot.kind,
+                        snapshot.url,
+                        snapshot.content_hash,
+                        snapshot.compression,
+                        directory,
+                    )
+                    for snapshot in snapshots
+                ],
+            )
+            for ingestion, snapshots in pending
+        ]
+        for ingestion, parsed in futures:
+            start: float = time.perf_counter()
+            try:
+                ingestion.listing, *details = [future.result() for future in parsed]
+            except Exception as err:
+                fail_ingestion(ingestion, parse_snapshot_file, err)
+                continue
+            ingestion.records = build_scraped_events(
+                merge_reparsed_events(ingestion.scraper, ingestion.listing, details)
+            )
+            ingestion.duration += time.perf_counter() - start
+            run_stage(ingestion, write_group_events)
+    return ingestions
@@ -0,0 +1,210 @@
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from typing import Any
+from urllib.parse import urlparse
+
+import redis
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "web:ratelimit"
+
+# refill the bucket for the time elapsed since its last use, then take a token or report how long until one is free.
+# Redis' own clock is used so every worker agrees on "now". Floats are returned as strings; Lua numbers become ints.
+ACQUIRE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local blocked_until = tonumber(redis.call('GET', KEYS[2]) or '0')
+if blocked_until > now then
+    return tostring(blocked_until - now)
+end
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'timestamp')
+local tokens = tonumber(state[1]) or burst
+local timestamp = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - timestamp) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'timestamp', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 60)
+return tostring(wait)
+"""
+
+# push the shared "blocked until" time forward; never pull it back
+PENALIZE_SCRIPT = """
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) + tonumber(now_parts[2]) / 1000000
+local delay = tonumber(ARGV[1])
+local blocked_until = tonumber(redis.call('GET', KEYS[1]) or '0')
+if now + delay > blocked_until then
+    redis.call('SET', KEYS[1], tostring(now + delay), 'EX', math.ceil(delay) + 1)
+end
+return 1
+"""
+
+
+class LocalTokenBucket:
+    """in-process token bucket, used when no Redis url is configured or Redis is unreachable"""
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate: float = rate
+        self.burst: int = burst
+        self.tokens: float = burst
+        self.timestamp: float = time.monotonic()
+        self.blocked_until: float = 0.0
+        self.lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        with self.lock:
+            now: float = time.monotonic()
+            if self.blocked_until > now:
+                return self.blocked_until - now
+            self.tokens = min(self.burst, self.tokens + (now - self.timestamp) * self.rate)
+            self.timestamp = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def penalize(self, delay: float) -> None:
+        with self.lock:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + delay)
+
+
+class RateLimiter:
+    """token bucket shared by every worker through Redis, with per-platform budgets from settings.RATE_LIMITS
+
+    A 429 seen by any worker is recorded with `penalize`, which blocks the bucket for every worker until the
+    server's Retry-After has passed.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, client: redis.Redis | None = None) -> None:
+        self.name: str = name
+        self.rate: float = rate
+        self.burst: int = burst
+        self.client: redis.Redis | None = client
+        self.bucket_key: str = f"{KEY_PREFIX}:{name}:bucket"
+        self.blocked_key: str = f"{KEY_PREFIX}:{name}:blocked_until"
+        self.local_bucket = LocalTokenBucket(rate, burst)
+        if client is not None:
+            self.acquire_script = client.register_script(ACQUIRE_SCRIPT)
+            self.penalize_script = client.register_script(PENALIZE_SCRIPT)
+
+    def try_acquire(self) -> float:
+        """take a token if one is free
+
+        Returns:
+            float: 0 when a token was taken, otherwise the seconds to wait before trying again
+        """
+        if self.client is not None:
+            try:
+                return float(
+                    self.acquire_script(keys=[self.bucket_key, self.blocked_key], args=[self.rate, self.burst])
+                )
+            except redis.RedisError as e:
+                logger.warning("rate limiter %s: redis unavailable, limiting this process only: %s", self.name, e)
+        return self.local_bucket.try_acquire()
+
+    def acquire(self, timeout: float | None = None) -> float:
+        """block until a token is free
+
+        Args:
+            timeout (float, optional): give up after this many seconds. Defaults to None (wait as long as needed).
+
+        Raises:
+            TimeoutError: if no token became free within `timeout`
+
+        Returns:
+            float: seconds spent waiting
+        """
+        start: float = time.monotonic()
+        while wait := self.try_acquire():
+            waited: float = time.monotonic() - start
+            if timeout is not None and waited + wait > timeout:
+                raise TimeoutError(f"rate limiter {self.name}: no token within {timeout}s")
+            time.sleep(wait)
+        return time.monotonic() - start
+
+    async def acquire_async(self) -> float:
+        """asyncio version of `acquire`, which yields to the event loop while waiting"""
+        start: float = time.monotonic()
+        while wait := await asyncio.to_thread(self.try_acquire):
+            await asyncio.sleep(wait)
+        return time.monotonic() - start
+
+    def penalize(self, delay: float) -> None:
+        """block this bucket for every worker for `delay` seconds, e.g. after a 429 with a Retry-After header"""
+        logger.warning("rate limiter %s: backing off for %.1fs", self.name, delay)
+        if self.client is not None:
+            try:
+                self.penalize_script(keys=[self.blocked_key], args=[delay])
+                return
+            except redis.RedisError as e:
+                logger.warning("rate limiter %s: redis unavailable, backing off this process only: %s", self.name, e)
+        self.local_bucket.penalize(delay)
+
+    async def penalize_async(self, delay: float) -> None:
+        """asyncio version of `penalize`, which keeps the Redis call off the event loop"""
+        await asyncio.to_thread(self.penalize, delay)
+
+
+_lock = threading.Lock()
+_limiters: dict[tuple[int, str], RateLimiter] = {}
+
+
+def get_redis_client() -> redis.Redis | None:
+    """get a Redis client for settings.RATE_LIMIT_REDIS_URL, or None to limit per process
+
+    The client gives up after settings.RATE_LIMIT_REDIS_TIMEOUT seconds, so an unreachable Redis makes limiters fall
+    back to their local bucket instead of blocking every fetch.
+    """
+    redis_url: str | None = getattr(settings, "RATE_LIMIT_REDIS_URL", None)
+    if not redis_url:
+        return None
+    timeout: float = getattr(settings, "RATE_LIMIT_REDIS_TIMEOUT", 1.5)
+    options: dict[str, Any] = {"socket_timeout": timeout, "socket_connect_timeout": timeout}
+    if redis_url.startswith("rediss://"):
+        options["ssl_cert_reqs"] = None
+    return redis.Redis.from_url(redis_url, **options)
+
+
+def get_rate_limiter(name: str) -> RateLimiter | None:
+    """get the rate limiter for a platform, or None if settings.RATE_LIMITS has no budget for it
+
+    Limiters are created once per process, so Celery prefork children open their own Redis connections.
+    """
+    budget: tuple[float, int] | None = getattr(settings, "RATE_LIMITS", {}).get(name)
+    if not budget:
+        return None
+    key: tuple[int, str] = (os.getpid(), name)
+    with _lock:
+        if key not in _limiters:
+            rate, burst = budget
+            _limiters[key] = RateLimiter(name, rate, burst, client=get_redis_client())
+        return _limiters[key]
+
+
+def get_rate_limiter_for_url(url: str) -> RateLimiter | None:
+    """get the rate limiter for the platform serving `url`, per settings.RATE_LIMIT_HOSTS"""
+    host: str = urlparse(url).hostname or ""
+    name: str | None = getattr(settings, "RATE_LIMIT_HOSTS", {}).get(host)
+    return get_rate_limiter(name) if name else None
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """parse a Retry-After header given in seconds; http-date values are not used by the APIs we call"""
+    try:
+        delay = float(value) if value else None
+    except ValueError:
+        return None
+    return delay if delay is not None and math.isfinite(delay) and delay >= 0 else None
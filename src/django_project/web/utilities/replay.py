@@ -0,0 +1,236 @@
+"""record/replay of scraper traffic, so scrapers and ingestion tasks can run offline and deterministically
+
+In record mode, responses fetched through web.utilities.http_client are stored as json files, and pages loaded with
+Playwright are stored as HAR archives. In replay mode they are served back from those files and nothing reaches the
+network; a request that was never recorded raises ReplayMissError. Replay can add a fixed latency to every request
+and answer every Nth request with a 429, to exercise the rate limiting and retry paths.
+
+The mode is taken from settings.SCRAPER_REPLAY_MODE and settings.SCRAPER_REPLAY_DIR, or set for a block of code:
+
+    with replay_session("fixtures/ingestion", mode="replay", latency=0.2, throttle_every=5):
+        ingest_group_events(group.pk)
+"""
+
+import asyncio
+import base64
+import contextvars
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+import requests
+from django.conf import settings
+
+MODES: tuple[str, ...] = ("off", "record", "replay")
+
+# query parameters derived from the current time; left out of recording keys so a recording replays on any day
+VOLATILE_QUERY_PARAMS: frozenset[str] = frozenset({"start_date.range_start", "start_date.range_end"})
+
+
+class ReplayMissError(LookupError):
+    """raised in replay mode for a request that was not recorded"""
+
+
+@dataclass
+class ReplayConfig:
+    """where recordings live, whether to record or replay them, and what faults to inject while replaying"""
+
+    mode: str = "off"
+    directory: Path | None = None
+    latency: float = 0.0  # seconds added to every replayed request
+    throttle_every: int = 0  # answer every Nth replayed request with a 429; 0 disables
+    retry_after: int = 1  # Retry-After of injected 429s
+    requests_served: int = 0
+
+    @property
+    def active(self) -> bool:
+        return self.mode in ("record", "replay") and self.directory is not None
+
+    def should_throttle(self) -> bool:
+        """count a replayed request and report whether it should be answered with an injected 429"""
+        with _lock:
+            self.requests_served += 1
+            return bool(self.throttle_every) and self.requests_served % self.throttle_every == 0
+
+
+_lock = threading.Lock()
+# the configuration of the innermost replay_session; a context variable, so that a session covers the threads and
+# asyncio tasks that copy its context (see registry.run_blocking) and nothing else running in the process
+_override: contextvars.ContextVar[ReplayConfig | None] = contextvars.ContextVar("replay_override", default=None)
+
+
+def get_replay_config() -> ReplayConfig:
+    """get the active replay configuration: the innermost replay_session, otherwise settings"""
+    override: ReplayConfig | None = _override.get()
+    if override is not None:
+        return override
+    directory: str = getattr(settings, "SCRAPER_REPLAY_DIR", "")
+    return ReplayConfig(
+        mode=getattr(settings, "SCRAPER_REPLAY_MODE", "off"), directory=Path(directory) if directory else None
+    )
+
+
+@contextmanager
+def replay_session(
+    directory: str | Path, mode: str = "replay", latency: float = 0.0, throttle_every: int = 0, retry_after: int = 1
+) -> Iterator[ReplayConfig]:
+    """record or replay all scraper traffic inside the block
+
+    Args:
+        directory (str | Path): directory holding the recordings
+        mode (str, optional): "record" or "replay". Defaults to "replay".
+        latency (float, optional): seconds added to every replayed request. Defaults to 0.
+        throttle_every (int, optional): answer every Nth replayed request with a 429. Defaults to 0 (never).
+        retry_after (int, optional): Retry-After header of injected 429s. Defaults to 1.
+
+    Yields:
+        ReplayConfig: the active configuration; `requests_served` counts replayed requests
+    """
+    if mode not in MODES:
+        raise ValueError(f"unknown replay mode {mode!r}; expected one of {', '.join(MODES)}")
+    config = ReplayConfig(
+        mode=mode, directory=Path(directory), latency=latency, throttle_every=throttle_every, retry_after=retry_after
+    )
+    token: contextvars.Token = _override.set(config)
+    try:
+        yield config
+    finally:
+        _override.reset(token)
+
+
+def normalize_url(url: str) -> str:
+    """sort query parameters and drop volatile ones, so equivalent urls share a recording"""
+    parsed = urlparse(url)
+    params: list[tuple[str, str]] = [
+        param for param in parse_qsl(parsed.query, keep_blank_values=True) if param[0] not in VOLATILE_QUERY_PARAMS
+    ]
+    return urlunparse(parsed._replace(query=urlencode(sorted(params))))
+
+
+def get_recording_key(method: str, url: str, body: bytes | str | None = None) -> str:
+    """get the file name stem of a recording; request bodies are part of the key so distinct POSTs do not collide"""
+    digest = hashlib.sha256(f"{method.upper()} {normalize_url(url)}".encode())
+    if body:
+        digest.update(body if isinstance(body, bytes) else body.encode())
+    return digest.hexdigest()[:32]
+
+
+def get_request_body(kwargs: dict[str, Any]) -> bytes | str | None:
+    """get the body a requests call would send, for use in the recording key"""
+    if kwargs.get("json") is not None:
+        return json.dumps(kwargs["json"], sort_keys=True)
+    data: Any = kwargs.get("data")
+    if isinstance(data, dict):
+        return urlencode(sorted(data.items()))
+    return data
+
+
+def get_http_path(config: ReplayConfig, method: str, url: str, body: bytes | str | None = None) -> Path:
+    assert config.directory is not None, "recordings need an active replay configuration"
+    return config.directory / "http" / f"{get_recording_key(method, url, body)}.json"
+
+
+def get_har_path(config: ReplayConfig, url: str) -> Path:
+    assert config.directory is not None, "recordings need an active replay configuration"
+    return config.directory / "har" / f"{get_recording_key('GET', url)}.har"
+
+
+def build_throttled_response(config: ReplayConfig, url: str) -> requests.Response:
+    response = requests.Response()
+    response.status_code = 429
+    response.url = url
+    response.headers["Retry-After"] = str(config.retry_after)
+    response._content = b""
+    return response
+
+
+def save_response(config: ReplayConfig, method: str, url: str, body: Any, response: requests.Response) -> None:
+    """store a response fetched in record mode"""
+    path: Path = get_http_path(config, method, url, body)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    recording: dict[str, Any] = {
+        "method": method.upper(),
+        "url": url,
+        "status": response.status_code,
+        "headers": dict(response.headers),
+        "body": base64.b64encode(response.content).decode(),
+    }
+    path.write_text(json.dumps(recording, indent=2, sort_keys=True), encoding="utf-8")
+
+
+def load_response(config: ReplayConfig, method: str, url: str, body: Any) -> requests.Response:
+    """build the recorded response for a request in replay mode
+
+    Raises:
+        ReplayMissError: if the request was not recorded
+    """
+    path: Path = get_http_path(config, method, url, body)
+    if not path.exists():
+        raise ReplayMissError(f"no recording of {method.upper()} {url} in {config.directory}")
+    if config.latency:
+        time.sleep(config.latency)
+    if config.should_throttle():
+        return build_throttled_response(config, url)
+    recording: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    response = requests.Response()
+    response.status_code = recording["status"]
+    response.url = recording["url"]
+    response.headers.update(recording["headers"])
+    response.headers.pop("Content-Encoding", None)  # the stored body is already decoded
+    response._content = base64.b64decode(recording["body"])
+    response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+    return response
+
+
+def prepare_page(page: Any, url: str) -> None:
+    """record the page's traffic to a HAR archive, or serve it from one; call before any other page.route
+
+    Other route handlers must use route.fallback() rather than route.continue_() so requests reach the archive.
+
+    Raises:
+        ReplayMissError: if the page was not recorded
+    """
+    config: ReplayConfig = get_replay_config()
+    if not config.active:
+        return
+    har_path: Path = get_har_path(config, url)
+    if config.mode == "record":
+        har_path.parent.mkdir(parents=True, exist_ok=True)
+        page.route_from_har(har_path, update=True, update_content="embed")
+        return
+    if not har_path.exists():
+        raise ReplayMissError(f"no recording of {url} in {config.directory}")
+    page.route_from_har(har_path, not_found="abort")
+    if config.latency:
+        time.sleep(config.latency)
+    if config.should_throttle():
+        page.route(url, lambda route: route.fulfill(status=429, headers={"Retry-After": str(config.retry_after)}))
+
+
+async def prepare_page_async(page: Any, url: str) -> None:
+    """asyncio version of `prepare_page`"""
+    config: ReplayConfig = get_replay_config()
+    if not config.active:
+        return
+    har_path: Path = get_har_path(config, url)
+    if config.mode == "record":
+        har_path.parent.mkdir(parents=True, exist_ok=True)
+        await page.route_from_har(har_path, update=True, update_content="embed")
+        return
+    if not har_path.exists():
+        raise ReplayMissError(f"no recording of {url} in {config.directory}")
+    await page.route_from_har(har_path, not_found="abort")
+    if config.latency:
+        await asyncio.sleep(config.latency)
+    if config.should_throttle():
+
+        async def throttle(route: Any) -> None:
+            await route.fulfill(status=429, headers={"Retry-After": str(config.retry_after)})
+
+        await page.route(url, throttle)
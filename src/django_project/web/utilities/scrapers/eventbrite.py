@@ -1,3 +1,5 @@
+import json
+import logging
 import random
 import time
 from datetime import datetime, timedelta
@@ -7,6 +9,26 @@ import requests
 from django.conf import settings
 from django.utils import timezone
 from requests.exceptions import HTTPError, RequestException
+from web.models import HttpCacheEntry
+from web.utilities import http_client
+from web.utilities.ingestion import ScrapedEvent, ScrapedGroup, build_scraped_events
+from web.utilities.rate_limit import get_rate_limiter_for_url
+from web.utilities.scrapers.registry import (
+    EventListing,
+    PlatformScraper,
+    register_scraper,
+    run_blocking,
+)
+from web.utilities.snapshots import save_snapshot
+
+logger = logging.getLogger(__name__)
+
+# kinds of the snapshots saved of API payloads (see web.utilities.snapshots)
+EVENTS_SNAPSHOT_KIND: str = "eventbrite_events"
+EVENT_DETAILS_SNAPSHOT_KIND: str = "eventbrite_event_details"
+
+# expansions requested with the organizer's events, so that listed events need no separate details request
+EVENT_EXPANSIONS: tuple[str, ...] = ("venue", "tags")
 
 
 def create_google_map_link(address: str) -> str:
@@ -55,32 +77,119 @@ def get_organization_details(organization_id: str) -> dict:
     """
 
     url: str = f"https://www.eventbrite.com/api/v3/organizers/?ids={organization_id}"
-    response: requests.Response = requests.get(url, timeout=15)
+    response: requests.Response = http_client.get(url, timeout=15)
     response.raise_for_status()
     return response.json()["organizers"][0]
 
 
 def get_events_for_organization(organization_id: str, age: int = 14) -> list:
-    """get a list of events for a given Eventbrite organization
+    """get a list of events for a given Eventbrite organization, with their venues and tags expanded
+
+    Follows the continuation tokens of the response until every page of events is fetched, up to
+    settings.EVENTBRITE_LISTING_MAX_PAGES pages. The pages are stored as one snapshot of the listing.
 
     Args:
         organization_id (str): Eventbrite organization identifier
-        age (int): number of days ago when events were created
+        age (int): number of days ahead to list events for
 
     Returns:
-        list: list of Eventbrite events created in the past <age> days
+        list: list of Eventbrite events starting in the next <age> days
     """
     api_token: str | None = getattr(settings, "EVENTBRITE_API_KEY", None)
     if not api_token:
         return []
     start_date_range_end: str = (timezone.now() + timedelta(days=age)).strftime("%Y-%m-%dT%H:%M:%SZ")
     start_date_range_start: str = timezone.now().strftime("%Y-%m-%dT%H:%M:%SZ")
-    url: str = f"https://www.eventbriteapi.com/v3/organizers/{organization_id}/events/?start_date.range_start={start_date_range_start}&start_date.range_end={start_date_range_end}"
+    url: str = (
+        f"https://www.eventbriteapi.com/v3/organizers/{organization_id}/events/"
+        f"?start_date.range_start={start_date_range_start}&start_date.range_end={start_date_range_end}"
+        f"&expand={','.join(EVENT_EXPANSIONS)}"
+    )
     headers: dict[str, str] = {"Authorization": f"Bearer {api_token}"}
-    response: requests.Response = requests.get(url, headers=headers, timeout=15)
-    response.raise_for_status()
-    data: dict = response.json()
-    return data["events"]
+    max_pages: int = getattr(settings, "EVENTBRITE_LISTING_MAX_PAGES", 10)
+    events: list[dict] = []
+    page_url: str = url
+    continuations: set[str] = set()
+    for _ in range(max_pages):
+        response: requests.Response = http_client.get(page_url, headers=headers, timeout=15)
+        response.raise_for_status()
+        data: dict = response.json()
+        events.extend(data.get("events", []))
+        pagination: dict = data.get("pagination") or {}
+        continuation: str | None = pagination.get("continuation")
+        if not pagination.get("has_more_items") or not continuation or continuation in continuations:
+            break
+        continuations.add(continuation)
+        page_url = f"{url}&continuation={continuation}"
+    save_snapshot(url, json.dumps({"events": events}), EVENTS_SNAPSHOT_KIND)
+    return events
+
+
+def get_organization_id(url: str) -> str:
+    """get the Eventbrite organization identifier from the url of its organizer page; the url ends in -<id>"""
+    return url.split("-")[-1]
+
+
+def build_location(venue: dict | None) -> dict:
+    """build the location fields of event information from an Eventbrite venue; empty for online events
+
+    Args:
+        venue (dict | None): venue of the organizer events API, or primary_venue of the event details API
+
+    Returns:
+        dict: location_name, location_address and map_link of the event
+    """
+    if not venue:
+        return {"location_name": "", "location_address": "", "map_link": ""}
+    address: str = (venue.get("address") or {}).get("localized_address_display") or ""
+    return {
+        "location_name": venue.get("name") or "",
+        "location_address": address,
+        "map_link": create_google_map_link(address),
+    }
+
+
+def build_event_record(item: dict) -> dict:
+    """build event information from an event of the organizer events API
+
+    The venue and tags are only included when the listing expanded them; see EventbriteScraper.needs_details().
+
+    Args:
+        item (dict): event as returned by get_events_for_organization()
+
+    Returns:
+        dict: dictionary of information about the event
+    """
+    record: dict = {
+        "name": item["name"].get("text", "") if item.get("name") else "",
+        "description": item["description"].get("text", "") if item.get("description") else "",
+        "url": item.get("url", ""),
+        "social_platform_id": str(item.get("id", "")),
+        "start_datetime": item["start"].get("utc", "") if item.get("start") else "",
+        "end_datetime": item["end"].get("utc", "") if item.get("end") else "",
+    }
+    if "venue" in item:
+        record.update(build_location(item["venue"]))
+    if "tags" in item:
+        record["tags"] = [tag["display_name"] for tag in item["tags"] or [] if tag.get("display_name")]
+    return record
+
+
+def add_event_details(record: dict, event_details: dict) -> dict:
+    """add the venue and tags of an event's details to its event information
+
+    Args:
+        record (dict): event information built by build_event_record()
+        event_details (dict): event data as returned by get_events_details()
+
+    Returns:
+        dict: the event information with location fields and a "tags" list
+    """
+    return {
+        **record,
+        **build_location(event_details.get("primary_venue")),
+        "tags": [tag["display_name"] for tag in event_details.get("tags", [])],
+    }
 
 
 def get_event_details(event_id: str) -> dict:
@@ -92,6 +201,56 @@ def get_event_details(event_id: str) -> dict:
     Returns:
         dict: event data as available from the Eventbrite API
 
+    Raises:
+        requests.exceptions.RequestException: If the request fails after all retries
+                                              for reasons other than 429, or if 429
+                                              persists beyond max retries.
+    """
+    url: str = f"https://www.eventbrite.com/api/v3/destination/events/?event_ids={event_id}&expand=primary_venue"
+    data: dict = get_json_with_retries(url, label=f"event ID {event_id}")
+    events: list[dict] = data.get("events") or []
+    return events[0] if events else {}
+
+
+def get_events_details(event_ids: list[str], chunk_size: int = 20) -> dict[str, dict]:
+    """Get the details of several Eventbrite events, requesting up to `chunk_size` events per API call.
+
+    Args:
+        event_ids (list[str]): Eventbrite event identifiers
+        chunk_size (int, optional): max number of event ids per request. Defaults to 20.
+
+    Returns:
+        dict[str, dict]: event data as available from the Eventbrite API, keyed by event id; events the API
+                         did not return are omitted
+
+    Raises:
+        requests.exceptions.RequestException: If a request fails after all retries.
+    """
+    unique_ids: list[str] = list(dict.fromkeys(str(event_id) for event_id in event_ids))
+    details: dict[str, dict] = {}
+    for index in range(0, len(unique_ids), chunk_size):
+        chunk: list[str] = unique_ids[index : index + chunk_size]
+        url: str = (
+            "https://www.eventbrite.com/api/v3/destination/events/"
+            f"?event_ids={','.join(chunk)}&expand=primary_venue&page_size={len(chunk)}"
+        )
+        data: dict = get_json_with_retries(url, label=f"{len(chunk)} event IDs")
+        save_snapshot(url, json.dumps(data), EVENT_DETAILS_SNAPSHOT_KIND)
+        for event in data.get("events", []):
+            details[str(event["id"])] = event
+    return details
+
+
+def get_json_with_retries(url: str, label: str = "") -> dict:
+    """GET a url from the Eventbrite API and return the decoded json, with retry logic for 429 errors.
+
+    Args:
+        url (str): url to request
+        label (str, optional): description of the request used in log messages
+
+    Returns:
+        dict: decoded json response
+
     Raises:
         requests.exceptions.RequestException: If the request fails after all retries
                                               for reasons other than 429, or if 429
@@ -102,81 +261,127 @@ def get_event_details(event_id: str) -> dict:
     INITIAL_BACKOFF_TIME = 5  # Initial wait time in seconds before the first 429 retry
     MAX_BACKOFF_TIME = 60  # Maximum wait time in seconds for 429 retries
 
-    url: str = f"https://www.eventbrite.com/api/v3/destination/events/?event_ids={event_id}&expand=primary_venue"
-
     # Initialize backoff time for 429 errors
     current_429_backoff_time = INITIAL_BACKOFF_TIME
 
     for attempt in range(MAX_RETRIES + 1):  # +1 because range(N) goes from 0 to N-1, so N attempts
         try:
-            print(f"Attempt {attempt + 1}/{MAX_RETRIES + 1} for event ID {event_id}...")
-            resp: requests.Response = requests.get(url, timeout=15)
+            logger.info("attempt %s/%s for %s", attempt + 1, MAX_RETRIES + 1, label or url)
+            resp: requests.Response = http_client.get(url, timeout=15)
 
             # Explicitly check for 429 before calling raise_for_status
             if resp.status_code == 429:
-                print(f"Received 429 Too Many Requests for {url}.")
+                logger.warning("received 429 Too Many Requests for %s", url)
                 retry_after_header: str | None | Any = resp.headers.get("Retry-After")
                 wait_time: float = 0.0
 
                 if retry_after_header:
                     try:
                         wait_time = float(retry_after_header)
-                        print(f"Server requested to retry after {wait_time} seconds (from Retry-After header).")
+                        logger.info("server requested a retry after %s seconds (Retry-After header)", wait_time)
                     except ValueError:
                         # Fallback if Retry-After isn't a valid integer
                         wait_time = min(
                             current_429_backoff_time + random.uniform(attempt, 0.5 * current_429_backoff_time),  # nosec
                             MAX_BACKOFF_TIME,
                         )
-                        print(f"Invalid Retry-After header. Applying exponential backoff for {wait_time:.2f} seconds.")
+                        logger.info("invalid Retry-After header; backing off for %.2f seconds", wait_time)
                 else:
                     # Apply exponential backoff with jitter
                     wait_time = min(
                         current_429_backoff_time + random.uniform(attempt, 0.5 * current_429_backoff_time),  # nosec
                         MAX_BACKOFF_TIME,
                     )
-                    print(f"No Retry-After header. Applying exponential backoff for {wait_time:.2f} seconds.")
+                    logger.info("no Retry-After header; backing off for %.2f seconds", wait_time)
 
-                # Only sleep and increment backoff time if it's not the last retry
+                # Only back off and increment backoff time if it's not the last retry. The backoff is shared with
+                # every worker through the rate limiter, which the next request waits on.
                 if attempt < MAX_RETRIES:
-                    time.sleep(wait_time)
+                    rate_limiter = get_rate_limiter_for_url(url)
+                    if rate_limiter:
+                        rate_limiter.penalize(wait_time)
+                    else:
+                        time.sleep(wait_time)
                     current_429_backoff_time *= 2  # Double for next potential 429 retry
                     continue  # Skip the rest of the loop and retry
                 else:
-                    print(f"Max retries ({MAX_RETRIES}) for 429 reached. Raising the last error.")
+                    logger.warning("max retries (%s) for 429 reached for %s", MAX_RETRIES, url)
                     raise Exception(f"Max retries ({MAX_RETRIES})) reached for 429 Too Many Requests.")
 
             # If not a 429, raise for other status codes
             resp.raise_for_status()
 
             # If successful, return the data
-            return resp.json()["events"][0]
+            return resp.json()
 
         except HTTPError as err:
             # Handle other HTTP errors (e.g., 400, 401, 404, 500)
-            print(f"HTTP Error {err.response.status_code}: {err.response.reason} for {url}.")
+            logger.warning("HTTP error %s: %s for %s", err.response.status_code, err.response.reason, url)
             if attempt < MAX_RETRIES:
                 sleep_for: float = 3 * attempt  # Keep original backoff for non-429 errors
-                print(f"Waiting {sleep_for} seconds before retrying...")
+                logger.info("waiting %s seconds before retrying", sleep_for)
                 time.sleep(sleep_for)
             else:
-                print(f"Max retries ({MAX_RETRIES}) reached for non-429 HTTP error. Raising the last error.")
+                logger.warning("max retries (%s) reached for HTTP errors for %s", MAX_RETRIES, url)
                 raise err  # Re-raise the specific HTTP error on the last attempt
 
         except RequestException as err:
             # Catch other request-related errors (e.g., ConnectionError, Timeout)
-            print(f"An unexpected request error occurred for {url}: {err}")
+            logger.warning("request error for %s: %s", url, err)
             if attempt < MAX_RETRIES:
                 sleep_for = 3 * attempt + random.uniform(0, 1)  # nosec # Add jitter
-                print(f"Waiting {sleep_for:.2f} seconds before retrying...")
+                logger.info("waiting %.2f seconds before retrying", sleep_for)
                 time.sleep(sleep_for)
             else:
-                print(f"Max retries ({MAX_RETRIES}) reached for request error. Raising the last error.")
+                logger.warning("max retries (%s) reached for request errors for %s", MAX_RETRIES, url)
                 raise err  # Re-raise the error on the last attempt
 
     # This part should ideally not be reached if MAX_RETRIES is set up correctly
     # and errors are always re-raised on the last attempt.
-    print(
-        f"Function completed without returning data for event_id {event_id}. This should not happen if errors are always re-raised."
-    )
-    return {}  # Fallback, though an exception should ideally cover failure# Initialize backoff time for 429 errors
+    logger.error("no data returned for %s after %s attempts", label or url, MAX_RETRIES + 1)
+    return {}  # Fallback, though an exception should ideally cover failure
+
+
+@register_scraper("Eventbrite")
+class EventbriteScraper(PlatformScraper):
+    """Eventbrite organizations and events, read from the Eventbrite API
+
+    Events are listed with their venue and tags expanded. Listed events the API did not expand are completed with the
+    venue and tags of their details, requested in batches.
+    """
+
+    listing_snapshot_kind = EVENTS_SNAPSHOT_KIND
+    detail_snapshot_kind = EVENT_DETAILS_SNAPSHOT_KIND
+
+    async def fetch_group(self, url: str, cache_entry: HttpCacheEntry | None = None) -> ScrapedGroup | None:
+        organization_details: dict = await run_blocking(get_organization_details, get_organization_id(url))
+        return ScrapedGroup(
+            description=(organization_details.get("long_description") or {}).get("text") or "",
+            website=organization_details.get("website") or "",
+        )
+
+    async def list_events(self, url: str) -> EventListing:
+        events: list[dict] = await run_blocking(get_events_for_organization, get_organization_id(url))
+        return EventListing(records={str(item["id"]): build_event_record(item) for item in events})
+
+    async def fetch_events(self, listing: EventListing, event_ids: list[str]) -> dict[str, ScrapedEvent]:
+        detail_ids: list[str] = [event_id for event_id in event_ids if self.needs_details(listing.records[event_id])]
+        details_by_id: dict[str, dict] = await run_blocking(get_events_details, detail_ids) if detail_ids else {}
+        records: dict[str, dict] = {}
+        for event_id in event_ids:
+            if event_id not in detail_ids:
+                records[event_id] = listing.records[event_id]
+            elif details_by_id.get(event_id):
+                records[event_id] = add_event_details(listing.records[event_id], details_by_id[event_id])
+        return build_scraped_events(records)
+
+    def needs_details(self, record: dict) -> bool:
+        return "location_name" not in record or "tags" not in record
+
+    def parse_snapshot(self, kind: str, url: str, content: bytes) -> EventListing:
+        data: dict = json.loads(content)
+        if kind == EVENTS_SNAPSHOT_KIND:
+            return EventListing(records={str(item["id"]): build_event_record(item) for item in data["events"]})
+        return EventListing(
+            records={str(event["id"]): add_event_details({}, event) for event in data.get("events", [])}
+        )
@@ -1,11 +1,77 @@
+import contextvars
 import html
+import json
+import logging
 import re
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 from bs4 import BeautifulSoup, Tag
 from bs4.element import AttributeValueList, NavigableString, PageElement
-from web.utilities.html_utils import fetch_content, fetch_content_with_playwright
+from django.conf import settings
+from django.utils.html import linebreaks
+from web.models import HttpCacheEntry
+from web.utilities.html_utils import (
+    FetchStats,
+    fetch_content,
+    fetch_content_with_playwright,
+    fetch_many_with_playwright,
+)
+from web.utilities.http_cache import FetchCacheStats, fetch_content_if_changed
+from web.utilities.ingestion import (
+    ScrapedEvent,
+    ScrapedGroup,
+    build_scraped_events,
+    compute_fingerprint,
+)
+from web.utilities.replay import ReplayMissError
+from web.utilities.scrapers.meetup_graphql import (
+    GRAPHQL_SNAPSHOT_KIND,
+    get_event_nodes,
+    get_group_urlname,
+    parse_group_response,
+    query_group,
+    uses_graphql,
+)
+from web.utilities.scrapers.registry import (
+    EventListing,
+    PlatformScraper,
+    register_scraper,
+    run_blocking,
+)
+from web.utilities.snapshots import save_snapshot
+from web.utilities.telemetry import record_tier
+
+logger = logging.getLogger(__name__)
+
+# the server-rendered page state holds everything the parsers read, so lean fetches only wait for it to be attached
+PAGE_READY_SELECTOR = "script#__NEXT_DATA__"
+NEXT_DATA_PATTERN: re.Pattern[str] = re.compile(
+    r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE
+)
+# Meetup uses a numeric event id in the url for upcoming events and an alphanumeric id for recurring events; only
+# numeric ids are ingested, as the recurring ones would add every occurrence twice
+NUMERIC_EVENT_PATTERN: re.Pattern[str] = re.compile(r"/events/(\d+)/")
+# kinds of the snapshots saved of listing and event pages (see web.utilities.snapshots)
+LISTING_SNAPSHOT_KIND: str = "meetup_listing"
+EVENT_SNAPSHOT_KIND: str = "meetup_event"
+# event information a page's server-rendered html must yield for the page not to be loaded in Chromium
+STATIC_REQUIRED_FIELDS: tuple[str, ...] = ("name", "start_datetime", "description")
+# event information a listing record must have for the event's detail page to be skipped
+LISTING_REQUIRED_FIELDS: tuple[str, ...] = ("name", "start_datetime", "end_datetime", "description", "location_name")
+
+# fields of a listing's Event entries that, when changed, mean the event's detail page should be fetched again
+LISTING_FINGERPRINT_FIELDS: tuple[str, ...] = (
+    "title",
+    "dateTime",
+    "endTime",
+    "duration",
+    "venue",
+    "isOnline",
+    "status",
+    "description",
+)
 
 
 def get_end_datetime(datetime_string: str, time_string: str) -> datetime | None:
@@ -55,21 +121,209 @@ def get_end_datetime(datetime_string: str, time_string: str) -> datetime | None:
         return None
 
 
-def get_event_information(url: str) -> dict:
+def get_event_information(url: str, stats: list[FetchStats] | None = None) -> dict:
     """capture information about an event from a meetup.com page
 
     Args:
         url (str): url of the event page
+        stats (list[FetchStats], optional): list to append page fetch stats to
 
-    Raises:
-        Exception:
+    Returns:
+        dict: dictionary of information about the event as available on meetup.com
+    """
+    return get_events_information([url], concurrency=1, stats=stats)[0]
+
+
+def get_events_information(urls: list[str], concurrency: int = 4, stats: list[FetchStats] | None = None) -> list[dict]:
+    """capture information about several events, loading up to `concurrency` meetup.com pages in parallel
+
+    Each page's server-rendered html is requested first, up to `concurrency` requests at once; only pages whose html
+    lacks STATIC_REQUIRED_FIELDS are then loaded in Chromium. The tier that served each page is recorded with
+    record_tier().
+
+    Args:
+        urls (list[str]): urls of the event pages
+        concurrency (int, optional): max number of pages requested, or loading in Chromium, at once. Defaults to 4.
+        stats (list[FetchStats], optional): list to append Chromium page fetch stats to
+
+    Returns:
+        list[dict]: dictionaries of information about each event, in the order of urls
+    """
+    records: dict[str, dict] = {}
+    if getattr(settings, "MEETUP_STATIC_FETCH", True) and urls:
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(urls))), thread_name_prefix="meetup") as pool:
+            # every request runs in a copy of the caller's context, so it is replayed and counted like the caller's
+            futures: dict[str, Future[dict]] = {
+                url: pool.submit(contextvars.copy_context().run, get_event_information_static, url) for url in urls
+            }
+        for url, future in futures.items():
+            event_info: dict = future.result()
+            if event_info:
+                records[url] = event_info
+                record_tier(url, "requests")
+    browser_urls: list[str] = [url for url in urls if url not in records]
+    page_contents: dict[str, str] = fetch_many_with_playwright(
+        browser_urls, concurrency=concurrency, lean=True, wait_for=PAGE_READY_SELECTOR, stats=stats
+    )
+    for url in browser_urls:
+        save_snapshot(url, page_contents.get(url, ""), EVENT_SNAPSHOT_KIND)
+        records[url] = parse_event_information(url, page_contents.get(url, ""))
+        record_tier(url, "playwright")
+    return [records[url] for url in urls]
+
+
+def get_event_information_static(url: str) -> dict:
+    """capture information about an event from the server-rendered html of a meetup.com page, without a browser
+
+    Args:
+        url (str): url of the event page
+
+    Returns:
+        dict: dictionary of information about the event; empty if the request failed or the html lacks any of
+              STATIC_REQUIRED_FIELDS, in which case the page needs a browser
+    """
+    try:
+        page_content: bytes = fetch_content(url)
+    except ReplayMissError:
+        raise
+    except Exception as err:
+        logger.info("static fetch of %s failed: %s", url, err)
+        return {}
+    save_snapshot(url, page_content, EVENT_SNAPSHOT_KIND)
+    event_info: dict = parse_event_information(url, page_content.decode("utf-8", errors="replace"))
+    if any(not event_info.get(key) for key in STATIC_REQUIRED_FIELDS):
+        return {}
+    return event_info
+
+
+def parse_event_information(url: str, page_content: str) -> dict:
+    """parse information about an event from the rendered html of a meetup.com event page
+
+    The page's embedded Next.js/Apollo state is used when it describes the event; otherwise the html is parsed.
+
+    Args:
+        url (str): url of the event page
+        page_content (str): rendered html of the event page
 
     Returns:
         dict: dictionary of information about the event as available on meetup.com
     """
+    event_info: dict = parse_event_information_from_state(url, page_content)
+    if event_info:
+        return event_info
+    return parse_event_information_from_html(url, page_content)
+
+
+def get_page_state(page_content: str) -> dict:
+    """extract the Apollo cache embedded in the __NEXT_DATA__ script of a meetup.com page
+
+    Args:
+        page_content (str): html of the page
+
+    Returns:
+        dict: Apollo cache entries keyed by cache id (for example "Event:123" or "Venue:456"); empty if not found
+    """
+    match: re.Match[str] | None = NEXT_DATA_PATTERN.search(page_content)
+    if not match:
+        return {}
+    try:
+        next_data: Any = json.loads(match.group(1))
+    except ValueError:
+        return {}
+    page_props: Any = next_data.get("props", {}).get("pageProps", {}) if isinstance(next_data, dict) else {}
+    apollo_state: Any = page_props.get("__APOLLO_STATE__") or page_props.get("apolloState") or {}
+    return apollo_state if isinstance(apollo_state, dict) else {}
+
+
+def resolve_reference(state: dict, value: Any) -> dict:
+    """follow an Apollo {"__ref": "Type:id"} reference, returning the referenced entry (or the value if inline)"""
+    if isinstance(value, dict) and "__ref" in value:
+        return state.get(value["__ref"], {})
+    return value if isinstance(value, dict) else {}
+
+
+def parse_event_information_from_state(url: str, page_content: str) -> dict:
+    """parse information about an event from the embedded page state of a meetup.com event page
+
+    Args:
+        url (str): url of the event page
+        page_content (str): rendered html of the event page
+
+    Returns:
+        dict: dictionary of information about the event; empty if the state is absent or lacks name/start time
+    """
+    event_id_match: re.Match[str] | None = re.search(r"/events/([^/]+)/", url)
+    if not event_id_match:
+        return {}
+    state: dict = get_page_state(page_content)
+    event: dict = state.get(f"Event:{event_id_match.group(1)}", {})
+    if not event.get("title") or not event.get("dateTime"):
+        return {}
+    return build_event_information(url, event, state)
+
+
+def build_event_information(url: str, event: dict, state: dict) -> dict:
+    """build a dictionary of event information from an Apollo Event entry
+
+    Args:
+        url (str): url of the event page
+        event (dict): Apollo cache entry for the event
+        state (dict): Apollo cache the entry came from, used to resolve the venue
 
+    Returns:
+        dict: dictionary of information about the event
+    """
+    try:
+        start_dt: datetime = datetime.fromisoformat(event["dateTime"])
+        end_dt: datetime | None = datetime.fromisoformat(event["endTime"]) if event.get("endTime") else None
+    except ValueError:
+        return {}
+    if end_dt is None and event.get("duration"):
+        duration_match: re.Match[str] | None = re.fullmatch(r"PT(?:(\d+)H)?(?:(\d+)M)?", event["duration"])
+        if duration_match:
+            end_dt = start_dt + timedelta(
+                hours=int(duration_match.group(1) or 0), minutes=int(duration_match.group(2) or 0)
+            )
+
+    venue: dict = resolve_reference(state, event.get("venue"))
+    location_name: str | None = venue.get("name") or None
+    if not location_name and (event.get("isOnline") or event.get("eventType") == "ONLINE"):
+        location_name = "Online event"
+    location_address: str = ""
+    if venue.get("address") and venue.get("city"):
+        location_address = (
+            f"{venue['address']}, {venue['city']}, {venue.get('state', '')}, {str(venue.get('country', '')).upper()}"
+        )
+    map_link: str = ""
+    if venue.get("lat") and venue.get("lng"):
+        map_link = f"https://www.google.com/maps/search/?api=1&query={venue['lat']}%2C%20{venue['lng']}"
+
+    description: str = event.get("description") or ""
+    return {
+        "url": url,
+        "name": event["title"],
+        # the page state holds the plain-text description; convert it to the html stored by the soup parser
+        "description": linebreaks(description) if description else "",
+        "start_datetime": start_dt,
+        "end_datetime": end_dt,
+        "location_name": location_name,
+        "location_address": location_address,
+        "map_link": map_link,
+        "social_platform_id": str(event.get("id") or ""),
+    }
+
+
+def parse_event_information_from_html(url: str, page_content: str) -> dict:
+    """parse information about an event from the html markup of a meetup.com event page
+
+    Args:
+        url (str): url of the event page
+        page_content (str): rendered html of the event page
+
+    Returns:
+        dict: dictionary of information about the event as available on meetup.com
+    """
     try:
-        page_content: str = fetch_content_with_playwright(url)
         soup = BeautifulSoup(page_content, "html.parser")
 
         event_info: dict = {}
@@ -187,11 +441,12 @@ def get_event_information(url: str) -> dict:
         return {}
 
 
-def get_event_links(url: str) -> list:
+def get_event_links(url: str, stats: list[FetchStats] | None = None) -> list:
     """capture urls for upcoming events from a group page on meetup.com
 
     Args:
         url (str): url of the group page; example: "https://www.meetup.com/python-spokane/events/"
+        stats (list[FetchStats], optional): list to append page fetch stats to
 
     Raises:
         Exception:
@@ -199,11 +454,166 @@ def get_event_links(url: str) -> list:
     Returns:
         list: list of urls for upcoming events as available on the group page on meetup.com
     """
-    page_content: str | None = fetch_content_with_playwright(f"{url}/events/?type=upcoming")
-    if page_content:
-        event_urls: list[Any] = re.findall(r'"eventUrl":"(https://www\.meetup\.com/[^/]+/events/\d+/)"', page_content)
-        return [url for url in event_urls]
-    return []
+    return list(get_event_listing(url, stats=stats))
+
+
+def get_event_listing_page(url: str, stats: list[FetchStats] | None = None) -> str:
+    """load the upcoming events listing of a group on meetup.com
+
+    The server-rendered html is requested first, and the page is only loaded in Chromium if it lacks the page state.
+
+    Args:
+        url (str): url of the group page; example: "https://www.meetup.com/python-spokane/events/"
+        stats (list[FetchStats], optional): list to append page fetch stats to
+
+    Returns:
+        str: rendered html of the listing page; empty string if it could not be loaded
+    """
+    listing_url: str = f"{url}/events/?type=upcoming"
+    if getattr(settings, "MEETUP_STATIC_FETCH", True):
+        try:
+            page_content: str = fetch_content(listing_url).decode("utf-8", errors="replace")
+        except ReplayMissError:
+            raise
+        except Exception as err:
+            logger.info("static fetch of %s failed: %s", listing_url, err)
+            page_content = ""
+        if get_page_state(page_content):
+            record_tier(listing_url, "requests")
+            save_snapshot(listing_url, page_content, LISTING_SNAPSHOT_KIND)
+            return page_content
+    page_content = fetch_content_with_playwright(listing_url, lean=True, wait_for=PAGE_READY_SELECTOR, stats=stats)
+    record_tier(listing_url, "playwright")
+    save_snapshot(listing_url, page_content, LISTING_SNAPSHOT_KIND)
+    return page_content
+
+
+def get_event_listing(url: str, stats: list[FetchStats] | None = None) -> dict[str, str]:
+    """capture urls and listing fingerprints for upcoming events from a group page on meetup.com
+
+    Args:
+        url (str): url of the group page; example: "https://www.meetup.com/python-spokane/events/"
+        stats (list[FetchStats], optional): list to append page fetch stats to
+
+    Returns:
+        dict[str, str]: listing fingerprint of each upcoming event, keyed by event url in listing order
+    """
+    page_content: str = get_event_listing_page(url, stats=stats)
+    return parse_event_listing(page_content) if page_content else {}
+
+
+def parse_event_listing(page_content: str) -> dict[str, str]:
+    """parse the upcoming events of a meetup.com group's event listing
+
+    Each event's fingerprint hashes the fields the listing's page state shows for it (title, times, venue,
+    description excerpt, status), so a changed fingerprint means the event's detail page is worth fetching again.
+
+    Args:
+        page_content (str): rendered html of the listing page
+
+    Returns:
+        dict[str, str]: listing fingerprint of each event, keyed by event url in listing order; the fingerprint is
+                        an empty string when the page state has no entry for the event
+    """
+    state: dict = get_page_state(page_content)
+    listing: dict[str, str] = {}
+    for event_url, event in get_listed_events(page_content, state).items():
+        listing[event_url] = (
+            compute_fingerprint({key: event.get(key) for key in LISTING_FINGERPRINT_FIELDS}) if event else ""
+        )
+    return listing
+
+
+def get_listed_events(page_content: str, state: dict) -> dict[str, dict]:
+    """get the page state entry of each event linked from a listing page, keyed by event url in listing order"""
+    listed_events: dict[str, dict] = {}
+    for event_url in re.findall(r'"eventUrl":"(https://www\.meetup\.com/[^/]+/events/\d+/)"', page_content):
+        event_id: str = event_url.rstrip("/").rsplit("/", 1)[-1]
+        listed_events[event_url] = state.get(f"Event:{event_id}", {})
+    return listed_events
+
+
+def parse_event_listing_records(page_content: str) -> dict[str, dict]:
+    """build event information for every event on a meetup.com group's event listing from its page state
+
+    Records hold the same keys as parse_event_information. Values the listing lacks are left empty; a description
+    that the listing truncated (ending in an ellipsis) counts as missing. Use get_missing_fields to decide whether an
+    event's detail page is still needed.
+
+    Args:
+        page_content (str): rendered html of the listing page
+
+    Returns:
+        dict[str, dict]: event information keyed by event url in listing order; an empty dict for events the page
+                         state has no usable entry for
+    """
+    state: dict = get_page_state(page_content)
+    records: dict[str, dict] = {}
+    for event_url, event in get_listed_events(page_content, state).items():
+        record: dict = (
+            build_event_information(event_url, event, state) if event.get("title") and event.get("dateTime") else {}
+        )
+        if record and str(event.get("description") or "").rstrip().endswith(("…", "...")):
+            record["description"] = ""
+        records[event_url] = record
+    return records
+
+
+def build_event_listing(page_content: str) -> EventListing:
+    """build the EventListing of a group from the rendered html of its meetup.com listing page
+
+    Args:
+        page_content (str): rendered html of the listing page
+
+    Returns:
+        EventListing: listed events keyed by numeric event id; events the page state has no usable entry for get a
+                      record holding only their url and id
+    """
+    listing = EventListing()
+    records: dict[str, dict] = parse_event_listing_records(page_content)
+    for event_url, listing_fingerprint in parse_event_listing(page_content).items():
+        event_id_match: re.Match[str] | None = NUMERIC_EVENT_PATTERN.search(event_url)
+        if event_id_match:
+            event_id: str = event_id_match.group(1)
+            listing.records[event_id] = records.get(event_url) or {"url": event_url, "social_platform_id": event_id}
+            listing.fingerprints[event_id] = listing_fingerprint
+    return listing
+
+
+def build_graphql_listing(group: dict) -> EventListing:
+    """build the EventListing of a group from the group returned by the Meetup GraphQL API
+
+    The API returns events with the fields of the page state's Event entries, so records and listing fingerprints are
+    built as they are from a listing page; they are complete, and need no detail page.
+
+    Args:
+        group (dict): group, as returned by web.utilities.scrapers.meetup_graphql.parse_group_response()
+
+    Returns:
+        EventListing: listed events keyed by numeric event id
+    """
+    listing = EventListing()
+    for event in get_event_nodes(group):
+        event_id: str = str(event.get("id") or "")
+        if not event_id.isdigit() or not event.get("title") or not event.get("dateTime"):
+            continue
+        record: dict = build_event_information(event.get("eventUrl") or "", event, {})
+        if record:
+            listing.records[event_id] = record
+            listing.fingerprints[event_id] = compute_fingerprint(
+                {key: event.get(key) for key in LISTING_FINGERPRINT_FIELDS}
+            )
+    return listing
+
+
+def get_missing_fields(event_info: dict) -> list[str]:
+    """list the LISTING_REQUIRED_FIELDS that an event record has no value for"""
+    return [key for key in LISTING_REQUIRED_FIELDS if event_info.get(key) in (None, "")]
+
+
+def merge_event_information(listing_record: dict, detail_record: dict) -> dict:
+    """combine a listing record with the event's detail page record; detail values win where both have one"""
+    return {**listing_record, **{key: value for key, value in detail_record.items() if value not in (None, "")}}
 
 
 def get_group_description(url: str) -> str:
@@ -219,6 +629,39 @@ def get_group_description(url: str) -> str:
         str: html from the description of the group as available on meetup.com
     """
     page_content: bytes | Any = fetch_content(url)
+    return parse_group_description(page_content)
+
+
+def get_group_description_if_changed(
+    url: str, cache_entry: HttpCacheEntry | None, stats: FetchCacheStats | None = None
+) -> tuple[str | None, HttpCacheEntry | None]:
+    """capture the description of a group from a meetup.com page, skipping the parse if the page is unchanged
+
+    Args:
+        url (str): url of the group page
+        cache_entry (HttpCacheEntry | None): stored validators of the page (see http_cache.get_cache_entry)
+        stats (FetchCacheStats, optional): cache counters to update for this fetch
+
+    Returns:
+        tuple[str | None, HttpCacheEntry | None]: html from the description of the group, or None if the page has not
+                                                  changed since the last fetch; and the unsaved cache entry of the
+                                                  page (see http_cache.save_cache_entry)
+    """
+    page_content, cache_entry = fetch_content_if_changed(url, cache_entry, stats=stats)
+    if page_content is None:
+        return None, None
+    return parse_group_description(page_content), cache_entry
+
+
+def parse_group_description(page_content: bytes | str) -> str:
+    """parse the description of a group from the html of a meetup.com group page
+
+    Args:
+        page_content (bytes | str): html of the group page
+
+    Returns:
+        str: html from the description of the group; empty string if it was not found
+    """
     soup = BeautifulSoup(page_content, "html.parser")
     description_div: PageElement | Tag | NavigableString | None = soup.find(
         "div", class_="ds2-r16 break-words utils_description__BlOCA"
@@ -228,3 +671,97 @@ def get_group_description(url: str) -> str:
         description: str = "".join(str(child) for child in description_div.children)
         return description
     return ""  # Return an empty string if description_div is None or not a Tag
+
+
+@register_scraper("Meetup")
+class MeetupScraper(PlatformScraper):
+    """Meetup groups and events, scraped from meetup.com pages
+
+    Events are read from the page state of the group's listing page; detail pages are only loaded, up to
+    settings.MEETUP_EVENT_FETCH_CONCURRENCY at once, for events whose listing record lacks some of their fields.
+    """
+
+    incremental = True
+    listing_snapshot_kind = LISTING_SNAPSHOT_KIND
+    detail_snapshot_kind = EVENT_SNAPSHOT_KIND
+
+    @property
+    def refresh_window(self) -> timedelta:
+        return timedelta(hours=getattr(settings, "MEETUP_EVENT_REFRESH_WINDOW_HOURS", 48))
+
+    @property
+    def max_age(self) -> timedelta:
+        return timedelta(hours=getattr(settings, "MEETUP_EVENT_MAX_AGE_HOURS", 24))
+
+    def for_group(self, url: str) -> PlatformScraper:
+        return MeetupGraphQLScraper() if uses_graphql(url) else self
+
+    async def fetch_group(self, url: str, cache_entry: HttpCacheEntry | None = None) -> ScrapedGroup | None:
+        description, new_entry = await run_blocking(get_group_description_if_changed, url, cache_entry)
+        return None if description is None else ScrapedGroup(description=description, cache_entry=new_entry)
+
+    async def list_events(self, url: str) -> EventListing:
+        page_content: str = await run_blocking(get_event_listing_page, url)
+        return build_event_listing(page_content) if page_content else EventListing()
+
+    async def fetch_events(self, listing: EventListing, event_ids: list[str]) -> dict[str, ScrapedEvent]:
+        records: dict[str, dict] = {event_id: listing.records[event_id] for event_id in event_ids}
+        detail_ids: list[str] = [event_id for event_id, record in records.items() if self.needs_details(record)]
+        details: list[dict] = await run_blocking(
+            get_events_information,
+            [records[event_id]["url"] for event_id in detail_ids],
+            concurrency=getattr(settings, "MEETUP_EVENT_FETCH_CONCURRENCY", 4),
+        )
+        for event_id, detail_info in zip(detail_ids, details):
+            if detail_info:
+                records[event_id] = merge_event_information(records[event_id], detail_info)
+            else:
+                # an event whose detail page failed is left alone rather than written from a partial listing record
+                del records[event_id]
+        return build_scraped_events(records)
+
+    def needs_details(self, record: dict) -> bool:
+        return bool(get_missing_fields(record))
+
+    def parse_snapshot(self, kind: str, url: str, content: bytes) -> EventListing:
+        if kind == GRAPHQL_SNAPSHOT_KIND:
+            return build_graphql_listing(parse_group_response(content))
+        page_content: str = content.decode("utf-8", errors="replace")
+        if kind == LISTING_SNAPSHOT_KIND:
+            return build_event_listing(page_content)
+        event_info: dict = parse_event_information(url, page_content)
+        event_id_match: re.Match[str] | None = NUMERIC_EVENT_PATTERN.search(url)
+        if not event_info or not event_id_match:
+            return EventListing()
+        return EventListing(records={event_id_match.group(1): event_info})
+
+
+class MeetupGraphQLScraper(MeetupScraper):
+    """Meetup groups and events, read from the Meetup GraphQL API without a browser
+
+    Each stage makes one query for the group, which returns its description and its upcoming events complete; no
+    event page is loaded. MeetupScraper hands groups listed in settings.MEETUP_GRAPHQL_GROUPS to this scraper.
+
+    The API returns a group's description as plain text rather than the html of its page, so it only fills in the
+    description of a group that has none, and leaves one scraped from the group page alone.
+    """
+
+    listing_snapshot_kind = GRAPHQL_SNAPSHOT_KIND
+    detail_snapshot_kind = ""
+
+    def for_group(self, url: str) -> PlatformScraper:
+        return self
+
+    async def fetch_group(self, url: str, cache_entry: HttpCacheEntry | None = None) -> ScrapedGroup | None:
+        group: dict = parse_group_response(await run_blocking(query_group, get_group_urlname(url)))
+        description: str = group.get("description") or ""
+        return ScrapedGroup(description=linebreaks(description) if description else "", replaces_description=False)
+
+    async def list_events(self, url: str) -> EventListing:
+        return build_graphql_listing(parse_group_response(await run_blocking(query_group, get_group_urlname(url))))
+
+    async def fetch_events(self, listing: EventListing, event_ids: list[str]) -> dict[str, ScrapedEvent]:
+        return build_scraped_events({event_id: listing.records[event_id] for event_id in event_ids})
+
+    def needs_details(self, record: dict) -> bool:
+        return False
@@ -0,0 +1,133 @@
+"""client of the Meetup GraphQL API, a browser-free source of a group's description and upcoming events
+
+One query per group returns the group's description together with its upcoming events, with the same event fields
+the meetup.com page state holds, so MeetupGraphQLScraper (web.utilities.scrapers.meetup) builds its records with the
+page parsers' own helpers. Groups are read with it instead of their pages when their urlname is listed in
+settings.MEETUP_GRAPHQL_GROUPS.
+
+For offline runs and tests, the meetup_graphql_standin script answers the query from a directory of json files, one
+per group.
+"""
+
+import json
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from web.utilities import http_client
+from web.utilities.snapshots import save_snapshot
+from web.utilities.telemetry import record_tier
+
+# kind of the snapshots saved of query responses (see web.utilities.snapshots)
+GRAPHQL_SNAPSHOT_KIND: str = "meetup_graphql_group"
+
+GROUP_QUERY: str = """
+query GroupEvents($urlname: String!, $first: Int!) {
+  groupByUrlname(urlname: $urlname) {
+    id
+    description
+    events(first: $first, status: ACTIVE) {
+      edges {
+        node {
+          id
+          title
+          description
+          dateTime
+          endTime
+          duration
+          eventUrl
+          eventType
+          isOnline
+          status
+          venue {
+            name
+            address
+            city
+            state
+            country
+            lat
+            lng
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+class MeetupGraphQLError(RuntimeError):
+    """raised when the Meetup GraphQL API answers a query with errors, or without the group"""
+
+
+def get_group_urlname(url: str) -> str:
+    """get the urlname of a group from the url of its meetup.com page; example: "python-spokane" """
+    return urlparse(url).path.strip("/").split("/")[0]
+
+
+def uses_graphql(url: str) -> bool:
+    """whether a group is read with the GraphQL API rather than its pages; see settings.MEETUP_GRAPHQL_GROUPS"""
+    groups: list[str] = getattr(settings, "MEETUP_GRAPHQL_GROUPS", [])
+    return "*" in groups or get_group_urlname(url) in groups
+
+
+def get_snapshot_url(urlname: str) -> str:
+    """get the url a query response of a group is stored under; the endpoint itself is the same for every group"""
+    return f"{settings.MEETUP_GRAPHQL_URL}?urlname={urlname}"
+
+
+def query_group(urlname: str) -> bytes:
+    """query the description and upcoming events of a group
+
+    Args:
+        urlname (str): urlname of the group
+
+    Returns:
+        bytes: the response body, as parsed by parse_group_response()
+
+    Raises:
+        requests.exceptions.HTTPError: if the API responds with an error status
+    """
+    headers: dict[str, str] = {}
+    token: str | None = getattr(settings, "MEETUP_GRAPHQL_TOKEN", None)
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    response: requests.Response = http_client.post(
+        settings.MEETUP_GRAPHQL_URL,
+        json={
+            "query": GROUP_QUERY,
+            "variables": {"urlname": urlname, "first": getattr(settings, "MEETUP_GRAPHQL_EVENTS", 50)},
+        },
+        headers=headers,
+        timeout=15,
+    )
+    response.raise_for_status()
+    record_tier(settings.MEETUP_GRAPHQL_URL, "graphql")
+    save_snapshot(get_snapshot_url(urlname), response.content, GRAPHQL_SNAPSHOT_KIND)
+    return response.content
+
+
+def parse_group_response(content: bytes | str) -> dict:
+    """get the group of a query response
+
+    Args:
+        content (bytes | str): response body of query_group()
+
+    Returns:
+        dict: the group, with its "description" and its upcoming events under "events"
+
+    Raises:
+        MeetupGraphQLError: if the response holds errors, or no group
+    """
+    data: dict = json.loads(content)
+    if data.get("errors"):
+        raise MeetupGraphQLError("; ".join(error.get("message", "unknown error") for error in data["errors"]))
+    group: dict | None = (data.get("data") or {}).get("groupByUrlname")
+    if not group:
+        raise MeetupGraphQLError("no group found")
+    return group
+
+
+def get_event_nodes(group: dict) -> list[dict]:
+    """get the upcoming events of a group returned by the API, in listing order"""
+    return [edge["node"] for edge in (group.get("events") or {}).get("edges", []) if edge.get("node")]
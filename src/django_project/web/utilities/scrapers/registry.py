@@ -0,0 +1,232 @@
+import asyncio
+import contextvars
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import timedelta
+from functools import partial
+from importlib import import_module
+from typing import Any, Callable, TypeVar
+
+from celery.signals import worker_process_shutdown
+from django.conf import settings
+from web.models import HttpCacheEntry, SocialPlatform
+from web.utilities.browser_pool import close_thread_browser_pools
+from web.utilities.ingestion import ScrapedEvent, ScrapedGroup
+
+# modules that register a PlatformScraper when imported
+SCRAPER_MODULES: tuple[str, ...] = (
+    "web.utilities.scrapers.meetup",
+    "web.utilities.scrapers.eventbrite",
+)
+
+T = TypeVar("T")
+
+
+@dataclass
+class EventListing:
+    """the upcoming events a platform lists for a group
+
+    `records` holds whatever event information the listing itself carries, which may be incomplete; scrapers fill
+    the gaps in fetch_events(). Incremental scrapers also provide a listing fingerprint per event, so that events
+    whose listing entry has not changed are not fetched again.
+    """
+
+    records: dict[str, dict] = field(default_factory=dict)  # keyed by social_platform_id, in listing order
+    fingerprints: dict[str, str] = field(default_factory=dict)  # keyed by social_platform_id
+
+
+class PlatformScraper:
+    """Scrapes groups and events of one social platform behind a common async interface
+
+    Subclasses register themselves for a SocialPlatform with @register_scraper. The methods are coroutines, so one
+    pipeline can scrape many groups on different platforms concurrently; implementations built on blocking fetchers
+    run them with run_blocking(). Scrapers are given urls rather than models and leave all database writes to the
+    pipeline.
+    """
+
+    platform_name: str = ""
+    # incremental scrapers provide listing fingerprints, and only fetch events that are new or changed
+    incremental: bool = False
+    # kinds of the snapshots saved of a group's event listing and of the event details fetched for it; see
+    # web.utilities.snapshots. Scrapers without them cannot be reparsed.
+    listing_snapshot_kind: str = ""
+    detail_snapshot_kind: str = ""
+
+    @property
+    def refresh_window(self) -> timedelta:
+        """known events starting this soon are always fetched again by an incremental scraper"""
+        return timedelta(0)
+
+    @property
+    def max_age(self) -> timedelta:
+        """known events the listing has no fingerprint for are fetched again once their last scrape is this old"""
+        return timedelta(0)
+
+    def for_group(self, url: str) -> "PlatformScraper":
+        """get the scraper to ingest one group with; scrapers with several backends pick one per group
+
+        Args:
+            url (str): url of the group's platform page
+
+        Returns:
+            PlatformScraper: this scraper, or the one of the backend the group is read with
+        """
+        return self
+
+    async def fetch_group(self, url: str, cache_entry: HttpCacheEntry | None = None) -> ScrapedGroup | None:
+        """fetch a group's details from its platform page
+
+        Scrapers run outside the database stages, so the pipeline loads the page's stored validators beforehand and
+        saves the ones returned on ScrapedGroup.cache_entry once the details are written.
+
+        Args:
+            url (str): url of the group's platform page
+            cache_entry (HttpCacheEntry | None, optional): stored validators of the page, for a conditional fetch
+
+        Returns:
+            ScrapedGroup | None: the group's details; None if the page has not changed since the last fetch
+        """
+        raise NotImplementedError
+
+    async def list_events(self, url: str) -> EventListing:
+        """list a group's upcoming events
+
+        Args:
+            url (str): url of the group's platform page
+
+        Returns:
+            EventListing: the listed events
+        """
+        raise NotImplementedError
+
+    async def fetch_events(self, listing: EventListing, event_ids: list[str]) -> dict[str, ScrapedEvent]:
+        """complete the information of listed events, fetching whatever the listing lacks
+
+        Args:
+            listing (EventListing): listing the events came from
+            event_ids (list[str]): social_platform_ids of the events to fetch
+
+        Returns:
+            dict[str, ScrapedEvent]: events keyed by social_platform_id; events that could not be fetched, or whose
+                                     information is invalid, are left out (see build_scraped_events)
+        """
+        raise NotImplementedError
+
+    def needs_details(self, record: dict) -> bool:
+        """whether a listed event has to be completed with its details before it can be written"""
+        return True
+
+    def parse_snapshot(self, kind: str, url: str, content: bytes) -> EventListing:
+        """parse a stored snapshot; a plain function of the content, so it can run in another process
+
+        Args:
+            kind (str): listing_snapshot_kind or detail_snapshot_kind
+            url (str): url the content was fetched from
+            content (bytes): the content, as fetched
+
+        Returns:
+            EventListing: the listed events for a listing snapshot; the records of the events it describes for a
+                          detail snapshot
+        """
+        raise NotImplementedError
+
+
+_registry: dict[str, type[PlatformScraper]] = {}
+_executors: dict[int, ThreadPoolExecutor] = {}
+
+
+def register_scraper(platform_name: str) -> Callable[[type[PlatformScraper]], type[PlatformScraper]]:
+    """class decorator registering a PlatformScraper for the SocialPlatform with the given name"""
+
+    def decorator(scraper_class: type[PlatformScraper]) -> type[PlatformScraper]:
+        scraper_class.platform_name = platform_name
+        _registry[platform_name.lower()] = scraper_class
+        return scraper_class
+
+    return decorator
+
+
+def get_scraper_class(platform: SocialPlatform | str | None) -> type[PlatformScraper] | None:
+    """get the scraper class registered for a social platform, or None if there is none"""
+    for module in SCRAPER_MODULES:
+        import_module(module)
+    name: str = platform.name if isinstance(platform, SocialPlatform) else platform or ""
+    return _registry.get(name.lower())
+
+
+def has_scraper(platform: SocialPlatform | str | None) -> bool:
+    """whether a scraper is registered for a social platform"""
+    return get_scraper_class(platform) is not None
+
+
+def get_scraper(platform: SocialPlatform | str | None) -> PlatformScraper:
+    """get a scraper for a social platform
+
+    Args:
+        platform (SocialPlatform | str | None): platform, or its name
+
+    Raises:
+        LookupError: if no scraper is registered for the platform
+
+    Returns:
+        PlatformScraper: scraper for the platform
+    """
+    scraper_class: type[PlatformScraper] | None = get_scraper_class(platform)
+    if scraper_class is None:
+        name: str = platform.name if isinstance(platform, SocialPlatform) else platform or ""
+        raise LookupError(f"no scraper registered for {name or 'the platform'}")
+    return scraper_class()
+
+
+def get_scraper_executor() -> ThreadPoolExecutor:
+    """get the thread pool that runs blocking scraper calls for the current process
+
+    Each thread keeps its own pooled browser (see browser_pool), so settings.SCRAPER_THREADS also bounds the number
+    of Chromium instances a worker runs.
+    """
+    pid: int = os.getpid()
+    if pid not in _executors:
+        _executors[pid] = ThreadPoolExecutor(
+            max_workers=getattr(settings, "SCRAPER_THREADS", 4), thread_name_prefix="scraper"
+        )
+    return _executors[pid]
+
+
+def shutdown_scraper_executor(**kwargs) -> None:
+    """close the browser pools of this process's scraper threads, each on its own thread, then stop the threads
+
+    One pool closing task is queued per thread, and every task holds its thread until all of them have started, so
+    each thread runs exactly one. A thread still busy after settings.SCRAPER_SHUTDOWN_TIMEOUT seconds closes its
+    pools once it is free, before the executor finishes shutting down.
+    """
+    executor: ThreadPoolExecutor | None = _executors.pop(os.getpid(), None)
+    if executor is None:
+        return
+    barrier = threading.Barrier(executor._max_workers, timeout=getattr(settings, "SCRAPER_SHUTDOWN_TIMEOUT", 30))
+
+    def close_pools() -> None:
+        close_thread_browser_pools()
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+
+    for _ in range(executor._max_workers):
+        executor.submit(close_pools)
+    executor.shutdown(wait=True)
+
+
+async def run_blocking(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """run a blocking fetch in the scraper thread pool, keeping the caller's context (replay, telemetry)"""
+    context: contextvars.Context = contextvars.copy_context()
+    return await asyncio.get_running_loop().run_in_executor(
+        get_scraper_executor(), partial(context.run, func, *args, **kwargs)
+    )
+
+
+worker_process_shutdown.connect(shutdown_scraper_executor)
+# atexit handlers run after concurrent.futures has already stopped the executor threads, so register with the
+# earlier hook it uses itself; hooks run in reverse order, so this one runs before the executor is stopped
+threading._register_atexit(shutdown_scraper_executor)  # type: ignore[attr-defined]
@@ -0,0 +1,214 @@
+"""content-addressed store of the raw pages and API payloads that scrapers fetch, so parsers can be re-run offline
+
+Scrapers hand what they fetch to save_snapshot(), together with its kind (which parser reads it). The content is
+compressed, with zstd when the zstandard package is installed and gzip otherwise, and written once per sha256
+digest under settings.SCRAPER_SNAPSHOT_DIR. Snapshots are only saved inside collect_snapshots(), which the ingestion
+pipeline opens around each group's stages; the pipeline then records them as PageSnapshot rows of that group.
+
+Snapshots older than settings.SCRAPER_SNAPSHOT_RETENTION_DAYS are removed by prune_snapshots(). After a parser fix,
+web.utilities.pipeline.reparse_snapshots() (the reparse_snapshots command) rebuilds events from the stored snapshots
+without touching the network.
+"""
+
+import gzip
+import hashlib
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+
+from django.conf import settings
+from django.utils import timezone
+from web.models import PageSnapshot, TechGroup
+from web.utilities.scrapers.registry import EventListing, get_scraper
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - gzip is used instead
+    zstandard = None
+
+# file suffix of the blobs written by each codec
+SUFFIXES: dict[str, str] = {"zstd": ".zst", "gzip": ".gz"}
+
+
+@dataclass
+class Snapshot:
+    """a page or payload stored while collecting, to be recorded as a PageSnapshot of the collecting group"""
+
+    url: str
+    kind: str
+    content_hash: str
+    compression: str
+    content_length: int
+    fetched_at: datetime = field(default_factory=timezone.now)
+
+
+_collector: ContextVar[list[Snapshot] | None] = ContextVar("page_snapshots", default=None)
+
+
+def get_snapshot_dir() -> Path | None:
+    """get the directory of the snapshot store; None if snapshots are disabled"""
+    directory: str = getattr(settings, "SCRAPER_SNAPSHOT_DIR", "")
+    return Path(directory) if directory else None
+
+
+def get_compression() -> str:
+    """get the codec new blobs are written with: settings.SCRAPER_SNAPSHOT_COMPRESSION, if it is available"""
+    compression: str = getattr(settings, "SCRAPER_SNAPSHOT_COMPRESSION", "zstd")
+    if compression not in SUFFIXES:
+        raise ValueError(f"unknown snapshot compression {compression!r}; expected one of {', '.join(SUFFIXES)}")
+    if compression == "zstd" and zstandard is None:
+        return "gzip"
+    return compression
+
+
+def compress(content: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdCompressor(level=10).compress(content)
+    return gzip.compress(content, compresslevel=6)
+
+
+def decompress(data: bytes, compression: str) -> bytes:
+    if compression == "zstd":
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+def get_blob_path(directory: Path, content_hash: str, compression: str) -> Path:
+    return directory / content_hash[:2] / f"{content_hash}{SUFFIXES[compression]}"
+
+
+@contextmanager
+def collect_snapshots(snapshots: list[Snapshot] | None = None) -> Iterator[list[Snapshot]]:
+    """store the pages saved with save_snapshot() inside the block, including those saved by threads and asyncio
+    tasks started inside it
+
+    Pass `snapshots` to keep adding to the list of an earlier block.
+    """
+    snapshots = snapshots if snapshots is not None else []
+    token = _collector.set(snapshots)
+    try:
+        yield snapshots
+    finally:
+        _collector.reset(token)
+
+
+def save_snapshot(url: str, content: bytes | str, kind: str) -> Snapshot | None:
+    """store fetched content in the snapshot store, if snapshots are enabled and being collected
+
+    Content already in the store is not written again; its blob is touched so that pruning keeps it.
+
+    Args:
+        url (str): url the content was fetched from
+        content (bytes | str): page or payload, as fetched
+        kind (str): what the content is; see PlatformScraper.parse_snapshot()
+
+    Returns:
+        Snapshot | None: the stored snapshot; None if nothing was stored
+    """
+    snapshots: list[Snapshot] | None = _collector.get()
+    directory: Path | None = get_snapshot_dir()
+    if snapshots is None or directory is None or not content:
+        return None
+    data: bytes = content.encode("utf-8") if isinstance(content, str) else content
+    content_hash: str = hashlib.sha256(data).hexdigest()
+    for compression in SUFFIXES:
+        path: Path = get_blob_path(directory, content_hash, compression)
+        if path.exists():
+            os.utime(path)
+            break
+    else:
+        compression = get_compression()
+        path = get_blob_path(directory, content_hash, compression)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # write to a temporary file of this thread first, so a concurrent reader never sees a partial blob, and two
+        # scraper threads storing the same content never write to the same file
+        temporary_path: Path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        temporary_path.write_bytes(compress(data, compression))
+        os.replace(temporary_path, path)
+    snapshot = Snapshot(
+        url=url, kind=kind, content_hash=content_hash, compression=compression, content_length=len(data)
+    )
+    snapshots.append(snapshot)
+    return snapshot
+
+
+def record_snapshots(group: TechGroup, snapshots: list[Snapshot]) -> list[PageSnapshot]:
+    """record the snapshots stored while ingesting a group
+
+    Args:
+        group (TechGroup): group whose ingestion fetched the content
+        snapshots (list[Snapshot]): snapshots collected for the group
+
+    Returns:
+        list[PageSnapshot]: the created rows
+    """
+    return PageSnapshot.objects.bulk_create(
+        [
+            PageSnapshot(
+                group=group,
+                url=snapshot.url,
+                kind=snapshot.kind,
+                content_hash=snapshot.content_hash,
+                compression=snapshot.compression,
+                content_length=snapshot.content_length,
+                fetched_at=snapshot.fetched_at,
+            )
+            for snapshot in snapshots
+        ]
+    )
+
+
+def read_snapshot(content_hash: str, compression: str, directory: Path | None = None) -> bytes:
+    """read stored content back from the snapshot store
+
+    Raises:
+        FileNotFoundError: if the blob is not in the store
+    """
+    directory = directory or get_snapshot_dir()
+    if directory is None:
+        raise FileNotFoundError("snapshots are disabled; settings.SCRAPER_SNAPSHOT_DIR is empty")
+    return decompress(get_blob_path(directory, content_hash, compression).read_bytes(), compression)
+
+
+def parse_snapshot_file(
+    platform_name: str, kind: str, url: str, content_hash: str, compression: str, directory: str
+) -> EventListing:
+    """read a stored snapshot and parse it with its platform's scraper; runs in reparse worker processes
+
+    Returns:
+        EventListing: the events the snapshot describes; see PlatformScraper.parse_snapshot()
+    """
+    content: bytes = read_snapshot(content_hash, compression, Path(directory))
+    return get_scraper(platform_name).parse_snapshot(kind, url, content)
+
+
+def prune_snapshots(retention_days: int | None = None) -> tuple[int, int]:
+    """delete snapshots older than the retention period, and the blobs no remaining snapshot refers to
+
+    Args:
+        retention_days (int, optional): days to keep snapshots. Defaults to settings.SCRAPER_SNAPSHOT_RETENTION_DAYS.
+
+    Returns:
+        tuple[int, int]: number of deleted snapshots, and of deleted blobs
+    """
+    if retention_days is None:
+        retention_days = getattr(settings, "SCRAPER_SNAPSHOT_RETENTION_DAYS", 30)
+    cutoff: datetime = timezone.now() - timedelta(days=retention_days)
+    deleted_snapshots, _ = PageSnapshot.objects.filter(fetched_at__lt=cutoff).delete()
+    directory: Path | None = get_snapshot_dir()
+    if directory is None or not directory.exists():
+        return deleted_snapshots, 0
+    referenced: set[str] = set(PageSnapshot.objects.values_list("content_hash", flat=True).distinct())
+    deleted_blobs: int = 0
+    for path in directory.glob("*/*"):
+        # blobs written or reused within the retention period may belong to snapshots not recorded yet
+        if path.name.split(".", 1)[0] in referenced or path.stat().st_mtime >= cutoff.timestamp():
+            continue
+        path.unlink(missing_ok=True)
+        deleted_blobs += 1
+    return deleted_snapshots, deleted_blobs
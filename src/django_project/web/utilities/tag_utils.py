@@ -0,0 +1,71 @@
+from typing import Any, Iterable
+
+from django.db import models
+
+
+def clean_tag_values(tag_model: type[models.Model], values: Iterable[str]) -> list[str]:
+    """strip, truncate to the `value` field length and de-duplicate tag values, dropping blanks"""
+    max_length: int | None = tag_model._meta.get_field("value").max_length
+    return list(dict.fromkeys(value.strip()[:max_length] for value in values if value and value.strip()))
+
+
+def resolve_tags(tag_model: type[models.Model], values: Iterable[str]) -> dict[str, Any]:
+    """get tag instances for a set of values, creating any that do not exist yet
+
+    Works with any model that has a unique `value` field, such as web.Tag and blogs.BlogTag. Existing tags are
+    loaded with a single `value__in` query and missing ones are added with a single bulk insert.
+
+    Args:
+        tag_model (type[models.Model]): tag model class
+        values (Iterable[str]): tag values; cleaned with clean_tag_values()
+
+    Returns:
+        dict[str, Model]: tag instances keyed by cleaned value
+    """
+    wanted: list[str] = clean_tag_values(tag_model, values)
+    if not wanted:
+        return {}
+    tags: dict[str, Any] = {tag.value: tag for tag in tag_model.objects.filter(value__in=wanted)}
+    missing: list[str] = [value for value in wanted if value not in tags]
+    if missing:
+        # ignore_conflicts covers a concurrent insert of the same tag, but does not return primary keys
+        tag_model.objects.bulk_create([tag_model(value=value) for value in missing], ignore_conflicts=True)
+        tags.update({tag.value: tag for tag in tag_model.objects.filter(value__in=missing)})
+    return tags
+
+
+def link_tags(m2m_descriptor: Any, tags_by_object_pk: dict[Any, Iterable[models.Model]]) -> None:
+    """add tag links for many objects with a single bulk insert into the through table
+
+    Links that already exist are skipped by the database, so this is safe to call on every ingestion run.
+
+    Args:
+        m2m_descriptor: the many-to-many attribute on the model class, such as Event.tags or TechGroup.tags
+        tags_by_object_pk (dict): tags to link, keyed by the primary key of the object that owns the relation
+    """
+    field: models.ManyToManyField = m2m_descriptor.field
+    through: type[models.Model] = m2m_descriptor.through
+    source_column: str = f"{field.m2m_field_name()}_id"
+    target_column: str = f"{field.m2m_reverse_field_name()}_id"
+    links: list[models.Model] = [
+        through(**{source_column: object_pk, target_column: tag.pk})
+        for object_pk, tags in tags_by_object_pk.items()
+        for tag in tags
+    ]
+    if links:
+        through.objects.bulk_create(links, ignore_conflicts=True)
+
+
+def add_tags(m2m_descriptor: Any, values_by_object_pk: dict[Any, Iterable[str]]) -> None:
+    """resolve tag values and link them to their objects in a constant number of queries
+
+    Args:
+        m2m_descriptor: the many-to-many attribute on the model class, such as Event.tags or BlogPost.tags
+        values_by_object_pk (dict): tag values to link, keyed by the primary key of the object that owns the relation
+    """
+    tag_model: type[models.Model] = m2m_descriptor.field.related_model
+    cleaned: dict[Any, list[str]] = {
+        object_pk: clean_tag_values(tag_model, values) for object_pk, values in values_by_object_pk.items()
+    }
+    tags: dict[str, Any] = resolve_tags(tag_model, (value for values in cleaned.values() for value in values))
+    link_tags(m2m_descriptor, {object_pk: [tags[value] for value in values] for object_pk, values in cleaned.items()})
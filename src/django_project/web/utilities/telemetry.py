@@ -0,0 +1,63 @@
+import logging
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Iterator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class FetchTelemetry:
+    """pages fetched, bytes downloaded, response statuses and fetch tiers seen while collecting"""
+
+    pages: int = 0
+    bytes_downloaded: int = 0
+    statuses: Counter = field(default_factory=Counter)
+    tiers: Counter = field(default_factory=Counter)  # pages served per fetch tier, such as "requests" or "playwright"
+
+    @property
+    def throttled(self) -> int:
+        return self.statuses[429]
+
+
+_collector: ContextVar[FetchTelemetry | None] = ContextVar("fetch_telemetry", default=None)
+# a collector is shared by every thread running in a copy of its context, such as a group's concurrent page requests
+_lock = threading.Lock()
+
+
+@contextmanager
+def collect_fetch_telemetry(telemetry: FetchTelemetry | None = None) -> Iterator[FetchTelemetry]:
+    """count every fetch made inside the block, including those made by asyncio tasks started inside it
+
+    Pass `telemetry` to keep adding to the counts of an earlier block.
+    """
+    telemetry = telemetry if telemetry is not None else FetchTelemetry()
+    token = _collector.set(telemetry)
+    try:
+        yield telemetry
+    finally:
+        _collector.reset(token)
+
+
+def record_fetch(status: int | None, bytes_downloaded: int = 0) -> None:
+    """count a completed fetch (an HTTP response or a rendered page) against the active collector, if any"""
+    telemetry: FetchTelemetry | None = _collector.get()
+    if telemetry is None:
+        return
+    with _lock:
+        telemetry.pages += 1
+        telemetry.bytes_downloaded += bytes_downloaded
+        if status is not None:
+            telemetry.statuses[status] += 1
+
+
+def record_tier(url: str, tier: str) -> None:
+    """record which fetch tier served a page, against the active collector if any"""
+    logger.info("%s served by the %s tier", url, tier)
+    telemetry: FetchTelemetry | None = _collector.get()
+    if telemetry is not None:
+        with _lock:
+            telemetry.tiers[tier] += 1